@@ -0,0 +1,244 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from manager import CameraManager
+from nodemaps.read_yaml import read_yaml
+from nodemaps.trigger import TRIGGER_TYPE_SOFTWARE
+from utils.logger import get_logger
+
+logger = get_logger("async_manager")
+
+
+class AsyncCameraManager:
+    """
+    CameraManager의 asyncio 인터페이스 (PLC / MES 연동 서비스처럼 이벤트 루프에서 카메라를 제어할 때 사용)
+
+        cameras = await AsyncCameraManager.create(num_cameras=4)
+        await cameras.start()
+        state = await cameras.trigger(action=0)
+        async for bundle in cameras.frames():
+            ...
+        await cameras.stop()
+
+    - 노드 쓰기와 트리거 실행은 제어 스레드 하나에서 순서대로 실행 (이벤트 루프를 막지 않음)
+    - action 완료 / 타임아웃과 번들 도착은 카메라 콜백 스레드에서 call_soon_threadsafe로 이벤트 루프에 전달
+      (배리어나 완료를 기다리는 스레드가 필요 없음)
+    - 동시에 진행하는 action 수는 스케줄러와 같은 max_in_flight개로 제한
+    """
+
+    def __init__(self, manager:CameraManager, frame_queue_size:int=8) -> None:
+        """
+        Args:
+            manager: 감쌀 카메라 매니저 (번들을 받으려면 bundles=True로 생성)
+            frame_queue_size: frames()로 꺼내지 않은 번들을 보관할 최대 개수, 넘으면 가장 오래된 번들을 버림
+        """
+
+        self.manager = manager
+        self.frame_queue_size = frame_queue_size
+        self._loop = None
+        self._executor = None
+        self._slots = None          # 진행 중인 action 수 제한 (asyncio.Semaphore)
+        self._pending = {}          # action -> asyncio.Future
+        self._frames = None         # 번들 큐 (asyncio.Queue)
+        self._watcher = None
+
+        # 통계
+        self.dropped_bundles = 0
+
+        # 번들은 전달 스레드에서 이벤트 루프로 넘김 (bundler.start() 전에 설정해야 전달 스레드가 생성됨)
+        if self.manager.bundler is not None and self.manager.bundler.consumer is None:
+            self.manager.bundler.consumer = self._on_bundle
+
+    @classmethod
+    async def create(cls, frame_queue_size:int=8, **kwargs) -> "AsyncCameraManager":
+        """
+        장치를 열고 CameraManager를 만든 뒤 감쌈 (장치 열기는 제어 스레드가 아닌 기본 executor에서 실행)
+
+        Args:
+            frame_queue_size: frames() 번들 큐 크기
+            kwargs: CameraManager 인자 (bundles 기본값 True)
+        """
+
+        kwargs.setdefault("bundles", True)
+        manager = await asyncio.get_running_loop().run_in_executor(None, functools.partial(CameraManager, **kwargs))
+
+        return cls(manager=manager, frame_queue_size=frame_queue_size)
+
+    async def start(self) -> None:
+        """
+        모든 카메라 획득 시작
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncControl")
+        self._slots = asyncio.Semaphore(self.manager.scheduler.max_in_flight)
+        self._frames = asyncio.Queue()
+        self.manager.scheduler.add_listener(self._on_action_done)
+
+        await self._run(self.manager.start_all_cameras)
+
+        # begin() / drain()을 호출하는 쪽이 없으므로 타임아웃은 이벤트 루프에서 주기적으로 확인
+        self._watcher = self._loop.create_task(self._watch_expiry())
+
+    async def stop(self) -> None:
+        """
+        진행 중인 action을 마치고 모든 카메라 종료, frames() 이터레이터도 종료
+        """
+
+        try:
+            await self._run(self.manager.stop_all_cameras)
+        finally:
+            if self._watcher is not None:
+                self._watcher.cancel()
+                self._watcher = None
+            self.manager.scheduler.remove_listener(self._on_action_done)
+            # 전달 스레드가 넘긴 번들 다음에 종료 신호
+            self._frames.put_nowait(None)
+            self._executor.shutdown(wait=False)
+
+    async def close(self) -> None:
+        """
+        카메라 객체를 모두 해제하고 stApi 종료 (stop() 이후 호출)
+        """
+
+        await asyncio.get_running_loop().run_in_executor(None, self.manager.close)
+
+    async def trigger(self, action, cameras:list=None, trigger_type:str=TRIGGER_TYPE_SOFTWARE):
+        """
+        카메라들을 트리거하고 모든 카메라의 프레임 처리가 끝날 때까지 대기
+        진행 중인 action이 max_in_flight개이면 하나가 끝날 때까지 (이벤트 루프를 막지 않고) 대기한 후 트리거
+
+        Args:
+            action: action 번호 (진행 중인 action과 겹치면 안 됨)
+            cameras: 트리거할 카메라 번호 리스트, None이면 모든 카메라 (열리지 않은 카메라가 있으면 ValueError)
+            trigger_type: 트리거 종류 (software / action / line)
+
+        Return:
+            ActionState (state.failed: 프레임을 받지 못한 카메라, state.missing: 타임아웃까지 오지 않은 카메라)
+        """
+
+        if cameras is None:
+            cameras = [cam.camera_index for cam in self.manager.camera_list]
+        if len(cameras) == 0:
+            raise ValueError("No cameras to trigger")
+        # 모르는 카메라는 trigger_cameras()에서 빠지므로, 모두 빠지면 완료되지 않는 action이 슬롯을 계속 차지함
+        unknown = [index for index in cameras if index not in self.manager.cameras_by_index]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown cameras {unknown}, available {sorted(self.manager.cameras_by_index)}")
+        if action in self._pending:
+            raise ValueError(f"Action {action} is already in flight")
+
+        await self._slots.acquire()
+        future = self._loop.create_future()
+        self._pending[action] = future
+        try:
+            await self._run(self.manager.trigger_cameras, camera_indexes=list(cameras), action=action, trigger_type=trigger_type)
+        except BaseException:
+            if self._pending.pop(action, None) is not None:
+                self._slots.release()
+            raise
+
+        # 기다리던 쪽이 취소되어도 action은 계속 진행되고 슬롯은 완료 / 타임아웃 시 반환됨
+        return await asyncio.shield(future)
+
+    async def frames(self):
+        """
+        완성된 action 번들을 순서대로 꺼내는 비동기 이터레이터 (stop() 호출 시 종료)
+
+            async for bundle in cameras.frames():
+                result = await infer(bundle.images)
+        """
+
+        if self.manager.bundler is None:
+            raise RuntimeError("Bundling is disabled. Create CameraManager with bundles=True")
+
+        while True:
+            bundle = await self._frames.get()
+            if bundle is None:
+                break
+            yield bundle
+
+    async def call(self, func, *args, **kwargs):
+        """
+        매니저의 다른 blocking 메소드를 제어 스레드에서 실행 (트리거와 순서가 섞이지 않음)
+
+            await cameras.call(cameras.manager.apply_recipe, "productB")
+        """
+
+        return await self._run(func, *args, **kwargs)
+
+    def _run(self, func, *args, **kwargs) -> asyncio.Future:
+        return self._loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _on_action_done(self, state) -> None:
+        """
+        스케줄러 listener (카메라 콜백 스레드 또는 타임아웃을 처리한 스레드에서 호출)
+        """
+
+        self._loop.call_soon_threadsafe(self._resolve, state)
+
+    def _resolve(self, state) -> None:
+        future = self._pending.pop(state.action, None)
+        if future is None:
+            return
+        self._slots.release()
+        if not future.done():
+            future.set_result(state)
+
+    def _on_bundle(self, bundle) -> None:
+        """
+        번들 전달 스레드에서 호출, 이벤트 루프의 큐에 넣도록 예약하고 바로 반환 (카메라 쪽을 막지 않음)
+        """
+
+        try:
+            self._loop.call_soon_threadsafe(self._put_bundle, bundle)
+        except RuntimeError:
+            logger.warning("[AsyncManager] Event loop closed, dropped action %s bundle", bundle.action)
+
+    def _put_bundle(self, bundle) -> None:
+        """
+        번들 큐에 추가, 가득 차 있으면 가장 오래된 번들을 버림 (느린 소비자가 카메라를 멈추지 않도록)
+        """
+
+        if self._frames.qsize() >= self.frame_queue_size:
+            dropped = self._frames.get_nowait()
+            self.dropped_bundles += 1
+            logger.warning("[AsyncManager] Frame queue full, dropped action %s bundle", dropped.action)
+        self._frames.put_nowait(bundle)
+
+    async def _watch_expiry(self) -> None:
+        scheduler = self.manager.scheduler
+        while True:
+            await asyncio.sleep(min(scheduler.timeout / 4, 0.1))
+            if len(scheduler.in_flight) > 0:
+                scheduler.expire_overdue()
+
+
+async def main() -> None:
+    """
+    action.yaml의 action을 순서대로 트리거하면서 번들을 동시에 소비하는 예제
+    """
+
+    cameras = await AsyncCameraManager.create(num_cameras=4)
+    await cameras.start()
+
+    async def consume() -> None:
+        async for bundle in cameras.frames():
+            logger.info("[ACTION %s] Bundle %s from cameras %s", bundle.action, None if bundle.images is None else bundle.images.shape,
+                        bundle.received)
+
+    consumer = asyncio.create_task(consume())
+    actions = read_yaml(file_path='./nodemaps/action.yaml')
+    for action in actions.keys():
+        camera_indexes, trigger_type = cameras.manager.parse_action(actions[action])
+        state = await cameras.trigger(action=action, cameras=camera_indexes, trigger_type=trigger_type)
+        if len(state.failed) > 0 or len(state.missing) > 0:
+            logger.warning("[ACTION %s] Failed cameras %s", action, state.failed + state.missing)
+
+    await cameras.stop()
+    await consumer
+    await cameras.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+시뮬레이션 백엔드로 전체 파이프라인(트리거 -> 콜백 -> 변환 -> 저장) 처리량과 지연 시간 측정
+
+    python benchmark.py --cameras 4 --actions 100 --width 4000 --height 3000
+"""
+
+import os
+import argparse
+import tempfile
+import time
+
+# 카메라 없이 실행하기 위해 시뮬레이션 백엔드 사용 (import 전에 설정해야 함)
+os.environ.setdefault("OMRON_BACKEND", "sim")
+
+from utils.backend import st
+from manager import CameraManager
+from utils.tracing import percentile
+
+
+def run_benchmark(num_cameras:int, num_actions:int, save_workers:int, save_dir:str, max_in_flight:int=2,
+                    image_format:str="bmp", record_dir:str=None, process_workers:int=0, profile:str=None,
+                    buffer_count:int=None, buffer_handling_mode:str=None) -> None:
+    """
+    모든 카메라를 num_actions번 트리거하고 action 주기 통계 출력
+
+    Args:
+        num_cameras: 카메라 개수
+        num_actions: 트리거할 action 수
+        save_workers: 저장 writer 스레드 개수 (0이면 콜백 스레드에서 저장)
+        save_dir: 이미지 저장 경로
+        max_in_flight: 동시에 진행할 최대 action 수
+        image_format: 저장 포맷 ("bmp", "raw", "png:3", "jpeg:high" 등)
+        record_dir: 지정하면 파일별 저장 대신 청크 컨테이너에 기록
+        process_workers: 변환, 인코딩을 맡길 워커 프로세스 개수 (0이면 사용하지 않음)
+        profile: 획득 전에 적용할 ROI / 디시메이션 프로필 이름 (nodemaps/profiles.yaml)
+        buffer_count: 카메라별 데이터 스트림 버퍼 수 (None이면 기본값)
+        buffer_handling_mode: 데이터 스트림 버퍼 처리 방식 (None이면 기본값)
+    """
+
+    manager = CameraManager(num_cameras=num_cameras, save_workers=save_workers, camera_config=None,
+                            max_in_flight=max_in_flight, image_format=image_format,
+                            record_dir=record_dir, process_workers=process_workers, profile=profile,
+                            buffer_count=buffer_count, buffer_handling_mode=buffer_handling_mode)
+    for cam in manager.camera_list:
+        cam.image_save_dir = save_dir
+
+    manager.start_all_cameras()
+    camera_indexes = list(range(num_cameras))
+
+    start = time.perf_counter()
+    for action in range(num_actions):
+        manager.trigger_cameras(camera_indexes=camera_indexes, action=action)
+    manager.scheduler.drain()
+    elapsed = time.perf_counter() - start
+    # action 시작(트리거)부터 모든 카메라 완료까지의 시간
+    cycle_times = manager.scheduler.durations
+
+    manager.stop_all_cameras()
+
+    print(f"[Benchmark] {num_actions} actions x {num_cameras} cameras in {elapsed:.3f} s "
+            f"({num_actions / elapsed:.1f} actions/s, {num_actions * num_cameras / elapsed:.1f} frames/s)")
+    if manager.recorder is not None:
+        print(f"[Benchmark] recorded {manager.recorder.frames} frames ({manager.recorder.bytes / 1e6:.1f} MB) into {record_dir}")
+    else:
+        for cam in manager.camera_list:
+            stats = cam.image_writer.stats
+            print(f"[Benchmark] camera {cam.camera_index} {stats['format']}: {stats['mean_encoded_bytes'] / 1e6:.2f} MB/frame "
+                    f"(x{stats['compression_ratio']:.2f}), encode {stats['mean_encode_ms']:.2f} ms, write {stats['mean_write_ms']:.2f} ms")
+    for camera_index, stats in manager.buffer_stats().items():
+        print(f"[Benchmark] camera {camera_index} buffers: {stats['overruns']} overruns, peak {stats['peak_in_use']} in use, "
+                f"callback p99 {stats['p99_ms']:.2f} ms, suggested buffer count {stats['suggested_buffer_count']}")
+    print(f"[Benchmark] {manager.scheduler.completed} completed, {manager.scheduler.expired} timed out (max in flight {max_in_flight})")
+    print(f"[Benchmark] action latency p50={percentile(cycle_times, 50) * 1e3:.2f} ms "
+            f"p95={percentile(cycle_times, 95) * 1e3:.2f} ms p99={percentile(cycle_times, 99) * 1e3:.2f} ms")
+    manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline benchmark on the simulated camera backend")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--pixel-format", default="BayerRG8")
+    parser.add_argument("--frame-rate", type=float, default=30.0)
+    parser.add_argument("--jitter", type=float, default=0.0005)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--save-workers", type=int, default=4)
+    parser.add_argument("--save-dir", default=None)
+    parser.add_argument("--max-in-flight", type=int, default=2)
+    parser.add_argument("--process-workers", type=int, default=0, help="convert and encode in this many worker processes")
+    parser.add_argument("--record", default=None, help="record into a chunked container in this directory")
+    parser.add_argument("--format", default="bmp", help="bmp / raw / png[:level] / webp / tiff / jpeg[:preset|quality]")
+    parser.add_argument("--profile", default=None, help="ROI / decimation profile name from nodemaps/profiles.yaml")
+    parser.add_argument("--buffer-count", type=int, default=None, help="datastream buffers per camera")
+    parser.add_argument("--buffer-handling", default=None, help="OldestFirst / OldestFirstOverwrite / NewestOnly")
+    args = parser.parse_args()
+
+    if st.__name__.endswith("sim_stapipy"):
+        st.configure(num_devices=args.cameras, width=args.width, height=args.height, pixel_format=args.pixel_format,
+                        frame_rate=args.frame_rate, jitter=args.jitter, drop_rate=args.drop_rate)
+
+    save_dir = args.save_dir or tempfile.mkdtemp(prefix="omron_benchmark_")
+    run_benchmark(num_cameras=args.cameras, num_actions=args.actions, save_workers=args.save_workers, save_dir=save_dir,
+                    max_in_flight=args.max_in_flight, image_format=args.format,
+                    record_dir=args.record, process_workers=args.process_workers, profile=args.profile,
+                    buffer_count=args.buffer_count, buffer_handling_mode=args.buffer_handling)
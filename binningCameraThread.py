@@ -1,8 +1,15 @@
-import stapipy as st
+from utils.backend import st
 import threading
 import os
-import numpy as np
 import cv2
+import logging
+from utils.logger import get_logger
+from utils.conversion import image_to_numpy
+from nodemaps.node_values import *
+from nodemaps.profile import CameraProfile, apply_profile, VALUE_MAX
+from utils.stream_buffers import retrieve_loop
+
+logger = get_logger("binningCameraThread")
 
 class CameraThread(threading.Thread):
     """
@@ -10,28 +17,30 @@ class CameraThread(threading.Thread):
     """
 
     def __init__(self, group = None, target = None, name = None, args = ..., kwargs = None, *, daemon = None,
-                    st_system, isColor = True, binning=False):
+                    st_system, isColor = True, binning=False, decimation_factor:int=2):
         super().__init__(group, target, name, args, kwargs, daemon=daemon)
         """
         Args:
             st_system: StApi 시스템 객체
             isColor: 컬러카메라 or 모노카메라 여부
+            binning: Decimation 적용 여부
+            decimation_factor: 적용할 Decimation 계수
         """
         
         self.runningFlag = None  # 카메라 스레드 실행 여부 플래그
         self.isColor = isColor  # 컬러카메라 or 모노카메라
         
-        # self.device = st_system.create_first_device()  # 첫 번째 카메라 장치 생성
-        # self.nodemap = self.device.remote_port.nodemap  # 카메라 설정을 위한 노드 맵
+        self.device = st_system.create_first_device()  # 첫 번째 카메라 장치 생성
+        self.nodemap = self.device.remote_port.nodemap  # 카메라 설정을 위한 노드 맵
         
-        # Binning 적용 TODO:
+        # Binning 적용 (노드 맵이 있어야 하고, 획득 시작 전에 적용해야 함)
         if binning == True:
-            self.set_decimation(decimationFactor=1)
+            self.set_decimation(decimationFactor=decimation_factor)
         
         self.image_save_dir = "captured_images/binned"
         os.makedirs(name=self.image_save_dir, exist_ok=True)
         
-        # self.datastream = self.device.create_datastream()
+        self.datastream = self.device.create_datastream()
         self.st_converter_pixelformat = self.convert_image()
     
     
@@ -45,23 +54,30 @@ class CameraThread(threading.Thread):
         
         self.datastream.start_acquisition()
         self.device.acquisition_start()
-        print(f"Device {self.device.info.display_name} started")
-        
-        while self.runningFlag == True:
-            with self.datastream.retrieve_buffer() as buffer:   # with 구문을 사용하여 버퍼를 자동으로 해제
-                if buffer.info.is_image_present == True:
-                    self.image = buffer.get_image()
-                    self.image = self.st_converter_pixelformat.convert(self.image)
-                    print(f"BlockID : {buffer.info.frame_id} Size : {self.image.width} x {self.image.height} First Byte : {self.image.get_image_data()[0]}")
-                    
-                    self.save_image(image=self.image, frame_id=buffer.info.frame_id)
-                else:
-                    print("Image data does not exist")
+        logger.info("Device %s started", self.device.info.display_name)
+        
+        # 버퍼가 없으면 짧은 타임아웃으로 잠들어 기다리고, 타임아웃마다 중지 플래그 확인
+        retrieve_loop(datastream=self.datastream, handle_buffer=self.handle_buffer, running=lambda: self.runningFlag == True)
                     
         self.device.acquisition_stop()
         self.datastream.stop_acquisition()
     
     
+    def handle_buffer(self, buffer) -> None:
+        """
+        수신한 버퍼 하나 처리 (변환 후 저장)
+        """
+        
+        if buffer.info.is_image_present == True:
+            self.image = buffer.get_image()
+            self.image = self.st_converter_pixelformat.convert(self.image)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("BlockID=%d Size=%d x %d First Byte=%d", buffer.info.frame_id, self.image.width, self.image.height, self.image.get_image_data()[0])
+            
+            self.save_image(image=self.image, frame_id=buffer.info.frame_id)
+        else:
+            logger.warning("Image data does not exist")
+    
     def stop(self):
         """
         카메라 스레드 중지
@@ -69,7 +85,7 @@ class CameraThread(threading.Thread):
         
         self.runningFlag = False
         self.join()
-        print(f"Device {self.device.info.display_name} stopped")
+        logger.info("Device %s stopped", self.device.info.display_name)
     
     
     def convert_image(self):
@@ -99,22 +115,14 @@ class CameraThread(threading.Thread):
             frame_id: 이미지의 프레임 ID
         """
         
-        width, height = image.width, image.height
-        raw_image = image.get_image_data()
-        
-        # Numpy 배열로 변환
-        img_array = np.array(raw_image, dtype=np.uint8)
-        
-        if self.isColor == True:
-            img_array = img_array.reshape((height, width, 3))
-        else:
-            img_array = img_array.reshape((height, width))
+        # Numpy 배열로 변환 (복사 없음)
+        img_array = image_to_numpy(image=image, isColor=self.isColor)
         
         filename = os.path.join(self.image_save_dir, self.device.info.display_name + f"_{frame_id}.bmp")
         
         # 이미지 저장
         cv2.imwrite(filename, img_array)
-        print(f"Image saved: {filename}")
+        logger.debug("Image saved: %s", filename)
 
     
     def set_enumeration(nodemap, enum_name, entry_name):
@@ -135,29 +143,22 @@ class CameraThread(threading.Thread):
         enum_node.set_entry_value(entry_node)
     
     
-    def set_decimation(self, decimationFactor: int=[1, 2]) -> None:
+    def set_decimation(self, decimationFactor: int=2) -> None:
         """
-        Decimation 설정(=Binning)
+        Decimation 설정(=Binning), ROI는 Decimation 후 전체 영역으로 맞춤
+        Decimation을 먼저 쓰고 바뀐 범위로 Width / Height를 설정하며, 실패하면 이전 설정으로 되돌림
         
         Args:
-            binningFactor: 비닝 계수
+            decimationFactor: Decimation 계수 (1이면 해제)
         """
+        
+        profile = CameraProfile(name=f"decimation{decimationFactor}",
+                                settings={DECIMATION_HORIZONTAL: decimationFactor, DECIMATION_VERTICAL: decimationFactor,
+                                            WIDTH: VALUE_MAX, HEIGHT: VALUE_MAX, OFFSET_X: 0, OFFSET_Y: 0})
         try:
-            decimation_h = st.PyIInteger(self.nodemap.get_node("DecimationHorizontal"))
-            decimation_h.value = decimationFactor
-
-            decimation_v = st.PyIInteger(self.nodemap.get_node("DecimationVertical"))
-            decimation_v.value = decimationFactor
-            
-            if decimationFactor == 1:
-                width = st.PyIInteger(self.nodemap.get_node("Width"))
-                width.value = width.max
-                
-                height = st.PyIInteger(self.nodemap.get_node("Height"))
-                height.value = height.max
-        
-        except st.PyStError as e:
-            print(f"Failed to set Decimation: {e}")
+            apply_profile(nodemap=self.nodemap, profile=profile)
+        except (ValueError, st.PyStError) as e:
+            logger.error("Failed to set Decimation: %s", e)
     
     
 if __name__ == "__main__":
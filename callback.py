@@ -1,5 +1,10 @@
-import stapipy as st
-import threading
+from utils.backend import st
+import logging
+from utils.logger import get_logger
+from utils.conversion import raw_image_to_numpy
+from utils.latest_frame import LatestFrameCache
+
+logger = get_logger("callback")
 
 class CallBack:
     """
@@ -7,27 +12,23 @@ class CallBack:
     """
     
     def __init__(self):
-        self._image = None
-        self._lock = threading.Lock()
+        self.latest = LatestFrameCache()  # 최신 원본 프레임 슬롯 (읽을 때 복사하지 않음)
         
     
     @property
     def image(self):
         """
-        획득한 이미지를 프로퍼티처럼 접근할 수 있게 해줌
-        Lock을 사용하여 멀티스레드 환경에서 데이터가 손실되는 것을 방지
+        획득한 이미지의 복사본 (release() 이후에도 사용해야 할 때만 사용)
+        반복해서 읽을 때는 복사 없이 self.latest.read()를 사용
         
         duplicate : 복사본 반환
         """
-        duplicate = None
-        self._lock.acquire()    # 멀티스레드 환경에서 한 번에 하나의 스레드만 접근 가능하도록 설정
-        
-        if self._image is not None:
-            duplicate = self._image.copy()
+        frame = self.latest.read(timeout=0)
+        if frame is None:
+            return None
         
-        self._lock.release()
-        
-        return duplicate
+        with frame:
+            return frame.copy()
     
     
     def datastream_callback(self, handle=None, context=None):
@@ -49,12 +50,14 @@ class CallBack:
                 if st_buffer.info.is_image_present == True:
                     # 이미지 객체 생성
                     st_image = st_buffer.get_image()
-                    print(f"BlockID : {st_buffer.info.frame_id} Size : {st_image.width} x {st_image.height} First Byte : {st_image.get_image_data()[0]}")
-                    
-                    # Lock을 사용하여 멀티스레드 환경에서 데이터가 손실되는 것을 방지
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("BlockID=%d Size=%d x %d First Byte=%d", st_buffer.info.frame_id, st_image.width, st_image.height, st_image.get_image_data()[0])
                     
+                    # 최신 프레임 슬롯에 게시 (버퍼는 곧 반환되므로 슬롯으로 한 번 복사)
+                    self.latest.publish(img_array=raw_image_to_numpy(image=st_image), frame_id=st_buffer.info.frame_id,
+                                        timestamp=st_buffer.info.timestamp)
                 else:
-                    print("Image data does not exist")
+                    logger.warning("Image data does not exist")
 
 
 if __name__ == '__main__':
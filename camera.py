@@ -1,10 +1,33 @@
-import stapipy as st
+from utils.backend import st
 import numpy as np
 import os
-import cv2
 from nodemaps.setting import set_enumeration
 from nodemaps.node_values import *
+from utils.save_pipeline import SavePipeline, POLICY_BLOCK
+from utils.conversion import image_to_numpy, raw_image_to_numpy, detach, create_plan
+from utils.frame_pool import FramePool
+from utils.writers import create_writer, FORMAT_BMP
+from nodemaps.profile import apply_profile
+from nodemaps.configuration import NodeHandles
+from utils.tracing import FrameTracer, STAGE_TRIGGER, STAGE_BUFFER, STAGE_CONVERTED, STAGE_NUMPY, STAGE_SAVED
+from utils.frame_stats import FrameStats
+from utils.stream_buffers import configure_stream, retrieve_loop, BufferMonitor
+from utils.latest_frame import LatestFrameCache
 import threading
+import logging
+import contextlib
+from collections import deque
+from utils.logger import get_logger
+
+logger = get_logger("camera")
+
+
+def raw_suffix(image) -> str:
+    """
+    raw 파일 이름에 붙일 크기와 픽셀 포맷 (헤더가 없으므로 다시 읽을 때 필요)
+    """
+    
+    return f"_{image.width}x{image.height}_{st.get_pixel_format_info(image.pixel_format).name}"
 
 class Camera:
     """
@@ -13,13 +36,15 @@ class Camera:
     멀티스레딩 지원하지 않음
     """
     
-    def __init__(self, st_system, isColor=True):
+    def __init__(self, st_system, isColor=True, image_format=FORMAT_BMP):
         """
         Args:
             st_system: stApi 시스템 객체
+            image_format: 저장 포맷 ("bmp", "raw", "png:3", "jpeg:high" 등 또는 ImageWriter 객체)
         """
         # Flags
         self.isColor = isColor
+        self.image_writer = create_writer(image_format)
         
         # directory
         self.image_save_dir = "captured_images"
@@ -45,7 +70,7 @@ class Camera:
         self.datastream.start_acquisition()
         self.device.acquisition_start()
         
-        print(f"Device {self.device.info.display_name} started")
+        logger.info("Device %s started", self.device.info.display_name)
     
     def datastream_callback(self, handle=None, context=None) -> None:
         """
@@ -65,19 +90,25 @@ class Camera:
                     if st_buffer.info.is_image_present == True:
                         # 이미지 객체 생성
                         st_image = st_buffer.get_image()
+                        # raw 저장이면 디베이어 없이 원본 버퍼 저장
+                        if self.image_writer.raw == True:
+                            self.save_image(img_array=raw_image_to_numpy(image=st_image), frame_id=st_buffer.info.frame_id,
+                                            suffix=raw_suffix(image=st_image))
+                            return
                         # 이미지 변환
                         st_image = self.st_converter_pixelformat.convert(st_image)
-                        # 로깅
-                        print(f"BlockID={st_buffer.info.frame_id} Size={st_image.width} x {st_image.height} First Byte={st_image.get_image_data()[0]}")
+                        # 로깅 (디버그 레벨에서만 첫 바이트 확인)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("BlockID=%d Size=%d x %d First Byte=%d", st_buffer.info.frame_id, st_image.width, st_image.height, st_image.get_image_data()[0])
                         # raw 이미지를 numpy 배열로 변환
                         st_image = self.raw_to_numpy(image=st_image)
                         # 이미지 저장
                         self.save_image(img_array=st_image, frame_id=st_buffer.info.frame_id)
                     else:
                         # # 버퍼에 이미지가 없는 경우
-                        print("Image data does not exist.")
+                        logger.warning("Image data does not exist.")
             except st.PyStError as exception:
-                print("An exception occurred.", exception)
+                logger.error("An exception occurred. %s", exception)
     
     def get_image(self) -> None:
         """
@@ -86,17 +117,20 @@ class Camera:
         트리거 모드 사용하지 않을 경우 이 메소드 사용
         """
         
-        while self.datastream.is_grabbing:
-            with self.datastream.retrieve_buffer(0) as buffer:   # with ~ as 구문으로 버퍼를 자동으로 해제
-                # 버퍼에 이미지가 있는지 확인
-                if buffer.info.is_image_present:
-                    image = buffer.get_image()
-                    image = self.st_converter_pixelformat.convert(image)   # 이미지 변환
-                    print(f"BlockID : {buffer.info.frame_id} Size : {image.width} x {image.height} Bytes : {image.get_image_data()[0]}")
-                    image = self.raw_to_numpy(image=image)   # raw 이미지를 numpy 배열로 변환
-                    self.save_image(img_array=image, frame_id=buffer.info.frame_id)
-                else:
-                    print("Image data does not exist")
+        def handle_buffer(buffer) -> None:
+            # 버퍼에 이미지가 있는지 확인
+            if buffer.info.is_image_present:
+                image = buffer.get_image()
+                image = self.st_converter_pixelformat.convert(image)   # 이미지 변환
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("BlockID=%d Size=%d x %d First Byte=%d", buffer.info.frame_id, image.width, image.height, image.get_image_data()[0])
+                image = self.raw_to_numpy(image=image)   # raw 이미지를 numpy 배열로 변환
+                self.save_image(img_array=image, frame_id=buffer.info.frame_id)
+            else:
+                logger.warning("Image data does not exist.")
+        
+        # 버퍼가 올 때까지 잠들어 기다림 (retrieve_buffer(0)으로 계속 확인하면 코어 하나를 점유)
+        retrieve_loop(datastream=self.datastream, handle_buffer=handle_buffer, running=lambda: self.datastream.is_grabbing)
     
     def stop(self) -> None:
         """
@@ -106,7 +140,7 @@ class Camera:
         self.device.acquisition_stop()
         self.datastream.stop_acquisition()
         set_enumeration(self.nodemap, TRIGGER_MODE, TRIGGER_MODE_OFF)
-        print(f"Device {self.device.info.display_name} stopped")
+        logger.info("Device %s stopped", self.device.info.display_name)
     
     def set_converter(self, isColor:bool=True) -> st.PyStConverter:
         """
@@ -127,43 +161,33 @@ class Camera:
 
     def raw_to_numpy(self, image:st.PyStImage):
         """
-        raw 이미지를 numpy 배열로 변환
+        raw 이미지를 numpy 배열로 변환 (복사 없음)
         
         Args:
             image: raw 이미지 객체
         
         Return:
-            img_array: 변환된 이미지 넘파이 배열
+            img_array: 이미지 메모리를 참조하는 넘파이 배열, 버퍼가 유효한 동안만 사용 가능
         """
         
-        width, height = image.width, image.height
-        raw_image = image.get_image_data()
-        
-        # Numpy 배열로 변환
-        img_array = np.array(raw_image, dtype=np.uint8)
-        
-        if self.isColor == True:
-            img_array = img_array.reshape((height, width, 3))
-        else:
-            img_array = img_array.reshape((height, width))
-        
-        return img_array
+        return image_to_numpy(image=image, isColor=self.isColor)
     
-    def save_image(self, img_array: np.ndarray, frame_id: int) -> None:
+    def save_image(self, img_array: np.ndarray, frame_id: int, suffix:str="") -> None:
         """
         캡쳐된 이미지를 저장하는 메소드
         
         Args:
             img_array: 이미지 배열
             frame_id: 프레임 ID
+            suffix: 파일 이름 뒤에 붙일 문자열 (raw 저장 시 크기와 픽셀 포맷)
         """
         
         # 이미지 저장 경로 설정
-        fileName = os.path.join(self.image_save_dir, self.device.info.display_name + f"_{frame_id}.bmp")
+        fileName = self.image_writer.file_name(os.path.join(self.image_save_dir, self.device.info.display_name + f"_{frame_id}{suffix}"))
         
         # 이미지 저장
-        cv2.imwrite(filename=fileName, img=img_array)
-        print(f"Image saved: {fileName}")
+        if self.image_writer.write(file_name=fileName, img_array=img_array):
+            logger.debug("Image saved: %s", fileName)
     
     def set_trigger_mode(self, nodemap) -> None: #TRY: nodemap을 인자로 받으면 nodemap이 적용되는지 확인하기
         """
@@ -198,14 +222,49 @@ class CameraWorker(threading.Thread):
     """
     
     def __init__(self, group = None, target = None, name = None, args = ..., kwargs = None, *, daemon = None,
-                    st_system:st.PyStSystem, camera_index:int, isColor:bool=True, barrier, barrier2) -> None:
+                    st_system:st.PyStSystem, camera_index:int, isColor:bool=True, barrier, barrier2=None,
+                    save_pipeline:SavePipeline=None, frame_pool_size:int=8, device=None, tracer:FrameTracer=None,
+                    bundler=None, scheduler=None, image_format=FORMAT_BMP, recorder=None, process_pool=None,
+                    keep_16bit:bool=False, profile=None, buffer_count:int=None, buffer_handling_mode:str=None) -> None:
         super().__init__(group, target, name, args, kwargs, daemon=daemon)
+        """
+        Args:
+            device: 미리 연 stApi 장치 객체 (시리얼 번호로 연 장치), None이면 첫 번째 카메라를 엶
+            tracer: 프레임 단계별 지연 시간 기록기, None이면 기록하지 않음
+            bundler: action별 멀티 카메라 번들 수집기 (ActionBundler), None이면 사용하지 않음
+            scheduler: action 완료를 추적하는 스케줄러 (ActionScheduler), None이면 barrier2로 동기화
+            save_pipeline: 비동기 저장 파이프라인, None이면 콜백 스레드에서 직접 저장
+            frame_pool_size: 저장 대기 프레임용으로 미리 할당할 슬롯 개수
+            image_format: 저장 포맷 ("bmp", "raw", "png:3", "jpeg:high" 등 또는 ImageWriter 객체)
+            recorder: 프레임을 이어 붙일 컨테이너 기록기 (SequenceRecorder), 지정하면 파일별 저장 대신 사용
+            process_pool: 변환, 인코딩을 맡길 워커 프로세스 풀 (ProcessEncodePool), 지정하면 콜백에서 컨버터를 생략
+            keep_16bit: 워커 프로세스 변환 시 10 ~ 16비트 데이터를 uint16 그대로 저장 (png / tiff)
+            profile: 획득 전에 적용할 ROI / 비닝 / 디시메이션 / 픽셀 포맷 프로필 (CameraProfile), None이면 현재 설정 유지
+            buffer_count: 데이터 스트림 버퍼 수, None이면 GenTL 기본값
+            buffer_handling_mode: 데이터 스트림 버퍼 처리 방식 (OldestFirst / OldestFirstOverwrite / NewestOnly), None이면 현재 값 유지
+        """
         
         # Flags
         self.isColor = isColor
         self.camera_index = camera_index
         self.barrier = barrier
         self.barrierTrigger = barrier2
+        self.save_pipeline = save_pipeline
+        self.tracer = tracer if tracer is not None else FrameTracer(enabled=False)
+        self.bundler = bundler
+        self.scheduler = scheduler
+        self.image_writer = create_writer(image_format)
+        self.recorder = recorder
+        self.process_pool = process_pool
+        self.keep_16bit = keep_16bit
+        self._conversion_plans = {}     # 픽셀 포맷 -> ConversionPlan
+        
+        # 트리거된 순서대로 도착할 프레임의 action 번호 (여러 action이 동시에 진행될 수 있음)
+        self.action = None
+        self.pending_actions = deque()
+        self.expired_actions = {}       # action 번호 -> 타임아웃됐지만 아직 대기 목록에 남은 항목 수 (늦게 도착한 프레임을 버리기 위함)
+        self.last_frame_id = None
+        self._action_lock = threading.Lock()
         
         # directory
         # self.image_save_dir = "captured_images"
@@ -213,17 +272,39 @@ class CameraWorker(threading.Thread):
         os.makedirs(name=self.image_save_dir, exist_ok=True)
         
         # 카메라 객체 생성
-        self.device = st_system.create_first_device()
+        self.device = device if device is not None else st_system.create_first_device()
         # 노드맵 설정 및 초기화
         self.nodemap = self.device.remote_port.nodemap
+        # 노드 핸들 캐시 (노드 검색과 래핑은 노드마다 한 번만)
+        self.nodes = NodeHandles(self.nodemap)
         # 픽셀 포맷 컨버터 설정
         self.st_converter_pixelformat = self.set_converter()
         # 트리거 모드 ON
-        self.set_trigger_mode(nodemap=self.nodemap)
+        self.set_trigger_mode()
+        self.trigger_source = TRIGGER_SOURCE_SOFTWARE
         # 트리거 Command 인터페이스 가져오기
         self.trigger_software = st.PyICommand(self.nodemap.get_node(TRIGGER_SOFTWARE))
         # 데이터 스트림 객체 생성
         self.datastream = self.device.create_datastream()
+        # 버퍼 수 / 버퍼 처리 방식 (획득 시작 시 버퍼가 할당되므로 그 전에 설정)
+        configure_stream(datastream=self.datastream, buffer_count=buffer_count, handling_mode=buffer_handling_mode)
+        # 콜백 처리 시간과 버퍼 사용량 (권장 버퍼 수 계산용)
+        self.buffer_monitor = BufferMonitor(datastream=self.datastream)
+        # 프레임 손실 / 불완전 버퍼 / 트리거 매칭 계수기
+        self.frame_stats = FrameStats(camera_index=camera_index, serial=self.device.info.serial_number, datastream=self.datastream)
+        # action별 프레임 타임스탬프 (카메라 간 skew 측정용)
+        self.frame_timestamps = {}
+        # 프리런 스트리밍 중 최신 프레임 (미리보기용, 읽을 때 복사하지 않음)
+        self.streaming = False
+        self.latest_frame = LatestFrameCache()
+        # ROI / 비닝 / 디시메이션 / 픽셀 포맷 프로필 (프레임 링 버퍼 크기가 정해지기 전에 적용)
+        self.frame_pool = None
+        self.profile = None
+        if profile is not None:
+            self.set_profile(profile=profile)
+        # 저장 대기 프레임용 링 버퍼 (비동기 저장 시에만 사용)
+        if self.save_pipeline is not None and self.recorder is None and self.process_pool is None:
+            self.frame_pool = self.create_frame_pool(num_slots=frame_pool_size)
     
     def run(self) -> None:
         """
@@ -241,7 +322,7 @@ class CameraWorker(threading.Thread):
         self.datastream.start_acquisition()
         self.device.acquisition_start()
         
-        print(f"[Camera {self.camera_index} - {self.device.info.display_name}] Started acquisition.")
+        logger.info("[Camera %d - %s] Started acquisition.", self.camera_index, self.device.info.display_name)
         
         if self.barrier:
             self.barrier.wait()
@@ -254,9 +335,21 @@ class CameraWorker(threading.Thread):
         self.device.acquisition_stop()
         self.datastream.stop_acquisition()
         # 트리거 모드 OFF
-        set_enumeration(nodemap=self.nodemap, enum_name=TRIGGER_MODE, entry_name=TRIGGER_MODE_OFF)
+        self.nodes.set(TRIGGER_MODE, TRIGGER_MODE_OFF)
+        self.streaming = False
+        self.latest_frame.clear()
+        
+        logger.info("[Camera %d - %s] Stopped acquisition.", self.camera_index, self.device.info.display_name)
+    
+    def release(self) -> None:
+        """
+        획득을 시작하지 않고 버려지는 워커 정리 (설정 단계 시간 초과 후 늦게 생성된 경우)
+        생성 중에 켠 트리거 모드를 끄고, 장치 / 데이터 스트림 핸들은 참조를 놓으면 해제됨
+        """
         
-        print(f"[Camera {self.camera_index} - {self.device.info.display_name}] Stopped acquisition.")
+        self.nodes.set(TRIGGER_MODE, TRIGGER_MODE_OFF)
+        
+        logger.info("[Camera %d - %s] Released unused worker.", self.camera_index, self.device.info.display_name)
     
     def datastream_callback(self, handle=None, context=None) -> None:
         """
@@ -269,28 +362,212 @@ class CameraWorker(threading.Thread):
         
         # 새로운 데이터 버퍼가 도착했을 때 발생하는 이벤트
         if handle.callback_type == st.EStCallbackType.GenTLDataStreamNewBuffer:
+            # 프리런 스트리밍 중이면 action 매칭 / 저장 없이 최신 프레임만 게시
+            if self.streaming == True:
+                self.publish_latest()
+                return
+            action = None
+            retrieved = False
+            late = False
+            ok = False
+            started = None
             try:
                 # 0으로 해야 버퍼를 즉시 가져올 수 있음음, 불필요한 대기 시간을 줄이고 빠르게 다음 작업 수행 가능
                 with self.datastream.retrieve_buffer(0) as buffer:
+                    retrieved = True
+                    started = self.buffer_monitor.begin()
+                    self.frame_stats.frame(frame_id=buffer.info.frame_id, image_present=buffer.info.is_image_present,
+                                            incomplete=buffer.info.is_incomplete)
+                    # 이 프레임이 속한 action (트리거 순서대로 매칭)
+                    action = self.next_action(frame_id=buffer.info.frame_id)
+                    if action is None:
+                        # 이미 타임아웃 처리된 action의 늦은 프레임이므로 다음 action에 매칭하지 않고 버림
+                        late = True
+                        return
+                    self.tracer.mark(STAGE_BUFFER, self.camera_index, action, buffer.info.frame_id)
                     # 버퍼에 이미지가 있는지 확인
                     if buffer.info.is_image_present == True:
                         # 이미지 객체 생성
                         image = buffer.get_image()
+                        self.frame_timestamps[action] = buffer.info.timestamp
+                        # 워커 프로세스 풀이 있으면 원본 버퍼를 넘겨 변환과 저장을 맡김 (번들이 없으면 컨버터 생략)
+                        if self.process_pool is not None:
+                            self.offload_image(image=image, frame_id=buffer.info.frame_id, action=action)
+                            if self.bundler is None:
+                                ok = True
+                                return
+                        # raw 저장이면 디베이어 없이 원본 버퍼 저장 (번들이 없으면 컨버터 생략)
+                        elif self.image_writer.raw == True:
+                            self.save_image(img_array=raw_image_to_numpy(image=image), frame_id=buffer.info.frame_id,
+                                            action=action, suffix=raw_suffix(image=image))
+                            if self.bundler is None:
+                                ok = True
+                                return
                         # 이미지 변환
                         image = self.st_converter_pixelformat.convert(image)
-                        # 로깅
-                        print(f"[action: {self.action}] [Camera {self.camera_index} - {self.device.info.display_name}] BlockID={buffer.info.frame_id} Size={image.width} x {image.height} First Byte={image.get_image_data()[0]}")
+                        self.tracer.mark(STAGE_CONVERTED, self.camera_index, action)
+                        # 로깅 (디버그 레벨에서만 첫 바이트 확인)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("[action: %s] [Camera %d - %s] BlockID=%d Size=%d x %d First Byte=%d", action, self.camera_index,
+                                            self.device.info.display_name, buffer.info.frame_id, image.width, image.height, image.get_image_data()[0])
                         # # raw 이미지를 numpy 배열로 변환
                         image = self.raw_to_numpy(image=image)
-                        # 이미지 저장
-                        self.save_image(img_array=image, frame_id=buffer.info.frame_id)
-                        self.barrierTrigger.wait()
+                        self.tracer.mark(STAGE_NUMPY, self.camera_index, action)
+                        # action 번들에 프레임 추가 (번들 배열로 복사됨)
+                        if self.bundler is not None:
+                            self.bundler.add(camera_index=self.camera_index, action=action, img_array=image,
+                                                frame_id=buffer.info.frame_id, timestamp=buffer.info.timestamp)
+                        # 이미지 저장 (파이프라인이 있으면 큐에 넘기고 바로 반환)
+                        if self.process_pool is None and self.image_writer.raw == False:
+                            self.save_image(img_array=image, frame_id=buffer.info.frame_id, action=action)
+                        ok = True
                     else:
-                        # # 버퍼에 이미지가 없는 경우
-                        print(f"[Camera {self.camera_index} - {self.device.info.display_name}] Image data does not exist.")
+                        # # 버퍼에 이미지가 없는 경우 (불완전 버퍼 포함)
+                        logger.warning("[Camera %d - %s] Image data does not exist (frame ID %d%s).", self.camera_index,
+                                        self.device.info.display_name, buffer.info.frame_id,
+                                        ", incomplete" if buffer.info.is_incomplete else "")
             except st.PyStError as exception:
-                print(f"[Camera {self.camera_index} - {self.device.info.display_name}] Error: {exception}")
+                self.frame_stats.count("errors")
+                logger.error("[Camera %d - %s] Error: %s", self.camera_index, self.device.info.display_name, exception)
+            finally:
+                if started is not None:
+                    self.buffer_monitor.end(started)
+                # 버퍼를 꺼내지 못했으면 이 이벤트에 대응하는 프레임이 없으므로 대기 중인 action을 건드리지 않음
+                if retrieved == True and late == False:
+                    # 버퍼는 꺼냈지만 action을 정하기 전에 실패한 경우 그 프레임의 action을 실패 처리
+                    if action is None:
+                        action = self.next_action()
+                    if action is not None:
+                        self.finish_action(action=action, ok=ok)
+    
+    def publish_latest(self) -> None:
+        """
+        프리런 스트리밍 중 도착한 버퍼를 변환해 최신 프레임 슬롯에 게시 (프레임당 복사 한 번, 읽는 쪽은 복사 없음)
+        """
         
+        started = None
+        try:
+            with self.datastream.retrieve_buffer(0) as buffer:
+                started = self.buffer_monitor.begin()
+                self.frame_stats.frame(frame_id=buffer.info.frame_id, image_present=buffer.info.is_image_present,
+                                        incomplete=buffer.info.is_incomplete)
+                if buffer.info.is_image_present == True:
+                    image = self.st_converter_pixelformat.convert(buffer.get_image())
+                    self.latest_frame.publish(img_array=self.raw_to_numpy(image=image), frame_id=buffer.info.frame_id,
+                                                timestamp=buffer.info.timestamp)
+                else:
+                    logger.warning("[Camera %d - %s] Image data does not exist (frame ID %d%s).", self.camera_index,
+                                    self.device.info.display_name, buffer.info.frame_id,
+                                    ", incomplete" if buffer.info.is_incomplete else "")
+        except st.PyStError as exception:
+            self.frame_stats.count("errors")
+            logger.error("[Camera %d - %s] Error: %s", self.camera_index, self.device.info.display_name, exception)
+        finally:
+            if started is not None:
+                self.buffer_monitor.end(started)
+    
+    def next_action(self, frame_id:int=None):
+        """
+        도착한 프레임에 대응하는 action 번호 (가장 먼저 트리거된 미완료 action)
+        프레임 ID가 건너뛰었으면 전송 중 손실된 프레임이므로 그만큼의 action을 실패 처리
+        
+        Args:
+            frame_id: 도착한 프레임 ID, None이면 손실 확인 없이 다음 action 반환
+        
+        Return:
+            action 번호, 이미 타임아웃 처리된 action의 늦은 프레임이면 None
+        """
+        
+        lost = []
+        late = False
+        with self._action_lock:
+            if frame_id is not None:
+                if self.last_frame_id is not None:
+                    gap = frame_id - self.last_frame_id - 1
+                    while gap > 0 and len(self.pending_actions) > 1:
+                        skipped = self.pending_actions.popleft()
+                        # 타임아웃된 action은 이미 실패로 집계되었으므로 다시 실패 처리하지 않음
+                        if self.take_expired_locked(action=skipped) == False:
+                            lost.append(skipped)
+                        gap -= 1
+                self.last_frame_id = frame_id
+            matched = len(self.pending_actions) > 0
+            action = self.pending_actions.popleft() if matched else self.action
+            if matched == True and self.take_expired_locked(action=action) == True:
+                late = True
+        
+        if frame_id is not None:
+            self.frame_stats.count("matched" if matched == True and late == False else "unmatched")
+        if len(lost) > 0:
+            self.frame_stats.count("lost_actions", len(lost))
+        for lost_action in lost:
+            logger.warning("[Camera %d] Frame for action %s was lost (frame ID gap before %d)", self.camera_index, lost_action, frame_id)
+            self.finish_action(action=lost_action, ok=False)
+        
+        if late == True:
+            logger.warning("[Camera %d] Dropped late frame for expired action %s", self.camera_index, action)
+            return None
+        return action
+    
+    def finish_action(self, action, ok:bool) -> None:
+        """
+        action 프레임 처리 완료를 스케줄러(또는 배리어)에 알림
+        
+        Args:
+            action: action 번호
+            ok: 프레임을 정상적으로 처리했는지 여부
+        """
+        
+        if self.scheduler is not None:
+            self.scheduler.complete(action=action, camera_index=self.camera_index, ok=ok)
+        elif self.barrierTrigger is not None and ok == True:
+            self.barrierTrigger.wait()
+    
+    def expire(self, action) -> None:
+        """
+        타임아웃된 action을 대기 목록에 표시만 해둠 (프레임이 누락된 경우)
+        목록에서 바로 빼면 늦게 도착한 프레임이 다음 action에 매칭되므로, 자리를 남겨두고 도착하면 버림
+        """
+        
+        with self._action_lock:
+            if self.pending_actions.count(action) > self.expired_actions.get(action, 0):
+                self.expired_actions[action] = self.expired_actions.get(action, 0) + 1
+                self.frame_stats.count("expired_actions")
+    
+    def take_expired_locked(self, action) -> bool:
+        """
+        대기 목록에서 꺼낸 action이 타임아웃된 항목인지 확인하고 표시를 하나 지움 (_action_lock을 잡은 상태에서 호출)
+        같은 번호는 타임아웃된 항목이 항상 앞쪽에 있으므로 개수로만 관리
+        
+        Args:
+            action: 대기 목록에서 꺼낸 action 번호
+        
+        Return:
+            타임아웃된 항목이었으면 True
+        """
+        
+        count = self.expired_actions.get(action, 0)
+        if count == 0:
+            return False
+        if count == 1:
+            del self.expired_actions[action]
+        else:
+            self.expired_actions[action] = count - 1
+        return True
+    
+    def drop_expired_locked(self) -> None:
+        """
+        스트림을 다시 시작하면 타임아웃된 action의 프레임은 더 이상 도착하지 않으므로 대기 목록에서 제거 (_action_lock을 잡은 상태에서 호출)
+        """
+        
+        if len(self.expired_actions) == 0:
+            return
+        remaining = deque()
+        for action in self.pending_actions:
+            if self.take_expired_locked(action=action) == False:
+                remaining.append(action)
+        self.pending_actions = remaining
+
     
     def set_converter(self) -> st.PyStConverter:
         """
@@ -308,75 +585,290 @@ class CameraWorker(threading.Thread):
 
     def raw_to_numpy(self, image:st.PyStImage) -> np.ndarray:
         """
-        raw 이미지를 numpy 배열로 변환하는 메소드
+        raw 이미지를 numpy 배열로 변환하는 메소드 (복사 없음)
         
         Args:
             image: raw 이미지 객체
         
         Return:
-            img_array: 변환된 이미지 넘파이 배열
+            img_array: 이미지 메모리를 참조하는 넘파이 배열, 버퍼가 유효한 동안만 사용 가능
         """
         
-        width, height = image.width, image.height
-        raw_image = image.get_image_data()
-        
-        # Numpy 배열로 변환
-        img_array = np.array(object=raw_image, dtype=np.uint8)
-        
-        if self.isColor == True:
-            img_array = img_array.reshape((height, width, 3))
-        else:
-            img_array = img_array.reshape((height, width))
-        
-        return img_array
+        return image_to_numpy(image=image, isColor=self.isColor)
     
-    def save_image(self, img_array: np.ndarray, frame_id: int) -> None:
+    def save_image(self, img_array: np.ndarray, frame_id: int, action=None, suffix:str="") -> None:
         """
         캡쳐된 이미지를 저장하는 메소드
         
         Args:
             img_array: 이미지 배열
             frame_id: 프레임 ID
+            action: 프레임이 속한 action 번호, None이면 마지막으로 트리거된 action
+            suffix: 파일 이름 뒤에 붙일 문자열 (raw 저장 시 크기와 픽셀 포맷)
         """
         
+        if action is None:
+            action = self.action
+        
+        # 컨테이너 기록: 세그먼트 메모리 맵에 바로 복사 (파일 생성, 인코딩 없음)
+        if self.recorder is not None:
+            if self.recorder.append(camera_index=self.camera_index, action=action, frame_id=frame_id,
+                                    timestamp=self.frame_timestamps.get(action, 0), img_array=img_array):
+                self.tracer.mark(STAGE_SAVED, self.camera_index, action)
+            return
+        
         # 이미지 저장 경로 설정
-        fileName = os.path.join(self.image_save_dir, f"action{self.action}_{self.camera_index}_{self.device.info.display_name}_{frame_id}.bmp")
+        fileName = self.image_writer.file_name(os.path.join(self.image_save_dir,
+                                                f"action{action}_{self.camera_index}_{self.device.info.display_name}_{frame_id}{suffix}"))
+        
+        # 비동기 저장: writer 스레드 풀에 넘김
+        # 프레임이 버퍼 해제 이후에도 사용되므로 이 경우에만 링 버퍼 슬롯에 복사
+        if self.save_pipeline is not None:
+            block = self.save_pipeline.policy == POLICY_BLOCK
+            frame = self.frame_pool.copy_in(img_array=img_array, block=block)
+            if frame is not None:
+                def on_done(saved:bool) -> None:
+                    # 저장에 실패하거나 버려져도 슬롯은 반환
+                    frame.release()
+                    self.mark_saved(action=action, saved=saved)
+                accepted = self.save_pipeline.submit(file_name=fileName, img_array=frame.array, on_done=on_done,
+                                                        writer=self.image_writer)
+            elif not self.frame_pool.fits(img_array):
+                # 프레임 크기가 풀과 다른 경우(ROI 변경 등) 새 배열로 복사
+                accepted = self.save_pipeline.submit(file_name=fileName, img_array=detach(img_array),
+                                                        on_done=lambda saved: self.mark_saved(action=action, saved=saved),
+                                                        writer=self.image_writer)
+            else:
+                accepted = False
+            
+            if accepted == False:
+                logger.warning("[Camera %d] Frame dropped: %s", self.camera_index, fileName)
+            return
         
         # 이미지 저장
-        cv2.imwrite(filename=fileName, img=img_array)
-        print(f"[Camera {self.camera_index}] Image saved: {fileName}")
+        if self.image_writer.write(file_name=fileName, img_array=img_array):
+            self.tracer.mark(STAGE_SAVED, self.camera_index, action)
+            logger.debug("[Camera %d] Image saved: %s", self.camera_index, fileName)
     
-    def set_trigger_mode(self, nodemap) -> None:
+    def mark_saved(self, action, saved:bool) -> None:
         """
-        TriggerMode 설정
+        비동기 저장 완료 콜백 (저장에 성공한 프레임만 STAGE_SAVED로 기록)
+        
+        Args:
+            action: 프레임이 속한 action 번호
+            saved: 파일을 저장했으면 True, 실패하거나 버려졌으면 False
+        """
+        
+        if saved:
+            self.tracer.mark(STAGE_SAVED, self.camera_index, action)
+    
+    def offload_image(self, image, frame_id:int, action) -> None:
+        """
+        원본 버퍼를 공유 메모리로 복사하여 워커 프로세스에서 변환, 저장하도록 요청
+        
+        Args:
+            image: 컨버터를 거치지 않은 stApi 이미지 객체
+            frame_id: 프레임 ID
+            action: 프레임이 속한 action 번호
+        """
+        
+        suffix = raw_suffix(image=image) if self.image_writer.raw == True else ""
+        fileName = self.image_writer.file_name(os.path.join(self.image_save_dir,
+                                                f"action{action}_{self.camera_index}_{self.device.info.display_name}_{frame_id}{suffix}"))
+        
+        accepted = self.process_pool.submit(raw_array=raw_image_to_numpy(image=image), file_name=fileName, writer=self.image_writer,
+                                            plan=self.conversion_plan(pixel_format=image.pixel_format), on_done=lambda saved: self.mark_saved(action=action, saved=saved))
+        if accepted == False:
+            logger.warning("[Camera %d] Frame dropped: %s", self.camera_index, fileName)
+    
+    def conversion_plan(self, pixel_format):
+        """
+        원본 픽셀 포맷의 변환 계획 (픽셀 포맷별로 한 번만 생성)
+        """
+        
+        plan = self._conversion_plans.get(pixel_format)
+        if plan is None:
+            plan = self._conversion_plans[pixel_format] = create_plan(pixel_format=pixel_format, isColor=self.isColor,
+                                                                        keep_16bit=self.keep_16bit)
+        
+        return plan
+    
+    @contextlib.contextmanager
+    def paused(self):
+        """
+        획득 중이면 데이터 스트림을 잠시 멈추는 컨텍스트 (ROI, 픽셀 포맷처럼 획득 중에 쓸 수 없는 노드를 바꿀 때 사용)
+        블록이 끝나면 예외가 나도 다시 시작
+        """
+        
+        acquiring = self.datastream.is_grabbing
+        if acquiring:
+            self.device.acquisition_stop()
+            self.datastream.stop_acquisition()
+        try:
+            yield
+        finally:
+            if acquiring:
+                # 스트림을 다시 시작하면 프레임 ID가 처음부터 다시 시작될 수 있으므로 손실 검사 기준 초기화
+                with self._action_lock:
+                    self.last_frame_id = None
+                    self.drop_expired_locked()
+                self.frame_stats.restart()
+                self.datastream.start_acquisition()
+                self.device.acquisition_start()
+    
+    def set_profile(self, profile) -> dict:
+        """
+        ROI / 비닝 / 디시메이션 / 픽셀 포맷 프로필 적용
+        획득 중이면 데이터 스트림을 잠시 멈추고 적용한 뒤 다시 시작 (크기가 바뀌면 GenTL 버퍼도 다시 할당해야 함)
+        action 사이에 호출해야 하며, 실패하면 이전 설정으로 되돌아감
+        
+        Args:
+            profile: 적용할 프로필 (CameraProfile)
+        
+        Return:
+            변경된 노드 {노드 이름: (이전 값, 새 값)}
+        """
+        
+        with self.paused():
+            changed = apply_profile(nodemap=self.nodemap, profile=profile)
+        self.profile = profile
+        
+        if len(changed) > 0:
+            self.resize_frame_pool()
+        
+        logger.info("[Camera %d - %s] Profile '%s' applied: %s", self.camera_index, self.device.info.display_name,
+                    profile.name, changed if len(changed) > 0 else "no change")
+        
+        return changed
+    
+    def resize_frame_pool(self) -> None:
+        """
+        이미지 크기가 바뀌었으면 링 버퍼를 새 크기로 다시 할당 (저장 중인 슬롯은 이전 풀로 반환됨)
+        """
+        
+        if self.frame_pool is None:
+            return
+        
+        if self.frame_pool.shape[:2] != (self.nodes.get(HEIGHT), self.nodes.get(WIDTH)):
+            self.frame_pool = self.create_frame_pool(num_slots=self.frame_pool.num_slots)
+    
+    def create_frame_pool(self, num_slots:int) -> FramePool:
+        """
+        현재 이미지 크기(ROI)에 맞는 프레임 링 버퍼 생성
+        
+        Args:
+            num_slots: 미리 할당할 슬롯 개수
+        """
+        
+        width = st.PyIInteger(self.nodemap.get_node(WIDTH)).value
+        height = st.PyIInteger(self.nodemap.get_node(HEIGHT)).value
+        # raw 저장은 디베이어 전 1채널 버퍼를 보관
+        channels = 3 if self.isColor == True and self.image_writer.raw == False else 1
+        
+        return FramePool(width=width, height=height, channels=channels, num_slots=num_slots)
+    
+    def set_trigger_mode(self) -> None:
+        """
+        TriggerMode 설정 (이미 설정된 값은 쓰지 않음)
         """
         
         try:
             # FrameStart 트리거는 새로운 프레임의 캡처를 시작할 때 발생함
             # 이 트리거는 카메라가 새로운 이미지를 캡처하기 시작할 때 활성화
             # 일반적으로 프레임 기반 캡처를 제어하는 데 사용됨
-            set_enumeration(nodemap=nodemap, enum_name=TRIGGER_SELECTOR, entry_name=TRIGGER_SELECTOR_FRAME_START)
+            self.nodes.set(TRIGGER_SELECTOR, TRIGGER_SELECTOR_FRAME_START)
         except st.PyStError:
             # ExposureStart 트리거는 이미지 센서가 노출을 시작할 때 발생함
             # 이 트리거는 이미지 센서가 빛을 감지하기 시작할 때 활성화
             # 노출 시간과 관련된 작업을 제어하는 데 사용됨
-            set_enumeration(nodemap=nodemap, enum_name=TRIGGER_SELECTOR, entry_name=TRIGGER_SELECTOR_EXPOSURE_START)
-
-        # 트리거모드 ON
-        set_enumeration(nodemap=nodemap, enum_name=TRIGGER_MODE, entry_name=TRIGGER_MODE_ON)
+            self.nodes.set(TRIGGER_SELECTOR, TRIGGER_SELECTOR_EXPOSURE_START)
 
-        # 소프트웨어 트리거 소스 설정
-        set_enumeration(nodemap=nodemap, enum_name=TRIGGER_SOURCE, entry_name=TRIGGER_SOURCE_SOFTWARE)
+        # 트리거모드 ON, 소프트웨어 트리거 소스 설정
+        self.nodes.apply({TRIGGER_MODE: TRIGGER_MODE_ON, TRIGGER_SOURCE: TRIGGER_SOURCE_SOFTWARE})
+    
+    def start_streaming(self) -> None:
+        """
+        프리런 스트리밍 시작 (트리거 모드 OFF, 프레임은 저장하지 않고 latest_frame에만 게시)
+        획득 중이면 잠시 멈추고 바꾼 뒤 다시 시작
+        """
+        
+        with self.paused():
+            self.nodes.set(TRIGGER_MODE, TRIGGER_MODE_OFF)
+            self.streaming = True
+        
+        logger.info("[Camera %d - %s] Free-run streaming started.", self.camera_index, self.device.info.display_name)
+    
+    def stop_streaming(self) -> None:
+        """
+        프리런 스트리밍 종료 (트리거 모드 ON으로 복귀, 게시된 프레임은 비움)
+        """
+        
+        with self.paused():
+            self.nodes.set(TRIGGER_MODE, TRIGGER_MODE_ON)
+            self.streaming = False
+        self.latest_frame.clear()
+        
+        logger.info("[Camera %d - %s] Free-run streaming stopped: %s", self.camera_index, self.device.info.display_name,
+                    self.latest_frame.stats)
+    
+    def set_trigger_source(self, source:str) -> None:
+        """
+        TriggerSource 변경 (이미 설정된 값이면 생략)
+        
+        Args:
+            source: TriggerSource 엔트리 이름 (Software / Action0 / Line0)
+        """
+        
+        if source == self.trigger_source:
+            return
+        
+        self.nodes.set(TRIGGER_SOURCE, source)
+        if source == TRIGGER_SOURCE_LINE0:
+            self.nodes.set(TRIGGER_ACTIVATION, TRIGGER_ACTIVATION_RISING_EDGE)
+        self.trigger_source = source
+    
+    def enable_action_trigger(self, device_key:int, group_key:int) -> int:
+        """
+        액션 커맨드 수신 설정, 카메라마다 camera_index 비트를 그룹 마스크로 사용
+        
+        Args:
+            device_key: 액션 디바이스 키
+            group_key: 액션 그룹 키
+        
+        Return:
+            group_mask: 이 카메라의 그룹 마스크
+        """
+        
+        group_mask = 1 << self.camera_index
+        # 커맨드의 device key와 group key가 일치하고, group mask가 겹치는 카메라만 트리거됨
+        self.nodes.apply({ACTION_SELECTOR: 0, ACTION_DEVICE_KEY: device_key, ACTION_GROUP_KEY: group_key, ACTION_GROUP_MASK: group_mask})
+        
+        return group_mask
+    
+    def arm(self, action:int) -> None:
+        """
+        브로드캐스트 트리거 전에 action 번호만 설정 (트리거는 매니저가 한 번에 발생시킴)
+        """
+        
+        with self._action_lock:
+            self.action = action
+            self.pending_actions.append(action)
+        self.frame_stats.count("triggered")
+        self.tracer.mark(STAGE_TRIGGER, self.camera_index, action)
     
     def trigger(self, action:int) -> None:
         """
         소프트웨어 트리거 실행
         """
         
-        self.action = action
+        with self._action_lock:
+            self.action = action
+            self.pending_actions.append(action)
+        self.frame_stats.count("triggered")
         
+        self.tracer.mark(STAGE_TRIGGER, self.camera_index, action)
         self.trigger_software.execute()
-        print(f"[Camera {self.camera_index} - {self.device.info.display_name}] Trigger executed.")
+        logger.debug("[Camera %d - %s] Trigger executed.", self.camera_index, self.device.info.display_name)
 
 
 if __name__ == "__main__":
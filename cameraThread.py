@@ -1,8 +1,14 @@
-import stapipy as st
+from utils.backend import st
 import threading
 import os
 import numpy as np
 import cv2
+import logging
+from utils.logger import get_logger
+from utils.conversion import image_to_numpy
+from utils.stream_buffers import configure_stream, retrieve_loop, BufferMonitor
+
+logger = get_logger("cameraThread")
 
 
 class CameraThread(threading.Thread):
@@ -11,12 +17,14 @@ class CameraThread(threading.Thread):
     """
 
     def __init__(self, group = None, target = None, name = None, args = ..., kwargs = None, *, daemon = None,
-                    st_system, isColor = True):
+                    st_system, isColor = True, buffer_count:int=None, buffer_handling_mode:str=None):
         super().__init__(group, target, name, args, kwargs, daemon=daemon)
         """
         Args:
             st_system: StApi 시스템 객체
             isColor: 컬러카메라 or 모노카메라 여부
+            buffer_count: 데이터 스트림 버퍼 수, None이면 GenTL 기본값
+            buffer_handling_mode: 버퍼 처리 방식 (OldestFirst / OldestFirstOverwrite / NewestOnly), None이면 현재 값 유지
         """
         
         self.runningFlag = None  # 카메라 스레드 실행 여부 플래그
@@ -26,6 +34,8 @@ class CameraThread(threading.Thread):
         self.nodemap = self.device.remote_port.nodemap  # 카메라 설정을 위한 노드 맵
         
         self.datastream = self.device.create_datastream()   #TODO: 왜 self.device 아래에 위치하지 않고 여기다가 둬야할까
+        configure_stream(datastream=self.datastream, buffer_count=buffer_count, handling_mode=buffer_handling_mode)
+        self.buffer_monitor = BufferMonitor(datastream=self.datastream)
         self.st_converter_pixelformat = self.set_converter()
         
         self.image_save_dir = "captured_images"
@@ -41,23 +51,32 @@ class CameraThread(threading.Thread):
         
         self.datastream.start_acquisition()
         self.device.acquisition_start()
-        print(f"Device {self.device.info.display_name} started")
-        
-        while self.runningFlag == True:
-            with self.datastream.retrieve_buffer() as buffer:   # with 구문을 사용하여 버퍼를 자동으로 해제
-                if buffer.info.is_image_present == True:
-                    self.image = buffer.get_image()
-                    self.image = self.st_converter_pixelformat.convert(self.image)
-                    print(f"BlockID : {buffer.info.frame_id} Size : {self.image.width} x {self.image.height} First Byte : {self.image.get_image_data()[0]}")
-                    
-                    self.image = self.raw_to_numpy(image=self.image)
-                    self.save_image(img_array=self.image, frame_id=buffer.info.frame_id)
-                    # self.show_image(image=self.image, frame_id=buffer.info.frame_id)
-                else:
-                    print("Image data does not exist")
+        logger.info("Device %s started", self.device.info.display_name)
+        
+        # 버퍼가 없으면 짧은 타임아웃으로 잠들어 기다리고, 타임아웃마다 중지 플래그 확인
+        retrieve_loop(datastream=self.datastream, handle_buffer=self.handle_buffer, running=lambda: self.runningFlag == True,
+                        monitor=self.buffer_monitor)
                     
         self.device.acquisition_stop()
         self.datastream.stop_acquisition()
+        logger.info("Device %s buffers: %s", self.device.info.display_name, self.buffer_monitor.stats)
+    
+    def handle_buffer(self, buffer) -> None:
+        """
+        수신한 버퍼 하나 처리 (변환 후 저장), 반환하면 버퍼는 GenTL 큐로 돌아감
+        """
+        
+        if buffer.info.is_image_present == True:
+            self.image = buffer.get_image()
+            self.image = self.st_converter_pixelformat.convert(self.image)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("BlockID=%d Size=%d x %d First Byte=%d", buffer.info.frame_id, self.image.width, self.image.height, self.image.get_image_data()[0])
+            
+            self.image = self.raw_to_numpy(image=self.image)
+            self.save_image(img_array=self.image, frame_id=buffer.info.frame_id)
+            # self.show_image(image=self.image, frame_id=buffer.info.frame_id)
+        else:
+            logger.warning("Image data does not exist")
     
     
     def stop(self):
@@ -67,7 +86,7 @@ class CameraThread(threading.Thread):
         
         self.runningFlag = False
         self.join()
-        print(f"Device {self.device.info.display_name} stopped")
+        logger.info("Device %s stopped", self.device.info.display_name)
     
     
     def set_converter(self):
@@ -96,21 +115,10 @@ class CameraThread(threading.Thread):
             image: 이미지 객체
         
         Return:
-            img_array: 변환된 Numpy 배열
+            img_array: 이미지 메모리를 참조하는 Numpy 배열 (복사 없음), 버퍼가 유효한 동안만 사용 가능
         """
         
-        width, height = image.width, image.height
-        raw_image = image.get_image_data()
-        
-        # Numpy 배열로 변환
-        img_array = np.array(raw_image, dtype=np.uint8)
-        
-        if self.isColor == True:
-            img_array = img_array.reshape((height, width, 3))
-        else:
-            img_array = img_array.reshape((height, width))
-        
-        return img_array
+        return image_to_numpy(image=image, isColor=self.isColor)
     
     def save_image(self, img_array: np.ndarray, frame_id: int) -> None: #FIXME: 불안정
         """
@@ -125,7 +133,7 @@ class CameraThread(threading.Thread):
         
         # 이미지 저장
         cv2.imwrite(filename, img_array)
-        print(f"Image saved: {filename}")
+        logger.debug("Image saved: %s", filename)
 
     def show_image(self, image: np.ndarray, frame_id: int) -> None:
         """
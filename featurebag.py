@@ -1,6 +1,6 @@
 import os
 import tempfile
-import stapipy as st
+from utils.backend import st
 
 try:
     st.initialize()
@@ -1,36 +1,38 @@
-import stapipy as st
-import threading
-import numpy as np
+from utils.backend import st
+import logging
+from utils.logger import get_logger
 import cv2
 from utils.device_info import print_info
+from utils.conversion import raw_image_to_numpy, create_plan
+from utils.latest_frame import LatestFrameCache
+from utils.preview import PREVIEW_AREA
 
-DISPLAY_RESIZE_FACTOR = 0.5
+logger = get_logger("grab_callback")
+
+DISPLAY_PREVIEW_FACTOR = 2     # 화면에 표시할 축소 배율 (1/2), 표시할 때만 계산
 
 class CMyCallback:
     """
     콜백 함수를 포함하는 클래스
     """
     def __init__(self):
-        self._image = None
-        self._lock = threading.Lock()
+        self.latest = LatestFrameCache()  # 최신 프레임 슬롯 (읽을 때 복사하지 않음)
+        self._plans = {}    # 픽셀 포맷 -> ConversionPlan (스트림마다 한 번만 계산)
     
     @property
     def image(self):
         """
-        획득한 이미지를 프로퍼티처럼 접근할 수 있게 해줌
-        Lock을 사용하여 멀티스레드 환경에서 데이터가 손실되는 것을 방지
+        획득한 이미지의 복사본 (release() 이후에도 사용해야 할 때만 사용)
+        반복해서 읽는 미리보기는 복사 없이 self.latest.read()를 사용
         
         duplicate : 복사본 반환
         """
-        duplicate = None
-        self._lock.acquire()    # 멀티스레드 환경에서 한 번에 하나의 스레드만 접근 가능하도록 설정
-        
-        if self._image is not None:
-            duplicate = self._image.copy()  # 원본을 직접 반환하면 외부 코드에서 원본 데이터 접근 시 충돌 발생
-            
-        self._lock.release()    # 락을 해제하여 다른 스레드에 접근 허용
+        frame = self.latest.read(timeout=0)
+        if frame is None:
+            return None
         
-        return duplicate
+        with frame:
+            return frame.copy()
 
     def datastream_callback(self, handle=None, context=None):
         """
@@ -47,9 +49,10 @@ class CMyCallback:
                 if st_buffer.info.is_image_present == True:
                     # 이미지 객체 생성
                     st_image = st_buffer.get_image()
-                    print(f"BlockID : {st_buffer.info.frame_id} Size : {st_image.width} x {st_image.height} First Byte : {st_image.get_image_data()[0]}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("BlockID=%d Size=%d x %d First Byte=%d", st_buffer.info.frame_id, st_image.width, st_image.height, st_image.get_image_data()[0])
                 else:
-                    print("Image data does not exist")
+                    logger.warning("Image data does not exist")
 
     def datastream_callback_cv2(self, handle=None, context=None):
         """
@@ -68,44 +71,24 @@ class CMyCallback:
 
                     # Check the pixelformat of the input image.
                     pixel_format = st_image.pixel_format
-                    pixel_format_info = st.get_pixel_format_info(pixel_format)
-
-                    # Only mono or bayer is processed.
-                    if not(pixel_format_info.is_mono or pixel_format_info.is_bayer):
-                        return
-
-                    # Get raw image data.
-                    data = st_image.get_image_data()
+                    plan = self._plans.get(pixel_format)
+                    if plan is None:
+                        pixel_format_info = st.get_pixel_format_info(pixel_format)
 
-                    # Perform pixel value scaling if each pixel component is
-                    # larger than 8bit. Example: 10bit Bayer/Mono, 12bit, etc.
-                    if pixel_format_info.each_component_total_bit_count > 8:
-                        nparr = np.frombuffer(data, np.uint16)
-                        division = pow(2, pixel_format_info.each_component_valid_bit_count - 8)
-                        nparr = (nparr / division).astype('uint8')
-                    else:
-                        nparr = np.frombuffer(data, np.uint8)
+                        # Only mono or bayer is processed.
+                        if not(pixel_format_info.is_mono or pixel_format_info.is_bayer):
+                            return
 
-                    # Process image for display.
-                    nparr = nparr.reshape(st_image.height, st_image.width, 1)
+                        # 비트 시프트, Bayer 변환 코드는 픽셀 포맷별로 한 번만 계산
+                        # (Bayer는 BGR, Mono는 그대로 8비트 Mono로 변환)
+                        plan = create_plan(pixel_format=pixel_format, isColor=pixel_format_info.is_bayer)
+                        self._plans[pixel_format] = plan
 
-                    # Perform color conversion for Bayer.
-                    if pixel_format_info.is_bayer:
-                        bayer_type = pixel_format_info.get_pixel_color_filter()
-                        if bayer_type == st.EStPixelColorFilter.BayerRG:
-                            nparr = cv2.cvtColor(nparr, cv2.COLOR_BAYER_RG2RGB)
-                        elif bayer_type == st.EStPixelColorFilter.BayerGR:
-                            nparr = cv2.cvtColor(nparr, cv2.COLOR_BAYER_GR2RGB)
-                        elif bayer_type == st.EStPixelColorFilter.BayerGB:
-                            nparr = cv2.cvtColor(nparr, cv2.COLOR_BAYER_GB2RGB)
-                        elif bayer_type == st.EStPixelColorFilter.BayerBG:
-                            nparr = cv2.cvtColor(nparr, cv2.COLOR_BAYER_BG2RGB)
+                    # 10 / 12비트 데이터는 정수 시프트로 8비트 변환 후 디베이어 (미리 할당한 배열 재사용)
+                    nparr = plan.convert(raw_image_to_numpy(image=st_image))
 
-                    # Resize image and store to self._image.
-                    nparr = cv2.resize(nparr, None, fx=DISPLAY_RESIZE_FACTOR, fy=DISPLAY_RESIZE_FACTOR)
-                    self._lock.acquire()
-                    self._image = nparr
-                    self._lock.release()
+                    # 원본 크기로 게시 (축소 이미지는 읽는 쪽이 요청할 때 한 번만 만듦)
+                    self.latest.publish(img_array=nparr, frame_id=st_buffer.info.frame_id, timestamp=st_buffer.info.timestamp)
 
 if __name__ == "__main__":
     stream_cv2 = False
@@ -135,10 +118,14 @@ if __name__ == "__main__":
         
         
         if stream_cv2 == True:
+            sequence = 0
             while True:
-                image = my_callback.image
-                if image is not None:
-                    cv2.imshow(winname='image', mat=image)
+                # 새 프레임이 있을 때만 복사 없이 표시
+                frame = my_callback.latest.read(newer_than=sequence, timeout=0.03)
+                if frame is not None:
+                    with frame:
+                        sequence = frame.sequence
+                        cv2.imshow(winname='image', mat=frame.preview(factor=DISPLAY_PREVIEW_FACTOR, mode=PREVIEW_AREA))
                 key = cv2.waitKey(delay=1)
                 if key != -1:
                     break
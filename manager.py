@@ -1,13 +1,30 @@
-import stapipy as st
-import threading
+from utils.backend import st
 import time
-# import os
+import os
 # import cv2
 # import numpy as np
 # from nodemaps.setting import set_enumeration
 # from nodemaps.node_values import *
 from camera import CameraWorker
 from nodemaps.read_yaml import read_yaml
+from utils.save_pipeline import SavePipeline, POLICY_BLOCK
+from utils.discovery import DeviceDiscovery, read_camera_config
+from nodemaps.trigger import *
+from utils.tracing import FrameTracer
+from utils.bundler import ActionBundler, PARTIAL_EMIT
+from utils.scheduler import ActionScheduler
+from utils.writers import FORMAT_BMP
+from utils.recorder import SequenceRecorder
+from utils.process_pool import ProcessEncodePool
+from utils.frame_stats import export_snapshots
+from utils.parallel import run_parallel
+from nodemaps.configuration import configure_many
+from nodemaps.recipe import RecipeStore
+from nodemaps.bandwidth import BandwidthPlanner, log_plans
+from nodemaps.profile import ProfileSet, CameraProfile, read_settings, sensor_size, validate_profile
+from utils.logger import get_logger
+
+logger = get_logger("manager")
 
 
 class CameraManager:
@@ -15,57 +32,672 @@ class CameraManager:
     여러 개의 카메라를 제어하고 관리할 수 있는 매니저 클래스
     """
     
-    def __init__(self, num_cameras:int=2):
+    def __init__(self, num_cameras:int=2, save_workers:int=4, save_queue_size:int=32, save_policy:str=POLICY_BLOCK,
+                    frame_pool_size:int=8, camera_config:str='./nodemaps/cameras.yaml',
+                    action_device_key:int=1, action_group_key:int=1, line_master_index:int=0, trace:bool=True,
+                    bundles:bool=False, bundle_consumer=None, bundle_timeout:float=1.0, bundle_partial_policy:str=PARTIAL_EMIT,
+                    max_in_flight:int=2, action_timeout:float=2.0, image_format=FORMAT_BMP,
+                    record_dir:str=None, record_segment_size:int=1 << 30, process_workers:int=0, process_slots:int=16,
+                    keep_16bit:bool=False, profiles:str='./nodemaps/profiles.yaml', profile:str=None,
+                    recipe_dir:str='./recipes', bandwidth_frame_rate:float=None, buffer_count:int=None,
+                    buffer_handling_mode:str=None, open_timeout:float=10.0, stop_timeout:float=5.0):
         """ 
         Args:
             num_cameras: 사용할 카메라 개수
+            save_workers: 이미지 저장 writer 스레드 개수 (0이면 콜백 스레드에서 직접 저장)
+            save_queue_size: 저장 대기 큐의 최대 크기
+            save_policy: 저장 큐가 가득 찼을 때의 처리 정책 (block / drop_oldest / drop_newest)
+            frame_pool_size: 카메라별로 미리 할당할 프레임 슬롯 개수
+            camera_config: camera_index -> 시리얼 번호 매핑 파일 (비어 있으면 시리얼 번호 순서)
+            action_device_key: 액션 커맨드 트리거에 사용할 디바이스 키
+            action_group_key: 액션 커맨드 트리거에 사용할 그룹 키
+            line_master_index: 라인 트리거 펄스를 출력할 마스터 카메라 번호
+            trace: 프레임 단계별 지연 시간 기록 여부
+            bundles: action별 멀티 카메라 번들 수집 여부 (bundles()로 꺼냄)
+            bundle_consumer: 번들을 받을 함수 consumer(bundle), 지정하면 번들 수집이 활성화됨
+            bundle_timeout: 번들을 기다리는 최대 시간(초)
+            bundle_partial_policy: 타임아웃 시 불완전 번들 처리 정책 (emit / drop)
+            max_in_flight: 동시에 진행할 최대 action 수 (1이면 이전처럼 action마다 완료를 기다림)
+            action_timeout: action의 모든 프레임을 기다리는 최대 시간(초), 초과하면 해당 action만 실패 처리
+            image_format: 저장 포맷 ("bmp", "raw", "png:3", "webp", "tiff", "jpeg:high" 등),
+                            {camera_index: 포맷} 딕셔너리로 카메라별 지정 가능 (없는 카메라는 bmp)
+            record_dir: 지정하면 파일별 저장 대신 이 디렉토리의 청크 컨테이너에 모든 카메라 프레임을 기록 (이미 기록이 있는 디렉토리는 사용할 수 없음)
+            record_segment_size: 컨테이너 세그먼트 파일 크기 (byte)
+            process_workers: 변환, 인코딩을 맡길 워커 프로세스 개수 (0이면 사용하지 않음, 지정하면 save_workers 대신 사용)
+            process_slots: 워커 프로세스에 넘길 원본 프레임용 공유 메모리 슬롯 개수
+            keep_16bit: 워커 프로세스 변환 시 10 ~ 16비트 데이터를 uint16 그대로 저장 (png / tiff 포맷과 함께 사용)
+            profiles: ROI / 비닝 / 디시메이션 / 픽셀 포맷 프로필 파일
+            profile: 획득 전에 적용할 프로필 이름, None이면 카메라의 현재 설정 유지
+            recipe_dir: 카메라 설정(레시피) 피처 백 저장 디렉토리
+            bandwidth_frame_rate: 예상 트리거 주기(fps), 지정하면 start_all_cameras()에서 인터페이스별 링크 대역폭을 검사
+            buffer_count: 카메라별 데이터 스트림 버퍼 수 (저장이 밀릴 때 프레임을 잃지 않을 만큼), None이면 GenTL 기본값
+            buffer_handling_mode: 데이터 스트림 버퍼 처리 방식 (OldestFirst / OldestFirstOverwrite / NewestOnly)
+            open_timeout: 카메라를 열고 설정하는(획득 시작 포함) 단계마다 기다리는 최대 시간(초), 넘은 카메라는 제외하고 계속 진행
+            stop_timeout: 카메라 획득 종료를 기다리는 최대 시간(초), 응답하지 않는 카메라가 나머지의 종료를 막지 않음
         """
         # stApi 초기화
         st.initialize()
         # 카메라 시스템 생성
         self.st_system = st.create_system()
-        self.camera_list = []     # 카메라 리스트
+        self.camera_list = []     # 카메라 리스트 (정상적으로 열린 카메라, camera_index 순서)
+        self.cameras_by_index = {}  # camera_index -> 카메라
+        self.failed_cameras = {}    # camera_index -> 열기 / 시작 / 종료 실패 원인
+        self.open_timeout = open_timeout
+        self.stop_timeout = stop_timeout
+        self.abandoned = []         # (단계 이름, ParallelResult) 시간 초과로 기다리지 않은 스레드 (close()에서 끝나기를 기다림)
         self.cb_func_list = []   # 콜백 함수 리스트
         self.callback_list = []  # 콜백 리스트
 
-        self.barrier = threading.Barrier(parties=num_cameras + 1)  # 스레드 동기화용 배리어
-        self.barrierTrigger = threading.Barrier(parties=num_cameras + 1)  # 트리거 동기화용 배리어
+        # action별 완료 추적 (배리어 대신 최대 max_in_flight개의 action을 동시에 진행)
+        self.scheduler = ActionScheduler(max_in_flight=max_in_flight, timeout=action_timeout,
+                                            on_complete=self.on_action_complete, on_expire=self.on_action_expire)
 
-        for i in range(num_cameras):
-            cam = CameraWorker(st_system=self.st_system, camera_index=i, isColor=True, barrier=self.barrier, barrier2=self.barrierTrigger)  # 카메라 스레드 생성
+        # 트리거 -> 저장 단계별 지연 시간 기록기
+        self.tracer = FrameTracer(enabled=trace)
+
+        # action별 멀티 카메라 번들 수집기
+        self.bundler = None
+        if bundles or bundle_consumer is not None:
+            self.bundler = ActionBundler(consumer=bundle_consumer, timeout=bundle_timeout, partial_policy=bundle_partial_policy)
+
+        # 모든 카메라가 공유하는 청크 컨테이너 기록기 (파일별 저장 대신 사용)
+        self.recorder = None
+        if record_dir is not None:
+            self.recorder = SequenceRecorder(directory=record_dir, segment_size=record_segment_size)
+
+        # 모든 카메라가 공유하는 비동기 저장 파이프라인
+        self.save_pipeline = None
+        if save_workers > 0 and self.recorder is None and process_workers == 0:
+            self.save_pipeline = SavePipeline(num_workers=save_workers, max_queue_size=save_queue_size, policy=save_policy)
+
+        # 장치를 한 번만 열거하고 camera_index에 매핑된 시리얼 번호로 병렬 오픈 (열지 못한 카메라는 제외하고 계속 진행)
+        self.discovery = DeviceDiscovery(st_system=self.st_system)
+        self.serials = self.map_serials(num_cameras=num_cameras, camera_config=camera_config)
+        opened = run_parallel(self.discovery.open, self.serials, timeout=open_timeout, name="Open", on_late=self.release_late)
+        self.track_abandoned(name="Open", result=opened)
+        self.failed_cameras.update(opened.failed)
+        devices = opened.results
+        if len(devices) == 0:
+            raise RuntimeError(f"No camera could be opened: {self.failed_cameras}")
+
+        # ROI / 비닝 / 디시메이션 / 픽셀 포맷 프로필
+        self.profiles = ProfileSet.from_yaml(profiles) if profiles is not None and os.path.exists(profiles) else ProfileSet({})
+        self.profile_name = profile
+        # 카메라 설정(레시피) 저장소
+        self.recipes = RecipeStore(directory=recipe_dir)
+        
+        # 변환, 인코딩용 워커 프로세스 풀 (슬롯은 가장 큰 센서의 3채널 크기, 프로필을 바꿔도 다시 할당하지 않음)
+        self.process_pool = None
+        if process_workers > 0 and self.recorder is None:
+            slot_bytes = max(width * height * 3 for width, height in (sensor_size(device.remote_port.nodemap) for device in devices.values()))
+            self.process_pool = ProcessEncodePool(num_workers=process_workers, num_slots=process_slots, slot_bytes=slot_bytes)
+
+        def create_worker(i:int) -> CameraWorker:
+            camera_format = image_format.get(i, FORMAT_BMP) if isinstance(image_format, dict) else image_format
+            return CameraWorker(st_system=self.st_system, camera_index=i, isColor=True, barrier=None, scheduler=self.scheduler,
+                                save_pipeline=self.save_pipeline, frame_pool_size=frame_pool_size, device=devices[i],
+                                tracer=self.tracer, bundler=self.bundler, image_format=camera_format,
+                                recorder=self.recorder, process_pool=self.process_pool,
+                                keep_16bit=keep_16bit, buffer_count=buffer_count, buffer_handling_mode=buffer_handling_mode,
+                                profile=self.profiles.get(profile, i) if profile is not None else None)
+        
+        # 트리거 모드, 데이터 스트림, 프로필 설정은 카메라마다 노드 왕복이 많으므로 카메라별로 동시에 수행
+        start = time.perf_counter()
+        created = run_parallel(create_worker, {i: i for i in devices}, timeout=open_timeout, name="Configure", on_late=self.release_late)
+        self.track_abandoned(name="Configure", result=created)
+        self.failed_cameras.update(created.failed)
+        for i in sorted(created.results):
+            cam = created.results[i]
             self.camera_list.append(cam)
+            self.cameras_by_index[i] = cam
+            # 레시피 밖에서 노드를 바꾸면(트리거 소스, 스트리밍, 액션 키 등) 현재 상태 캐시를 다시 읽게 함
+            cam.nodes.add_listener(lambda node_name, value, serial=cam.device.info.serial_number: self.recipes.invalidate(serial))
             self.cb_func_list.append(cam.datastream_callback)  # 콜백 함수 등록
-            self.callback_list.append(cam.datastream.register_callback(self.cb_func_list[i]))
+            self.callback_list.append(cam.datastream.register_callback(cam.datastream_callback))
+        if len(self.camera_list) == 0:
+            raise RuntimeError(f"No camera could be configured: {self.failed_cameras}")
+        
+        log = logger.warning if len(self.failed_cameras) > 0 else logger.info
+        log("[Manager] Opened %d of %d cameras in %.1f ms%s", len(self.camera_list), num_cameras,
+            (opened.elapsed + time.perf_counter() - start) * 1e3,
+            f", failed: {self.failed_cameras}" if len(self.failed_cameras) > 0 else "")
+
+        # 브로드캐스트 트리거 (처음 사용할 때 설정)
+        self.action_device_key = action_device_key
+        self.action_group_key = action_group_key
+        self.line_master_index = line_master_index
+        self.action_broadcaster = None
+        self.action_group_masks = {}
+        self.line_master = None
+        self.bandwidth_frame_rate = bandwidth_frame_rate
+
+    def map_serials(self, num_cameras:int, camera_config:str) -> dict:
+        """
+        camera_index별로 열 장치의 시리얼 번호 매핑 생성
+        장치가 부족해 할당하지 못한 camera_index는 failed_cameras에 기록하고 나머지 카메라로 계속 진행
+        
+        Args:
+            num_cameras: 사용할 카메라 개수
+            camera_config: camera_index -> 시리얼 번호 매핑 파일
+        
+        Return:
+            {camera_index: 시리얼 번호}
+        """
+        
+        mapping = {}
+        if camera_config is not None and os.path.exists(camera_config):
+            mapping = read_camera_config(file_path=camera_config)
+        
+        # 매핑되지 않은 camera_index는 남은 장치를 시리얼 번호 순서대로 할당
+        remaining = [entry.serial_number for entry in self.discovery.entries
+                        if not any(entry.matches(key) for key in mapping.values())]
+        serials = {}
+        for i in range(num_cameras):
+            if i in mapping:
+                serials[i] = mapping[i]
+            elif remaining:
+                serials[i] = remaining.pop(0)
+            else:
+                self.failed_cameras[i] = f"not found: {num_cameras} requested, {len(self.discovery.entries)} found"
+        
+        return serials
 
     def start_all_cameras(self) -> None:
         """
         모든 카메라 스레드 실행
         """
         
-        for cam in self.camera_list:
-            cam.start()
+        if self.save_pipeline is not None:
+            self.save_pipeline.start()
+        if self.process_pool is not None:
+            self.process_pool.start()
+        if self.bundler is not None:
+            self.bundler.start()
+        
+        # 공유 링크의 대역폭이 부족하면 획득 전에 경고 (불완전 버퍼의 원인)
+        if self.bandwidth_frame_rate is not None:
+            try:
+                self.plan_bandwidth(frame_rate=self.bandwidth_frame_rate)
+            except (ValueError, st.PyStError) as exception:
+                logger.warning("[Manager] Bandwidth check skipped: %s", exception)
         
-        print("[Manager] waiting for all cameras to be start...")
-        self.barrier.wait()  # 모든 카메라가 시작될 때까지 대기
-        print("[Manager] All cameras started. Now triggering...")
+        # 모든 카메라의 획득을 동시에 시작, 시작하지 못한 카메라는 제외하고 계속 진행
+        logger.info("[Manager] waiting for all cameras to be start...")
+        started = run_parallel(lambda cam: cam.start_acquisition(), dict(self.cameras_by_index), timeout=self.open_timeout, name="Start")
+        self.track_abandoned(name="Start", result=started)
+        for index, reason in started.failed.items():
+            self.detach_camera(camera_index=index, reason=f"start: {reason}")
+        if len(self.camera_list) == 0:
+            raise RuntimeError(f"No camera could be started: {self.failed_cameras}")
+        logger.info("[Manager] %d cameras started in %.1f ms. Now triggering...", len(self.camera_list), started.elapsed * 1e3)
 
     def stop_all_cameras(self) -> None:
         """
         모든 카메라 종료
         """
         
-        for cam in self.camera_list:
-            cam.stop_acquisition()
+        # 진행 중인 action이 끝나거나 타임아웃될 때까지 대기
+        self.scheduler.drain()
+        
+        # 모든 카메라를 동시에 종료, 응답하지 않는 카메라는 stop_timeout 후 기다리지 않음
+        stopped = run_parallel(lambda cam: cam.stop_acquisition(), dict(self.cameras_by_index), timeout=self.stop_timeout, name="Stop")
+        self.track_abandoned(name="Stop", result=stopped)
+        for index, reason in stopped.failed.items():
+            self.failed_cameras[index] = f"stop: {reason}"
+        # 종료하지 못한 카메라는 노드를 읽다가 멈출 수 있으므로 통계에서 제외
+        cameras = [cam for cam in self.camera_list if cam.camera_index not in stopped.failed]
+        logger.info("[Manager] %d cameras stopped in %.1f ms", len(cameras), stopped.elapsed * 1e3)
+        
+        # 워커 프로세스에 남은 프레임을 모두 저장한 후 종료
+        if self.process_pool is not None:
+            self.process_pool.stop()
+        
+        # 컨테이너 세그먼트와 인덱스를 디스크에 반영
+        if self.recorder is not None:
+            self.recorder.close()
+        
+        # 남은 번들 처리 후 bundles() 이터레이터 종료
+        if self.bundler is not None:
+            self.bundler.stop()
+        
+        # 남은 프레임을 모두 저장한 후 writer 스레드 종료
+        if self.save_pipeline is not None:
+            self.save_pipeline.stop()
+            for cam in cameras:
+                logger.info("[Camera %d] Frame pool: %s", cam.camera_index, cam.frame_pool.stats)
+        
+        # 카메라별 저장 포맷 통계 (인코딩 크기, 인코딩 시간)
+        for cam in cameras if self.recorder is None else []:
+            logger.info("[Camera %d] Image writer: %s", cam.camera_index, cam.image_writer.stats)
+        
+        # 카메라별 버퍼 사용량과 권장 버퍼 수 (콜백이 밀린 적이 있으면 경고)
+        for cam in cameras:
+            stats = cam.buffer_monitor.stats
+            log = logger.warning if stats["suggested_buffer_count"] > stats.get("announced", 0) else logger.info
+            log("[Camera %d] Stream buffers: %s", cam.camera_index, stats)
+        
+        # 카메라별 프레임 손실 / 불완전 버퍼 계수기
+        for cam in cameras:
+            snapshot = cam.frame_stats.snapshot()
+            log = logger.info if cam.frame_stats.healthy else logger.warning
+            log("[Camera %d] Frame stats: %s", cam.camera_index,
+                {key: value for key, value in snapshot.items() if key not in ("camera_index", "serial", "time")})
+        
+        # 단계별 지연 시간 요약
+        if self.tracer.enabled:
+            self.tracer.print_summary()
+
+    def release_late(self, camera_index:int, value) -> None:
+        """
+        시간 초과로 제외한 카메라가 늦게 열리거나 설정된 경우 그 결과를 정리 (run_parallel의 on_late, 해당 스레드에서 호출)
+        장치 객체는 참조를 놓으면 해제되고, 설정까지 끝난 워커는 켜 둔 트리거 모드를 끔
+        
+        Args:
+            camera_index: 카메라 번호
+            value: 늦게 반환된 장치 객체 또는 CameraWorker
+        """
+        
+        if isinstance(value, CameraWorker):
+            value.release()
+
+    def track_abandoned(self, name:str, result) -> None:
+        """
+        시간 안에 끝나지 않은 스레드를 close()에서 기다리도록 기록
+        
+        Args:
+            name: 단계 이름 (로그 구분용)
+            result: run_parallel() 결과
+        """
+        
+        if len(result.timed_out) > 0:
+            self.abandoned.append((name, result))
+
+    def detach_camera(self, camera_index:int, reason:str) -> None:
+        """
+        실패한 카메라를 트리거 / 통계 대상에서 제외 (나머지 카메라는 계속 사용)
+        
+        Args:
+            camera_index: 카메라 번호
+            reason: 실패 원인 (failed_cameras에 기록)
+        """
+        
+        cam = self.cameras_by_index.pop(camera_index, None)
+        if cam is not None:
+            self.camera_list.remove(cam)
+        self.failed_cameras[camera_index] = reason
+        logger.error("[Camera %d] Detached: %s", camera_index, reason)
+
+    def close(self) -> None:
+        """
+        카메라, 데이터 스트림, 콜백 객체를 모두 해제하고 stApi 종료 (stop_all_cameras() 이후 호출, 이후 이 매니저는 사용할 수 없음)
+        """
+        
+        self.callback_list.clear()
+        self.cb_func_list.clear()
+        self.camera_list = []
+        self.cameras_by_index = {}
+        self.action_broadcaster = None
+        self.line_master = None
+        self.discovery = None
+        self.st_system = None
+        # 시간 초과로 버린 스레드가 아직 장치를 열거나 설정 중이면 stApi를 종료하기 전에 stop_timeout까지 기다림
+        deadline = time.monotonic() + self.stop_timeout
+        for name, result in self.abandoned:
+            running = result.join(timeout=max(0.0, deadline - time.monotonic()))
+            if len(running) > 0:
+                logger.warning("[Manager] %s still running for cameras %s at close", name, running)
+        self.abandoned = []
+        st.terminate()
+        
+        if len(self.failed_cameras) > 0:
+            logger.warning("[Manager] Closed with failed cameras: %s", self.failed_cameras)
+        else:
+            logger.info("[Manager] Closed.")
+
+    def frame_stats(self) -> list:
+        """
+        카메라별 프레임 계수기 스냅샷 (트리거 / 도착 / 매칭 / 프레임 ID 누락 / 불완전 버퍼 / 데이터 스트림 통계)
+        
+        Return:
+            camera_index 순서의 스냅샷 딕셔너리 리스트
+        """
+        
+        return [cam.frame_stats.snapshot() for cam in self.camera_list]
+
+    def buffer_stats(self) -> dict:
+        """
+        카메라별 데이터 스트림 버퍼 사용량 (처리 지연 횟수, 최대 동시 사용 버퍼 수, 콜백 처리 시간, 권장 버퍼 수)
+        
+        Return:
+            {camera_index: BufferMonitor.stats}
+        """
+        
+        return {cam.camera_index: cam.buffer_monitor.stats for cam in self.camera_list}
+
+    def export_frame_stats(self, file_path:str) -> None:
+        """
+        현재 스냅샷을 CSV 파일 끝에 추가 (실행 중 주기적으로 호출하면 시간에 따른 손실 추이를 기록)
+        """
+        
+        export_snapshots(snapshots=self.frame_stats(), file_path=file_path)
 
     def trigger_camera(self, camera_index:int, action:int) -> None:
         """
         특정 카메라 트리거 (취사선택 가능)
         """
         
-        if 0 <= camera_index < len(self.camera_list):
-            self.camera_list[camera_index].trigger(action=action)
+        if camera_index in self.cameras_by_index:
+            self.cameras_by_index[camera_index].trigger(action=action)
+        else:
+            logger.warning("Invalid camera index %d. Please enter a valid index.", camera_index)
+
+    def parse_action(self, value) -> tuple:
+        """
+        action.yaml 항목 해석
+        
+        "0 1 2 3" 형식이면 소프트웨어 트리거,
+        {cameras: "0 1 2 3", trigger: action} 형식이면 지정한 트리거 사용
+        
+        Return:
+            (카메라 번호 리스트, 트리거 종류)
+        """
+        
+        if isinstance(value, dict):
+            cameras = str(value["cameras"]).split()
+            trigger_type = value.get("trigger", TRIGGER_TYPE_SOFTWARE)
+        else:
+            cameras = str(value).split()
+            trigger_type = TRIGGER_TYPE_SOFTWARE
+        
+        if trigger_type not in TRIGGER_SOURCES:
+            raise ValueError(f"Invalid trigger '{trigger_type}'. Choose one of {list(TRIGGER_SOURCES)}")
+        
+        return [int(index) for index in cameras], trigger_type
+
+    def trigger_cameras(self, camera_indexes:list, action:int, trigger_type:str=TRIGGER_TYPE_SOFTWARE) -> None:
+        """
+        선택된 카메라들을 지정한 방식으로 트리거
+        action / line 방식은 한 번의 브로드캐스트로 모든 카메라를 동시에 트리거
+        
+        Args:
+            camera_indexes: 트리거할 카메라 번호 리스트
+            action: action 번호
+            trigger_type: 트리거 종류 (software / action / line)
+        """
+        
+        cameras = [self.cameras_by_index[index] for index in camera_indexes if index in self.cameras_by_index]
+        if len(cameras) != len(camera_indexes):
+            logger.warning("Invalid camera index in %s. Please enter a valid index.", camera_indexes)
+        
+        # 진행 중인 action이 max_in_flight개이면 하나가 끝날 때까지 대기한 후 등록
+        self.scheduler.begin(action=action, camera_indexes=[cam.camera_index for cam in cameras])
+        
+        # 프레임이 도착하기 전에 번들 등록
+        if self.bundler is not None:
+            self.bundler.expect(action=action, camera_indexes=[cam.camera_index for cam in cameras])
+        
+        if trigger_type == TRIGGER_TYPE_SOFTWARE:
+            for cam in cameras:
+                cam.set_trigger_source(TRIGGER_SOURCE_SOFTWARE)
+                cam.trigger(action=action)
+            return
+        
+        # 브로드캐스트 준비: 선택된 카메라만 해당 소스로 전환, 나머지는 소프트웨어 트리거로 두어 무시하게 함
+        for cam in self.camera_list:
+            cam.set_trigger_source(TRIGGER_SOURCES[trigger_type] if cam in cameras else TRIGGER_SOURCE_SOFTWARE)
+        for cam in cameras:
+            cam.arm(action=action)
+        
+        if trigger_type == TRIGGER_TYPE_ACTION:
+            if self.action_broadcaster is None:
+                self.action_broadcaster = ActionCommandBroadcaster(st_system=self.st_system, device_key=self.action_device_key,
+                                                                    group_key=self.action_group_key)
+                for cam in self.camera_list:
+                    self.action_group_masks[cam.camera_index] = cam.enable_action_trigger(device_key=self.action_device_key,
+                                                                                        group_key=self.action_group_key)
+            group_mask = 0
+            for cam in cameras:
+                group_mask |= self.action_group_masks[cam.camera_index]
+            self.action_broadcaster.fire(group_mask=group_mask)
+        else:
+            if self.line_master is None:
+                self.line_master = LineTriggerMaster(nodemap=self.cameras_by_index[self.line_master_index].nodemap)
+            self.line_master.fire()
+        
+        logger.debug("[Manager] Broadcast %s trigger to cameras %s", trigger_type, camera_indexes)
+
+    def configure_cameras(self, settings:dict, camera_indexes:list=None) -> dict:
+        """
+        여러 카메라에 노드 설정을 병렬로 적용 (카메라별 노드 핸들 캐시 사용, 이미 같은 값인 노드는 쓰지 않음)
+        
+        Args:
+            settings: {노드 이름: 값} (모든 카메라 공통) 또는 {camera_index: {노드 이름: 값}} (카메라별)
+                        열거형은 엔트리 이름, 커맨드는 "execute", 딕셔너리 순서대로 적용
+            camera_indexes: 적용할 카메라 번호 리스트, None이면 카메라별 설정에 있는 카메라 또는 모든 카메라
+        
+        Return:
+            {camera_index: 실제로 쓴 노드 이름 리스트}
+        """
+        
+        per_camera = len(settings) > 0 and all(isinstance(key, int) for key in settings)
+        if camera_indexes is None:
+            camera_indexes = list(settings) if per_camera else [cam.camera_index for cam in self.camera_list]
+        cameras = [self.cameras_by_index[index] for index in camera_indexes]
+        
+        start = time.perf_counter()
+        results = configure_many(handles=[cam.nodes for cam in cameras],
+                                    settings=[settings.get(cam.camera_index, {}) if per_camera else settings for cam in cameras])
+        elapsed = time.perf_counter() - start
+        
+        for cam, (written, camera_elapsed) in zip(cameras, results):
+            logger.debug("[Camera %d] Configured %d nodes in %.1f ms: %s", cam.camera_index, len(written), camera_elapsed * 1e3, written)
+        logger.info("[Manager] Configured %d cameras in %.1f ms (%d nodes written)", len(cameras), elapsed * 1e3,
+                    sum(len(written) for written, _ in results))
+        
+        return {cam.camera_index: written for cam, (written, _) in zip(cameras, results)}
+
+    def switch_profile(self, name:str) -> None:
+        """
+        모든 카메라의 프로필 변경 (action 사이에 호출)
+        진행 중인 action이 끝날 때까지 기다린 후 적용하며, 한 카메라라도 실패하면 이미 바꾼 카메라도 이전 설정으로 되돌림
+        
+        Args:
+            name: profiles 파일의 프로필 이름
+        """
+        
+        if name == self.profile_name:
+            return
+        
+        # 노드에 쓰기 전에 모든 카메라에 대해 먼저 검사
+        profiles = [self.profiles.get(name, cam.camera_index) for cam in self.camera_list]
+        for cam, profile in zip(self.camera_list, profiles):
+            validate_profile(nodemap=cam.nodemap, profile=profile)
+        
+        # 이전 프로필의 프레임이 모두 도착한 후 스트림을 멈춤
+        self.scheduler.drain()
+        
+        start = time.perf_counter()
+        applied = []
+        try:
+            for cam, profile in zip(self.camera_list, profiles):
+                previous = CameraProfile(name=self.profile_name or "previous", settings=read_settings(cam.nodemap))
+                cam.set_profile(profile=profile)
+                applied.append((cam, previous))
+        except (ValueError, st.PyStError):
+            for cam, previous in reversed(applied):
+                cam.set_profile(profile=previous)
+            raise
+        
+        self.profile_name = name
+        for cam in self.camera_list:
+            self.recipes.invalidate(cam.device.info.serial_number)
+        logger.info("[Manager] Switched to profile '%s' in %.1f ms", name, (time.perf_counter() - start) * 1e3)
+
+    def plan_bandwidth(self, frame_rate:float=None, headroom:float=0.9, max_packet_size:int=1500, apply:bool=False) -> list:
+        """
+        인터페이스(NIC / USB 호스트 컨트롤러)별 링크 부하를 계산하고 카메라별 전송 제한 값을 권장
+        (패킷 크기는 획득 중에 바꿀 수 없으므로 apply는 start_all_cameras() 전에 호출)
+        
+        Args:
+            frame_rate: 모든 카메라의 트리거 주기(fps), None이면 카메라별 ResultingFrameRate (최대값)
+            headroom: 링크 대역폭 중 카메라 스트림에 배정할 비율
+            max_packet_size: NIC / 스위치가 허용하는 최대 패킷 크기 (점보 프레임이면 9000)
+            apply: 권장 값(GevSCPSPacketSize / GevSCPD 또는 DeviceLinkThroughputLimit)을 카메라에 적용
+        
+        Return:
+            인터페이스별 InterfacePlan 리스트
+        """
+        
+        planner = BandwidthPlanner.from_devices(self.st_system, self.discovery, [cam.device for cam in self.camera_list],
+                                                frame_rate=frame_rate, headroom=headroom, max_packet_size=max_packet_size)
+        plans = planner.plan()
+        log_plans(plans)
+        
+        if apply:
+            cameras = {cam.device.info.serial_number: cam for cam in self.camera_list}
+            self.configure_cameras({cameras[serial].camera_index: settings
+                                        for plan in plans for serial, settings in plan.recommendations.items()})
+        
+        return plans
+
+    def save_recipe(self, name:str) -> None:
+        """
+        모든 카메라의 현재 설정을 레시피로 저장 (시리얼 번호별 피처 백 파일)
+        """
+        
+        self.recipes.save(name=name, nodemaps={cam.device.info.serial_number: cam.nodemap for cam in self.camera_list})
+
+    def apply_recipe(self, name:str) -> dict:
+        """
+        저장된 레시피로 모든 카메라 설정 변경 (action 사이에 호출)
+        캐시된 현재 상태와 비교해 달라진 피처만 모든 카메라에 동시에 쓰고,
+        ROI / 픽셀 포맷이 바뀌는 카메라만 획득을 잠시 멈춤
+        
+        Return:
+            {camera_index: (쓴 피처 수, 걸린 시간(초))}
+        """
+        
+        # 이전 설정의 프레임이 모두 도착한 후 적용
+        self.scheduler.drain()
+        
+        cameras = {cam.device.info.serial_number: cam for cam in self.camera_list}
+        reshaped = set()        # ROI / 픽셀 포맷을 바꾼 카메라 (pause가 호출된 카메라)
+        
+        def pause(serial:str):
+            reshaped.add(serial)
+            return cameras[serial].paused()
+        
+        try:
+            results = self.recipes.apply(name=name, nodemaps={serial: cam.nodemap for serial, cam in cameras.items()}, pause=pause)
+        finally:
+            # 프로필 노드가 레시피 값으로 바뀌었으므로 현재 프로필 이름은 더 이상 맞지 않음 (다음 switch_profile()이 생략되지 않도록)
+            for serial in reshaped:
+                cameras[serial].profile = None
+            if len(reshaped) > 0:
+                self.profile_name = None
+        
+        # 트리거 소스는 카메라 객체에 캐시되어 있으므로 레시피 값으로 다시 맞추고, 바뀐 이미지 크기에 맞게 링 버퍼 재할당
+        for cam in self.camera_list:
+            cam.trigger_source = cam.nodes.get(TRIGGER_SOURCE)
+            cam.resize_frame_pool()
+        
+        return {cameras[serial].camera_index: result for serial, result in results.items()}
+
+    def bundles(self):
+        """
+        완성된 action 번들(N x H x W x C 배열 + 메타데이터)을 순서대로 꺼내는 이터레이터
+        """
+        
+        if self.bundler is None:
+            raise RuntimeError("Bundling is disabled. Create CameraManager with bundles=True")
+        
+        return self.bundler.bundles()
+
+    def start_streaming(self, camera_indexes:list=None) -> None:
+        """
+        프리런 스트리밍 시작 (미리보기용, 트리거 / 저장 대신 카메라별 최신 프레임 슬롯에만 게시)
+        스트리밍 중인 카메라는 트리거하지 않아야 함
+        
+        Args:
+            camera_indexes: 스트리밍할 카메라 번호 리스트, None이면 모든 카메라
+        """
+        
+        for cam in self.cameras(camera_indexes):
+            cam.start_streaming()
+
+    def stop_streaming(self, camera_indexes:list=None) -> None:
+        """
+        프리런 스트리밍 종료, 트리거 모드로 복귀
+        
+        Args:
+            camera_indexes: 종료할 카메라 번호 리스트, None이면 모든 카메라
+        """
+        
+        for cam in self.cameras(camera_indexes):
+            if cam.streaming == True:
+                cam.stop_streaming()
+
+    def latest_frame(self, camera_index:int, newer_than:int=0, timeout:float=None):
+        """
+        스트리밍 중인 카메라의 최신 프레임 (복사 없는 읽기 전용 배열, 사용 후 release() 또는 with 구문)
+        
+            seq = 0
+            with manager.latest_frame(0, newer_than=seq, timeout=1.0) as frame:
+                seq = frame.sequence
+                cv2.imshow("preview", frame.preview(factor=4))
+        
+        Args:
+            camera_index: 카메라 번호
+            newer_than: 이 순번보다 새로운 프레임이 게시될 때까지 대기 (이전에 읽은 frame.sequence)
+            timeout: 최대 대기 시간(초), None이면 무한 대기
+        
+        Return:
+            LiveFrame, 시간 안에 새 프레임이 없으면 None
+        """
+        
+        return self.cameras_by_index[camera_index].latest_frame.read(newer_than=newer_than, timeout=timeout)
+
+    def cameras(self, camera_indexes:list=None) -> list:
+        """
+        카메라 번호 리스트에 해당하는 CameraWorker 리스트 (None이면 모든 카메라)
+        """
+        
+        if camera_indexes is None:
+            return list(self.camera_list)
+        
+        return [self.cameras_by_index[index] for index in camera_indexes]
+
+    def on_action_complete(self, state) -> None:
+        """
+        action의 모든 카메라 프레임 처리가 끝났을 때 호출 (마지막 카메라의 콜백 스레드)
+        """
+        
+        self.report_skew(camera_indexes=state.camera_indexes, action=state.action)
+        if len(state.failed) > 0:
+            logger.warning("[ACTION %s] Completed with failed cameras %s", state.action, state.failed)
         else:
-            print("Invalid camera index. Please enter a valid index.")
+            logger.info("[ACTION %s] Completed!", state.action)
+
+    def on_action_expire(self, state) -> None:
+        """
+        action이 타임아웃되었을 때 호출, 프레임이 오지 않은 카메라의 대기 목록에서 action 제거
+        """
+        
+        for index in state.missing:
+            self.cameras_by_index[index].expire(action=state.action)
+        for index in state.camera_indexes:
+            self.cameras_by_index[index].frame_timestamps.pop(state.action, None)
+
+    def report_skew(self, camera_indexes:list, action:int) -> None:
+        """
+        action에 참여한 카메라들의 프레임 타임스탬프 편차(max - min) 출력
+        카메라 시계가 동기화(PTP)되어 있어야 의미 있는 값
+        """
+        
+        timestamps = [self.cameras_by_index[index].frame_timestamps.pop(action) for index in camera_indexes
+                        if action in self.cameras_by_index[index].frame_timestamps]
+        if len(timestamps) > 1:
+            logger.info("[ACTION %s] Skew spread: %d ticks over %d cameras", action, max(timestamps) - min(timestamps), len(timestamps))
 
     def run(self) -> None:
         """
@@ -95,12 +727,13 @@ class CameraManager:
         
         actions = read_yaml(file_path='./nodemaps/action.yaml')
         for i in actions.keys():
-            action = actions[i].split()
-            for index in action:
-                self.trigger_camera(camera_index=int(index), action=i)
-            self.barrierTrigger.wait()
+            camera_indexes, trigger_type = self.parse_action(actions[i])
+            # action에 프로필이 지정되어 있으면 트리거 전에 전환
+            if isinstance(actions[i], dict) and "profile" in actions[i]:
+                self.switch_profile(name=actions[i]["profile"])
+            # 완료 처리는 스케줄러 콜백(on_action_complete)에서 수행
+            self.trigger_cameras(camera_indexes=camera_indexes, action=i, trigger_type=trigger_type)
             # time.sleep(0.1)
-            print(f"[ACTION {i}] Completed!")
         # 모든 카메라 종료
         self.stop_all_cameras()
 
@@ -108,3 +741,4 @@ class CameraManager:
 if __name__ == "__main__":
     manager = CameraManager(num_cameras=4)  # 카메라 개수 설정
     manager.run()
+    manager.close()
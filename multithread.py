@@ -1,9 +1,14 @@
 import threading
-import stapipy as st
+from utils.backend import st
 import cv2
 import numpy as np
 import sys
 import select
+import logging
+from utils.logger import get_logger
+from utils.discovery import DeviceDiscovery
+
+logger = get_logger("multithread")
 
 class CameraThread(threading.Thread):
     def __init__(self, device):
@@ -21,7 +26,8 @@ class CameraThread(threading.Thread):
             with datastream.retrieve_buffer() as buffer:
                 if buffer.info.is_image_present:
                     image = buffer.get_image()
-                    print(f"BlockID : {buffer.info.frame_id} Size : {image.width} x {image.height} First Byte : {image.get_image_data()[0]}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[%s] BlockID=%d Size=%d x %d First Byte=%d", self.device.info.display_name, buffer.info.frame_id, image.width, image.height, image.get_image_data()[0])
                     
                     if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
                         self.running = False
@@ -32,14 +38,9 @@ class CameraThread(threading.Thread):
 if __name__ == "__main__":
     st.initialize()
     st_system = st.create_system()
-    device_list = []
     
-    while True:
-        try:
-            device = st_system.create_first_device()
-            device_list.append(device)
-        except:
-            break
+    # 모든 장치를 한 번에 열거하고 병렬로 열기
+    device_list = DeviceDiscovery(st_system=st_system).open_all()
     
     threads = []
     for device in device_list:
@@ -0,0 +1,484 @@
+"""
+멀티 카메라 링크 대역폭 / 프레임 레이트 계획
+
+    python -m nodemaps.bandwidth                          # 연결된 카메라의 노드를 읽어 계획
+    python -m nodemaps.bandwidth nodemaps/bandwidth.yaml  # 카메라 없이 설정 파일로 계획
+"""
+
+from utils.backend import st
+import math
+import argparse
+from nodemaps.node_values import *
+from nodemaps.read_yaml import read_yaml
+from utils.logger import get_logger
+
+logger = get_logger("bandwidth")
+
+# 전송 계층 종류 (PyStInterfaceInfo.tl_type)
+TL_TYPE_GEV = "GEV"
+TL_TYPE_U3V = "U3V"
+
+# 인터페이스 링크 속도를 읽을 수 없을 때 사용할 실제 전송 가능 대역폭 (byte/s)
+DEFAULT_LINK_CAPACITIES = {
+    TL_TYPE_GEV: 125_000_000,   # 1000BASE-T
+    TL_TYPE_U3V: 400_000_000,   # USB3 Gen1 호스트 컨트롤러의 실효 대역폭
+}
+
+# GigE Vision 스트림 패킷 오버헤드 (byte)
+GVSP_HEADER_SIZE = 36           # GevSCPSPacketSize에 포함: IP 20 + UDP 8 + GVSP 8
+ETHERNET_FRAMING_SIZE = 38      # GevSCPSPacketSize 밖: 프리앰블 8 + 이더넷 헤더 14 + FCS 4 + 프레임 간격 12
+GVSP_LEADER_TRAILER = 2         # 프레임마다 추가되는 리더 / 트레일러 패킷 수
+
+DEFAULT_TICK_FREQUENCY = 1_000_000_000  # GevTimestampTickFrequency가 없을 때 (Hz)
+
+
+def pixel_bits(pixel_format:str) -> int:
+    """
+    픽셀 하나가 전송될 때의 비트 수 (패킹 포맷은 유효 비트 수, 언패킹 포맷은 16비트 단위)
+
+    Args:
+        pixel_format: 픽셀 포맷 이름 (예: BayerRG8, Mono12, Mono12p, RGB8)
+    """
+
+    try:
+        return st.get_pixel_format_info(getattr(st.EStPixelFormatNamingConvention, pixel_format)).each_pixel_total_bit_count
+    except (AttributeError, KeyError, st.PyStError):
+        pass
+
+    # SDK에 없는 이름 (오프라인 설정 파일): 이름의 비트 수와 채널 수로 계산
+    digits = "".join(ch for ch in pixel_format if ch.isdigit())
+    if len(digits) == 0:
+        raise ValueError(f"Unknown pixel format '{pixel_format}'")
+    bits = int(digits)
+    packed = pixel_format.endswith("p") or "Packed" in pixel_format
+    if not packed:
+        bits = (bits + 7) // 8 * 8
+    channels = 3 if pixel_format.startswith(("RGB", "BGR")) else 1
+
+    return bits * channels
+
+
+class StreamDemand:
+    """
+    카메라 한 대의 스트림이 링크에 요구하는 대역폭
+    """
+
+    def __init__(self, name:str, interface:str, tl_type:str, width:int, height:int, pixel_format:str, frame_rate:float,
+                    packet_size:int=None, packet_size_max:int=None, packet_size_inc:int=4, packet_delay:int=0,
+                    packet_delay_max:int=None, tick_frequency:int=DEFAULT_TICK_FREQUENCY, throughput_limit:int=None, throughput_limit_range:tuple=None,
+                    link_speed:int=None) -> None:
+        """
+        Args:
+            name: 카메라 이름 (시리얼 번호 또는 설정 파일의 키)
+            interface: 카메라가 연결된 인터페이스 (NIC / USB 호스트 컨트롤러) 이름
+            tl_type: 전송 계층 종류 (GEV / U3V)
+            width, height: 전송되는 이미지 크기 (ROI, 비닝, 디시메이션 적용 후)
+            pixel_format: 픽셀 포맷 이름
+            frame_rate: 초당 프레임 수 (트리거 주기 또는 ResultingFrameRate)
+            packet_size: GevSCPSPacketSize (GEV)
+            packet_size_max, packet_size_inc: GevSCPSPacketSize 범위
+            packet_delay: GevSCPD (타임스탬프 틱)
+            packet_delay_max: GevSCPD 최대값
+            tick_frequency: GevTimestampTickFrequency (Hz)
+            throughput_limit: DeviceLinkThroughputLimit (byte/s), 제한이 꺼져 있으면 None
+            throughput_limit_range: DeviceLinkThroughputLimit (min, max)
+            link_speed: 카메라 쪽 링크 속도 DeviceLinkSpeed (byte/s)
+        """
+
+        self.name = name
+        self.interface = interface
+        self.tl_type = tl_type
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self.frame_rate = frame_rate
+        self.packet_size = packet_size
+        self.packet_size_max = packet_size_max
+        self.packet_size_inc = max(packet_size_inc, 1)
+        self.packet_delay = packet_delay
+        self.packet_delay_max = packet_delay_max
+        self.tick_frequency = tick_frequency
+        self.throughput_limit = throughput_limit
+        self.throughput_limit_range = throughput_limit_range
+        self.link_speed = link_speed
+
+    def __repr__(self) -> str:
+        return (f"StreamDemand({self.name!r}, {self.width}x{self.height} {self.pixel_format} @ {self.frame_rate:.1f} fps, "
+                f"{self.bandwidth / 1e6:.1f} MB/s)")
+
+    @property
+    def is_gev(self) -> bool:
+        return self.tl_type == TL_TYPE_GEV and self.packet_size is not None
+
+    @property
+    def frame_bytes(self) -> int:
+        """
+        이미지 한 장의 페이로드 크기 (byte)
+        """
+
+        return self.width * self.height * pixel_bits(self.pixel_format) // 8
+
+    def packets_per_frame(self, packet_size:int=None) -> int:
+        packet_size = packet_size or self.packet_size
+        return math.ceil(self.frame_bytes / (packet_size - GVSP_HEADER_SIZE)) + GVSP_LEADER_TRAILER
+
+    def wire_bytes_per_frame(self, packet_size:int=None) -> int:
+        """
+        이미지 한 장이 링크에서 차지하는 크기 (GEV는 패킷 헤더와 이더넷 프레이밍 포함)
+        """
+
+        if not self.is_gev:
+            return self.frame_bytes
+
+        return self.frame_bytes + self.packets_per_frame(packet_size) * (GVSP_HEADER_SIZE + ETHERNET_FRAMING_SIZE)
+
+    @property
+    def bandwidth(self) -> float:
+        """
+        현재 설정에서 링크에 요구하는 대역폭 (byte/s)
+        """
+
+        return self.wire_bytes_per_frame() * self.frame_rate
+
+    @property
+    def shaped_throughput(self) -> float:
+        """
+        현재 전송 제한 설정(DeviceLinkThroughputLimit, GevSCPD)으로 낼 수 있는 최대 대역폭 (byte/s), 제한이 없으면 None
+        """
+
+        limits = []
+        if self.throughput_limit is not None:
+            limits.append(self.throughput_limit)
+        if self.is_gev and self.packet_delay > 0 and self.link_speed:
+            wire_packet = self.packet_size + ETHERNET_FRAMING_SIZE
+            limits.append(wire_packet / (wire_packet / self.link_speed + self.packet_delay / self.tick_frequency))
+
+        return min(limits) if len(limits) > 0 else None
+
+    @classmethod
+    def from_nodemap(cls, name:str, interface:str, tl_type:str, nodemap, frame_rate:float=None) -> "StreamDemand":
+        """
+        카메라 노드 맵에서 현재 설정을 읽음 (장치에 없는 노드는 기본값 사용)
+
+        Args:
+            name: 카메라 이름
+            interface: 인터페이스 이름
+            tl_type: 전송 계층 종류
+            nodemap: 카메라 노드 맵
+            frame_rate: 트리거 주기로 정해지는 프레임 레이트, None이면 ResultingFrameRate (최대값)
+        """
+
+        def read(node_name:str, wrapper, default=None):
+            try:
+                return wrapper(nodemap.get_node(node_name))
+            except st.PyStError:
+                return default
+
+        if frame_rate is None:
+            frame_rate = read(RESULTING_FRAME_RATE, lambda node: st.PyIFloat(node).value)
+        if frame_rate is None:
+            frame_rate = read(ACQUISITION_FRAME_RATE, lambda node: st.PyIFloat(node).value)
+
+        packet = read(GEV_SCPS_PACKET_SIZE, st.PyIInteger)
+        delay = read(GEV_SCPD, st.PyIInteger)
+        limit = read(DEVICE_LINK_THROUGHPUT_LIMIT, st.PyIInteger)
+        limit_on = read(DEVICE_LINK_THROUGHPUT_LIMIT_MODE, lambda node: st.PyIEnumeration(node).current_entry.symbolic_value, "On")
+
+        return cls(name=name, interface=interface, tl_type=tl_type,
+                    width=st.PyIInteger(nodemap.get_node(WIDTH)).value,
+                    height=st.PyIInteger(nodemap.get_node(HEIGHT)).value,
+                    pixel_format=st.PyIEnumeration(nodemap.get_node(PIXEL_FORMAT)).current_entry.symbolic_value,
+                    frame_rate=frame_rate,
+                    packet_size=packet.value if packet is not None else None,
+                    packet_size_max=packet.max if packet is not None else None,
+                    packet_size_inc=packet.inc if packet is not None else 4,
+                    packet_delay=delay.value if delay is not None else 0,
+                    packet_delay_max=delay.max if delay is not None else None,
+                    tick_frequency=read(GEV_TIMESTAMP_TICK_FREQUENCY, lambda node: st.PyIInteger(node).value, DEFAULT_TICK_FREQUENCY),
+                    throughput_limit=limit.value if limit is not None and limit_on == "On" else None,
+                    throughput_limit_range=(limit.min, limit.max) if limit is not None else None,
+                    link_speed=read(DEVICE_LINK_SPEED, lambda node: st.PyIInteger(node).value))
+
+    @classmethod
+    def from_dict(cls, name:str, settings:dict) -> "StreamDemand":
+        """
+        설정 파일의 카메라 항목 (노드 이름: 값)에서 생성
+
+        Args:
+            name: 카메라 이름
+            settings: {interface, Width, Height, PixelFormat, AcquisitionFrameRate, GevSCPSPacketSize, GevSCPD, DeviceLinkThroughputLimit ...}
+        """
+
+        limit = settings.get(DEVICE_LINK_THROUGHPUT_LIMIT)
+        return cls(name=name, interface=str(settings["interface"]), tl_type=settings.get("tl_type", TL_TYPE_GEV),
+                    width=int(settings[WIDTH]), height=int(settings[HEIGHT]), pixel_format=settings[PIXEL_FORMAT],
+                    frame_rate=float(settings[ACQUISITION_FRAME_RATE]),
+                    packet_size=settings.get(GEV_SCPS_PACKET_SIZE, 1500 if settings.get("tl_type", TL_TYPE_GEV) == TL_TYPE_GEV else None),
+                    packet_size_max=settings.get("GevSCPSPacketSizeMax"),
+                    packet_delay=int(settings.get(GEV_SCPD, 0)),
+                    tick_frequency=int(settings.get(GEV_TIMESTAMP_TICK_FREQUENCY, DEFAULT_TICK_FREQUENCY)),
+                    throughput_limit=int(limit) if limit is not None else None,
+                    link_speed=settings.get(DEVICE_LINK_SPEED))
+
+
+class InterfacePlan:
+    """
+    인터페이스 하나(NIC / USB 호스트 컨트롤러)의 부하와 카메라별 권장 설정
+    """
+
+    def __init__(self, name:str, capacity:float, budget:float, streams:list, planned_load:float, recommendations:dict,
+                    warnings:list) -> None:
+        self.name = name
+        self.capacity = capacity            # 링크 대역폭 (byte/s)
+        self.budget = budget                # 여유분을 뺀 사용 가능 대역폭 (byte/s)
+        self.streams = streams
+        self.planned_load = planned_load    # 권장 패킷 크기로 바꾼 후의 부하 (byte/s)
+        self.recommendations = recommendations  # {카메라 이름: {노드 이름: 값}}
+        self.warnings = warnings
+
+    @property
+    def load(self) -> float:
+        return sum(stream.bandwidth for stream in self.streams)
+
+    @property
+    def utilization(self) -> float:
+        return self.load / self.capacity
+
+    @property
+    def oversubscribed(self) -> bool:
+        return self.planned_load > self.budget
+
+    @property
+    def max_frame_rate(self) -> float:
+        """
+        모든 카메라가 같은 주기로 트리거될 때 이 인터페이스가 버틸 수 있는 최대 프레임 레이트
+        """
+
+        return self.budget / sum(stream.wire_bytes_per_frame(self.recommended_packet_size(stream)) for stream in self.streams)
+
+    def recommended_packet_size(self, stream:StreamDemand) -> int:
+        return self.recommendations.get(stream.name, {}).get(GEV_SCPS_PACKET_SIZE, stream.packet_size)
+
+    def report(self) -> str:
+        lines = [f"[{self.name}] load {self.load / 1e6:.1f} / {self.capacity / 1e6:.1f} MB/s ({self.utilization * 100:.0f} %), "
+                    f"{self.planned_load / 1e6:.1f} MB/s with recommended packets, max synchronized frame rate {self.max_frame_rate:.1f} fps" + (" OVERSUBSCRIBED" if self.oversubscribed else "")]
+        for stream in self.streams:
+            lines.append(f"  {stream.name}: {stream.width}x{stream.height} {stream.pixel_format} @ {stream.frame_rate:.1f} fps "
+                            f"= {stream.bandwidth / 1e6:.1f} MB/s -> {self.recommendations.get(stream.name, {})}")
+        lines += [f"  ! {warning}" for warning in self.warnings]
+
+        return "\n".join(lines)
+
+
+class BandwidthPlanner:
+    """
+    인터페이스별 링크 부하를 합산하고, 카메라들이 같은 링크에서 충돌하지 않도록 전송 제한 값을 계산
+
+    모든 카메라가 동시에 트리거되면 프레임이 링크 속도로 한꺼번에 도착해 스위치 / NIC 버퍼가 넘치고 불완전 버퍼가 생김
+    카메라마다 사용 가능 대역폭(budget)을 요구 대역폭 비율로 나눠 전송 속도를 제한하면 모든 카메라가 프레임 주기 동안
+    고르게 나눠 보내므로 동시에 보내도 링크를 넘지 않음
+    - GEV: 패킷 크기를 키워 헤더 오버헤드를 줄이고, 패킷 간 지연(GevSCPD)으로 속도 제한
+    - 그 외(U3V 등): DeviceLinkThroughputLimit으로 속도 제한
+    """
+
+    def __init__(self, headroom:float=0.9, max_packet_size:int=1500) -> None:
+        """
+        Args:
+            headroom: 링크 대역폭 중 카메라 스트림에 배정할 비율
+            max_packet_size: 권장할 최대 GEV 패킷 크기 (NIC / 스위치 MTU, 점보 프레임을 켰으면 9000)
+        """
+
+        self.headroom = headroom
+        self.max_packet_size = max_packet_size
+        self.interfaces = {}    # 인터페이스 이름 -> (전송 계층 종류, 링크 대역폭(byte/s))
+        self.streams = []
+
+    def add_interface(self, name:str, tl_type:str, capacity:float=None) -> None:
+        """
+        Args:
+            name: 인터페이스 이름
+            tl_type: 전송 계층 종류
+            capacity: 링크 대역폭 (byte/s), None이면 전송 계층 기본값
+        """
+
+        if capacity is None:
+            capacity = DEFAULT_LINK_CAPACITIES.get(tl_type)
+        self.interfaces[name] = (tl_type, capacity)
+
+    def add_stream(self, stream:StreamDemand) -> None:
+        if stream.interface not in self.interfaces:
+            self.add_interface(stream.interface, stream.tl_type)
+        self.streams.append(stream)
+
+    @classmethod
+    def from_yaml(cls, file_path:str, headroom:float=None, max_packet_size:int=None) -> "BandwidthPlanner":
+        """
+        카메라 없이 설정 파일로 계획 (형식은 nodemaps/bandwidth.yaml 참고)
+        """
+
+        data = read_yaml(file_path) or {}
+        options = data.get("planner", {}) or {}
+        planner = cls(headroom=headroom or options.get("headroom", 0.9),
+                        max_packet_size=max_packet_size or options.get("max_packet_size", 1500))
+        for name, interface in (data.get("interfaces", {}) or {}).items():
+            link_speed = interface.get("link_speed")   # Mbps
+            planner.add_interface(str(name), interface.get("tl_type", TL_TYPE_GEV),
+                                    capacity=link_speed * 1e6 / 8 if link_speed is not None else None)
+        for name, settings in (data.get("cameras", {}) or {}).items():
+            settings = dict(settings)
+            settings.setdefault("tl_type", planner.interfaces.get(str(settings["interface"]), (TL_TYPE_GEV, None))[0])
+            planner.add_stream(StreamDemand.from_dict(str(name), settings))
+
+        return planner
+
+    @classmethod
+    def from_devices(cls, st_system, discovery, devices:list, frame_rate:float=None, headroom:float=0.9,
+                        max_packet_size:int=1500) -> "BandwidthPlanner":
+        """
+        열린 장치의 노드 맵과 인터페이스 노드 맵(GevInterfaceLinkSpeed)에서 현재 설정을 읽어 계획
+
+        Args:
+            st_system: stApi 시스템 객체
+            discovery: 장치가 연결된 인터페이스를 찾을 DeviceDiscovery
+            devices: stApi 장치 객체 리스트
+            frame_rate: 트리거 주기로 정해지는 프레임 레이트, None이면 카메라별 ResultingFrameRate
+        """
+
+        planner = cls(headroom=headroom, max_packet_size=max_packet_size)
+        for device in devices:
+            entry = discovery.find(device.info.serial_number)
+            interface = st_system.get_interface(entry.interface_index)
+            name = f"{interface.info.display_name}#{entry.interface_index}"
+            tl_type = interface.info.tl_type
+            if name not in planner.interfaces:
+                try:
+                    capacity = st.PyIInteger(interface.port.nodemap.get_node(GEV_INTERFACE_LINK_SPEED)).value * 1e6 / 8
+                except st.PyStError:
+                    capacity = None
+                planner.add_interface(name, tl_type, capacity=capacity)
+            planner.add_stream(StreamDemand.from_nodemap(name=device.info.serial_number, interface=name, tl_type=tl_type,
+                                                            nodemap=device.remote_port.nodemap, frame_rate=frame_rate))
+
+        return planner
+
+    def plan(self) -> list:
+        """
+        인터페이스별 부하와 카메라별 권장 설정 계산
+
+        Return:
+            InterfacePlan 리스트
+        """
+
+        plans = []
+        for name, (tl_type, capacity) in self.interfaces.items():
+            streams = [stream for stream in self.streams if stream.interface == name]
+            if len(streams) == 0:
+                continue
+            if capacity is None:
+                # 링크 속도를 알 수 없으면 가장 느린 카메라 쪽 링크 속도 사용
+                capacity = min((stream.link_speed for stream in streams if stream.link_speed), default=None)
+                if capacity is None:
+                    raise ValueError(f"Link speed of interface '{name}' ({tl_type}) is unknown")
+            plans.append(self._plan_interface(name, capacity, streams))
+
+        return plans
+
+    def _plan_interface(self, name:str, capacity:float, streams:list) -> InterfacePlan:
+        budget = capacity * self.headroom
+        recommendations = {}
+        warnings = []
+
+        # 패킷 크기를 먼저 정해야 헤더 오버헤드를 포함한 요구 대역폭이 정해짐 (이미 더 큰 패킷을 쓰고 있으면 유지)
+        packet_sizes = {}
+        for stream in streams:
+            if stream.is_gev:
+                limit = min(self.max_packet_size, stream.packet_size_max or self.max_packet_size)
+                packet_sizes[stream.name] = max(stream.packet_size, limit // stream.packet_size_inc * stream.packet_size_inc)
+        demands = {stream.name: stream.wire_bytes_per_frame(packet_sizes.get(stream.name)) * stream.frame_rate for stream in streams}
+        total = sum(demands.values())
+
+        if total > budget:
+            warnings.append(f"Requested {total / 1e6:.1f} MB/s exceeds {budget / 1e6:.1f} MB/s "
+                            f"({self.headroom * 100:.0f} % of {capacity / 1e6:.1f} MB/s). Expect incomplete buffers; "
+                            f"lower the frame rate by {total / budget:.2f}x, reduce the ROI or move cameras to another interface")
+
+        for stream in streams:
+            # 요구 대역폭 비율대로 사용 가능 대역폭을 나눔 (부족하면 비율대로 줄어든 만큼 프레임 레이트가 떨어짐)
+            share = budget * demands[stream.name] / total
+            link_speed = min(capacity, stream.link_speed or capacity)
+            recommendation = {}
+            use_limit = stream.tl_type != TL_TYPE_GEV
+            if stream.is_gev:
+                packet_size = packet_sizes[stream.name]
+                wire_packet = packet_size + ETHERNET_FRAMING_SIZE
+                delay = max(0.0, wire_packet / share - wire_packet / link_speed)
+                ticks = math.ceil(delay * stream.tick_frequency)
+                recommendation[GEV_SCPS_PACKET_SIZE] = packet_size
+                if stream.packet_delay_max is not None and ticks > stream.packet_delay_max:
+                    # 패킷 간 지연만으로 충분히 늦출 수 없으면 DeviceLinkThroughputLimit 사용
+                    if stream.throughput_limit_range is not None:
+                        use_limit = True
+                    else:
+                        warnings.append(f"{stream.name}: needed GevSCPD {ticks} exceeds its maximum {stream.packet_delay_max}; "
+                                        f"frames triggered together may still exceed the link")
+                        ticks = stream.packet_delay_max
+                if not use_limit:
+                    recommendation[GEV_SCPD] = ticks
+            if use_limit:
+                limit = int(share)
+                if stream.throughput_limit_range is not None:
+                    minimum, maximum = stream.throughput_limit_range
+                    if limit < minimum:
+                        warnings.append(f"{stream.name}: needed limit {limit} B/s is below DeviceLinkThroughputLimit minimum {minimum}")
+                    limit = min(max(limit, minimum), maximum)
+                recommendation[DEVICE_LINK_THROUGHPUT_LIMIT_MODE] = "On"
+                recommendation[DEVICE_LINK_THROUGHPUT_LIMIT] = limit
+            recommendations[stream.name] = recommendation
+
+            if share < demands[stream.name]:
+                warnings.append(f"{stream.name}: {stream.frame_rate:.1f} fps needs {demands[stream.name] / 1e6:.1f} MB/s, "
+                                f"share is {share / 1e6:.1f} MB/s (max {stream.frame_rate * share / demands[stream.name]:.1f} fps)")
+            shaped = stream.shaped_throughput
+            if shaped is not None and shaped < stream.bandwidth:
+                warnings.append(f"{stream.name}: current limit {shaped / 1e6:.1f} MB/s is below its {stream.bandwidth / 1e6:.1f} MB/s stream")
+
+        return InterfacePlan(name=name, capacity=capacity, budget=budget, streams=streams, planned_load=total,
+                                recommendations=recommendations, warnings=warnings)
+
+
+def log_plans(plans:list) -> None:
+    """
+    계획 결과 로그 (초과 구독된 인터페이스는 경고)
+    """
+
+    for plan in plans:
+        if plan.oversubscribed or len(plan.warnings) > 0:
+            logger.warning("[Bandwidth] %s", plan.report())
+        else:
+            logger.info("[Bandwidth] %s", plan.report())
+
+
+if __name__ == "__main__":
+    from utils.discovery import DeviceDiscovery
+
+    parser = argparse.ArgumentParser(description="Plan link bandwidth for every camera per interface")
+    parser.add_argument("config", nargs="?", help="offline camera / interface description (nodemaps/bandwidth.yaml)")
+    parser.add_argument("--frame-rate", type=float, default=None, help="trigger rate shared by all cameras (default: ResultingFrameRate)")
+    parser.add_argument("--headroom", type=float, default=None)
+    parser.add_argument("--max-packet-size", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.config is not None:
+        planner = BandwidthPlanner.from_yaml(args.config, headroom=args.headroom, max_packet_size=args.max_packet_size)
+        if args.frame_rate is not None:
+            for stream in planner.streams:
+                stream.frame_rate = args.frame_rate
+    else:
+        st.initialize()
+        st_system = st.create_system()
+        discovery = DeviceDiscovery(st_system=st_system)
+        planner = BandwidthPlanner.from_devices(st_system, discovery, discovery.open_all(), frame_rate=args.frame_rate,
+                                                headroom=args.headroom or 0.9, max_packet_size=args.max_packet_size or 1500)
+
+    for plan in planner.plan():
+        print(plan.report())
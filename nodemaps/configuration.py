@@ -0,0 +1,175 @@
+from utils.backend import st
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+logger = get_logger("configuration")
+
+# 커맨드 노드에 지정하는 값 (항상 실행)
+EXECUTE = "execute"
+
+# 노드 종류별 래퍼
+NODE_WRAPPERS = {
+    st.EGCInterfaceType.intfIInteger: st.PyIInteger,
+    st.EGCInterfaceType.intfIFloat: st.PyIFloat,
+    st.EGCInterfaceType.intfIBoolean: st.PyIBoolean,
+    st.EGCInterfaceType.intfIString: st.PyIString,
+    st.EGCInterfaceType.intfIEnumeration: st.PyIEnumeration,
+    st.EGCInterfaceType.intfICommand: st.PyICommand,
+}
+
+
+class NodeHandles:
+    """
+    장치 한 대의 노드 핸들 캐시
+    노드 이름 검색과 PyIInteger / PyIEnumeration / PyIEnumEntry 래핑은 노드마다 처음 한 번만 수행하고,
+    설정할 때는 현재 값을 읽어 이미 같은 값이면 쓰지 않음
+    값을 실제로 쓸 때마다 등록된 listener를 호출 (레시피 현재 상태 캐시 무효화 등)
+    """
+
+    def __init__(self, nodemap) -> None:
+        """
+        Args:
+            nodemap: 카메라 노드 맵
+        """
+
+        self.nodemap = nodemap
+        self._handles = {}      # 노드 이름 -> (노드 종류, 래퍼)
+        self._entries = {}      # (열거형 노드 이름, 엔트리 이름) -> PyIEnumEntry
+        self._listeners = []
+
+        # 통계
+        self.writes = 0
+        self.skipped = 0
+
+    def add_listener(self, func) -> None:
+        """
+        노드 값을 쓸 때마다 호출할 함수 등록 (커맨드 실행과 같은 값이라 생략한 쓰기는 제외)
+
+        Args:
+            func: func(node_name, value)
+        """
+
+        self._listeners.append(func)
+
+    def handle(self, node_name:str) -> tuple:
+        """
+        노드 종류와 래퍼 (처음 호출할 때 검색하여 캐시)
+
+        Return:
+            (EGCInterfaceType 값, 래퍼 객체)
+        """
+
+        cached = self._handles.get(node_name)
+        if cached is None:
+            node = self.nodemap.get_node(node_name)
+            kind = node.principal_interface_type
+            if kind not in NODE_WRAPPERS:
+                raise ValueError(f"{node_name}: unsupported node type {kind}")
+            cached = self._handles[node_name] = (kind, NODE_WRAPPERS[kind](node))
+
+        return cached
+
+    def entry(self, node_name:str, entry_name:str):
+        """
+        열거형 엔트리 핸들 (처음 호출할 때 검색하여 캐시)
+        """
+
+        key = (node_name, entry_name)
+        cached = self._entries.get(key)
+        if cached is None:
+            _, enum_node = self.handle(node_name)
+            cached = self._entries[key] = st.PyIEnumEntry(enum_node[entry_name])
+
+        return cached
+
+    def get(self, node_name:str):
+        """
+        노드의 현재 값 (열거형은 엔트리 이름)
+        """
+
+        kind, node = self.handle(node_name)
+        if kind == st.EGCInterfaceType.intfIEnumeration:
+            return node.current_entry.symbolic_value
+        if kind == st.EGCInterfaceType.intfICommand:
+            return None
+
+        return node.value
+
+    def set(self, node_name:str, value) -> bool:
+        """
+        노드 값 설정, 이미 같은 값이면 쓰지 않음 (커맨드 노드는 항상 실행)
+
+        Args:
+            node_name: 노드 이름
+            value: 설정할 값 (열거형은 엔트리 이름, 커맨드는 EXECUTE)
+
+        Return:
+            노드에 썼으면 True
+        """
+
+        kind, node = self.handle(node_name)
+        if kind == st.EGCInterfaceType.intfICommand:
+            node.execute()
+            self.writes += 1
+            return True
+
+        current = self.get(node_name)
+        if current == value or (kind == st.EGCInterfaceType.intfIFloat and math.isclose(current, value, rel_tol=1e-9)):
+            self.skipped += 1
+            return False
+
+        if kind == st.EGCInterfaceType.intfIEnumeration:
+            node.set_entry_value(self.entry(node_name, value))
+        else:
+            node.value = value
+        self.writes += 1
+        for listener in self._listeners:
+            listener(node_name, value)
+
+        return True
+
+    def apply(self, settings:dict) -> list:
+        """
+        {노드 이름: 값} 딕셔너리를 순서대로 적용 (앞의 노드가 뒤의 노드를 선택하는 경우 순서를 지켜야 함)
+
+        Return:
+            실제로 쓴 노드 이름 리스트
+        """
+
+        return [node_name for node_name, value in settings.items() if self.set(node_name, value)]
+
+
+def configure_many(handles:list, settings:list) -> list:
+    """
+    여러 카메라에 설정을 병렬로 적용 (카메라마다 스레드 하나)
+    한 카메라가 실패해도 나머지 카메라는 끝까지 적용한 후 예외를 다시 발생시킴
+
+    Args:
+        handles: 카메라별 NodeHandles 리스트
+        settings: 카메라별 {노드 이름: 값} 딕셔너리 리스트 (handles와 같은 순서)
+
+    Return:
+        카메라별 (쓴 노드 이름 리스트, 걸린 시간(초)) 리스트
+    """
+
+    def configure(item) -> tuple:
+        node_handles, camera_settings = item
+        start = time.perf_counter()
+        written = node_handles.apply(camera_settings)
+        return written, time.perf_counter() - start
+
+    if len(handles) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(handles)) as executor:
+        futures = [executor.submit(configure, item) for item in zip(handles, settings)]
+
+    errors = [(position, future.exception()) for position, future in enumerate(futures) if future.exception() is not None]
+    if len(errors) > 0:
+        for position, error in errors:
+            logger.error("Failed to configure camera at position %d: %s", position, error)
+        raise errors[0][1]
+
+    return [future.result() for future in futures]
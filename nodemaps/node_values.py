@@ -7,3 +7,52 @@ TRIGGER_MODE_OFF = "Off"
 TRIGGER_SOURCE = "TriggerSource"
 TRIGGER_SOURCE_SOFTWARE = "Software"
 TRIGGER_SOFTWARE = "TriggerSoftware"
+WIDTH = "Width"
+HEIGHT = "Height"
+TRIGGER_SOURCE_ACTION0 = "Action0"
+TRIGGER_SOURCE_LINE0 = "Line0"
+TRIGGER_ACTIVATION = "TriggerActivation"
+TRIGGER_ACTIVATION_RISING_EDGE = "RisingEdge"
+ACTION_SELECTOR = "ActionSelector"
+ACTION_DEVICE_KEY = "ActionDeviceKey"
+ACTION_GROUP_KEY = "ActionGroupKey"
+ACTION_GROUP_MASK = "ActionGroupMask"
+ACTION_COMMAND = "ActionCommand"
+LINE_SELECTOR = "LineSelector"
+LINE_MODE = "LineMode"
+LINE_MODE_OUTPUT = "Output"
+LINE_SOURCE = "LineSource"
+USER_OUTPUT_SELECTOR = "UserOutputSelector"
+USER_OUTPUT_VALUE = "UserOutputValue"
+LINE_SELECTOR_LINE1 = "Line1"
+USER_OUTPUT0 = "UserOutput0"
+OFFSET_X = "OffsetX"
+OFFSET_Y = "OffsetY"
+DECIMATION_HORIZONTAL = "DecimationHorizontal"
+DECIMATION_VERTICAL = "DecimationVertical"
+BINNING_HORIZONTAL = "BinningHorizontal"
+BINNING_VERTICAL = "BinningVertical"
+PIXEL_FORMAT = "PixelFormat"
+SENSOR_WIDTH = "SensorWidth"
+SENSOR_HEIGHT = "SensorHeight"
+
+ACQUISITION_FRAME_RATE = "AcquisitionFrameRate"
+RESULTING_FRAME_RATE = "ResultingFrameRate"
+DEVICE_LINK_SPEED = "DeviceLinkSpeed"
+DEVICE_LINK_THROUGHPUT_LIMIT_MODE = "DeviceLinkThroughputLimitMode"
+DEVICE_LINK_THROUGHPUT_LIMIT = "DeviceLinkThroughputLimit"
+GEV_SCPS_PACKET_SIZE = "GevSCPSPacketSize"
+GEV_SCPD = "GevSCPD"
+GEV_TIMESTAMP_TICK_FREQUENCY = "GevTimestampTickFrequency"
+GEV_INTERFACE_LINK_SPEED = "GevInterfaceLinkSpeed"
+STREAM_BUFFER_HANDLING_MODE = "StreamBufferHandlingMode"
+BUFFER_HANDLING_OLDEST_FIRST = "OldestFirst"
+BUFFER_HANDLING_OLDEST_FIRST_OVERWRITE = "OldestFirstOverwrite"
+BUFFER_HANDLING_NEWEST_ONLY = "NewestOnly"
+STREAM_BUFFER_COUNT_MODE = "StreamBufferCountMode"
+STREAM_BUFFER_COUNT_MODE_MANUAL = "Manual"
+STREAM_BUFFER_COUNT_MANUAL = "StreamBufferCountManual"
+STREAM_BUFFER_COUNT_ANNOUNCED = "StreamBufferCountAnnounced"
+STREAM_INPUT_BUFFER_COUNT = "StreamInputBufferCount"
+STREAM_OUTPUT_BUFFER_COUNT = "StreamOutputBufferCount"
+STREAM_UNDERRUN_COUNT = "StreamUnderrunCount"
\ No newline at end of file
@@ -0,0 +1,298 @@
+from utils.backend import st
+from nodemaps.node_values import *
+from nodemaps.read_yaml import read_yaml
+from utils.logger import get_logger
+
+logger = get_logger("profile")
+
+# 프로필에서 지정할 수 있는 노드 (적용 순서)
+# 비닝, 디시메이션이 Width / Height 범위를 바꾸고, Width / Height가 Offset 범위를 바꾸므로 이 순서로 씀
+PROFILE_NODES = (BINNING_HORIZONTAL, BINNING_VERTICAL, DECIMATION_HORIZONTAL, DECIMATION_VERTICAL,
+                    PIXEL_FORMAT, WIDTH, HEIGHT, OFFSET_X, OFFSET_Y)
+ENUM_NODES = (PIXEL_FORMAT,)
+OFFSET_NODES = (OFFSET_X, OFFSET_Y)
+
+# 정수 노드에 쓸 수 있는 특수 값
+VALUE_MIN = "min"
+VALUE_MAX = "max"
+VALUE_CENTER = "center"     # Offset 전용: ROI를 센서 가운데에 배치
+
+# profiles.yaml에서 모든 카메라에 공통으로 적용할 항목의 키
+DEFAULT_KEY = "default"
+
+
+class CameraProfile:
+    """
+    카메라 한 대에 적용할 ROI(OffsetX / OffsetY / Width / Height), 비닝 / 디시메이션, 픽셀 포맷 설정
+    지정하지 않은 노드는 현재 값을 유지
+    """
+
+    def __init__(self, name:str, settings:dict) -> None:
+        """
+        Args:
+            name: 프로필 이름
+            settings: {노드 이름: 값} 딕셔너리 (정수 노드는 min / max, Offset은 center도 가능)
+        """
+
+        unknown = [node_name for node_name in settings if node_name not in PROFILE_NODES]
+        if len(unknown) > 0:
+            raise ValueError(f"Profile '{name}': unsupported nodes {unknown}. Choose from {list(PROFILE_NODES)}")
+
+        self.name = name
+        self.settings = dict(settings)
+
+    def __repr__(self) -> str:
+        return f"CameraProfile({self.name!r}, {self.settings})"
+
+    @property
+    def changes_geometry(self) -> bool:
+        """
+        센서 판독 영역(크기, 비닝, 디시메이션)을 바꾸는 설정이 있는지 여부
+        """
+
+        return any(node_name not in ENUM_NODES + OFFSET_NODES for node_name in self.settings)
+
+
+class ProfileSet:
+    """
+    profiles.yaml에 정의된 프로필 모음
+
+    형식:
+        프로필 이름:
+            default: {노드 이름: 값, ...}   # 모든 카메라 공통
+            camera_index: {노드 이름: 값, ...}   # 카메라별 설정 (default를 덮어씀)
+    """
+
+    def __init__(self, profiles:dict) -> None:
+        """
+        Args:
+            profiles: {프로필 이름: {default 또는 camera_index: {노드 이름: 값}}} 딕셔너리
+        """
+
+        self._profiles = {}
+        for name, cameras in (profiles or {}).items():
+            cameras = cameras or {}
+            self._profiles[str(name)] = {key if key == DEFAULT_KEY else int(key): dict(settings or {})
+                                            for key, settings in cameras.items()}
+
+    @classmethod
+    def from_yaml(cls, file_path:str) -> "ProfileSet":
+        return cls(read_yaml(file_path))
+
+    @property
+    def names(self) -> list:
+        return list(self._profiles)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self._profiles
+
+    def get(self, name:str, camera_index:int) -> CameraProfile:
+        """
+        카메라 한 대에 적용할 프로필 (default 설정에 카메라별 설정을 덮어씀)
+
+        Args:
+            name: 프로필 이름
+            camera_index: 카메라 번호
+        """
+
+        if name not in self._profiles:
+            raise KeyError(f"Profile '{name}' not found. Available: {self.names}")
+
+        cameras = self._profiles[name]
+        settings = dict(cameras.get(DEFAULT_KEY, {}))
+        settings.update(cameras.get(camera_index, {}))
+
+        return CameraProfile(name=name, settings=settings)
+
+
+def read_settings(nodemap) -> dict:
+    """
+    프로필 노드의 현재 값 (장치에 없는 노드는 제외)
+
+    Return:
+        {노드 이름: 값} 딕셔너리
+    """
+
+    settings = {}
+    for node_name in PROFILE_NODES:
+        try:
+            if node_name in ENUM_NODES:
+                settings[node_name] = st.PyIEnumeration(nodemap.get_node(node_name)).current_entry.symbolic_value
+            else:
+                settings[node_name] = st.PyIInteger(nodemap.get_node(node_name)).value
+        except st.PyStError:
+            continue
+
+    return settings
+
+
+def sensor_size(nodemap) -> tuple:
+    """
+    비닝, 디시메이션, ROI를 적용하지 않은 최대 이미지 크기 (버퍼 크기 계산용)
+
+    Return:
+        (width, height)
+    """
+
+    try:
+        return (st.PyIInteger(nodemap.get_node(SENSOR_WIDTH)).value, st.PyIInteger(nodemap.get_node(SENSOR_HEIGHT)).value)
+    except st.PyStError:
+        # Width 최대값은 현재 Offset을 뺀 값
+        width = st.PyIInteger(nodemap.get_node(WIDTH))
+        height = st.PyIInteger(nodemap.get_node(HEIGHT))
+        return (width.max + st.PyIInteger(nodemap.get_node(OFFSET_X)).value,
+                height.max + st.PyIInteger(nodemap.get_node(OFFSET_Y)).value)
+
+
+def sensor_extent(nodemap) -> tuple:
+    """
+    현재 비닝, 디시메이션에서 ROI로 쓸 수 있는 최대 크기 (Width 최대값 + OffsetX)
+
+    Return:
+        (width, height)
+    """
+
+    return (st.PyIInteger(nodemap.get_node(WIDTH)).max + st.PyIInteger(nodemap.get_node(OFFSET_X)).value,
+            st.PyIInteger(nodemap.get_node(HEIGHT)).max + st.PyIInteger(nodemap.get_node(OFFSET_Y)).value)
+
+
+def resolve_value(nodemap, node_name:str, value):
+    """
+    노드의 현재 범위(min / max / inc)로 값을 검사하고, min / max / center를 실제 값으로 변환
+
+    Args:
+        nodemap: 카메라 노드 맵
+        node_name: 노드 이름
+        value: 설정할 값
+
+    Return:
+        노드에 쓸 값
+    """
+
+    try:
+        node = nodemap.get_node(node_name)
+    except st.PyStError:
+        raise ValueError(f"{node_name} is not supported by this camera")
+
+    if node_name in ENUM_NODES:
+        symbolics = st.PyIEnumeration(node).get_symbolics()
+        if value not in symbolics:
+            raise ValueError(f"{node_name}: invalid entry '{value}'. Choose one of {symbolics}")
+        return value
+
+    node = st.PyIInteger(node)
+    minimum, maximum, inc = node.min, node.max, max(node.inc, 1)
+    if value == VALUE_MIN:
+        return minimum
+    if value == VALUE_MAX:
+        return minimum + (maximum - minimum) // inc * inc
+    if value == VALUE_CENTER:
+        if node_name not in OFFSET_NODES:
+            raise ValueError(f"{node_name}: '{VALUE_CENTER}' is only valid for {list(OFFSET_NODES)}")
+        return minimum + (maximum - minimum) // 2 // inc * inc
+
+    value = int(value)
+    if not minimum <= value <= maximum:
+        raise ValueError(f"{node_name}: value {value} out of range [{minimum}, {maximum}]")
+    if (value - minimum) % inc != 0:
+        raise ValueError(f"{node_name}: value {value} is not a multiple of increment {inc} from {minimum}")
+
+    return value
+
+
+def validate_profile(nodemap, profile:CameraProfile) -> None:
+    """
+    노드에 쓰기 전에 프로필 검사 (하나라도 맞지 않으면 ValueError)
+    Width / Height / Offset 범위는 비닝, 디시메이션에 따라 바뀌므로, 이 값들이 그대로일 때만 센서 크기로 검사하고
+    나머지는 apply_profile()이 쓰기 직전 범위로 다시 검사함
+    """
+
+    current = read_settings(nodemap)
+    for node_name, value in profile.settings.items():
+        if node_name not in current:
+            raise ValueError(f"Profile '{profile.name}': {node_name} is not supported by this camera")
+        if node_name in ENUM_NODES:
+            resolve_value(nodemap, node_name, value)
+        elif isinstance(value, str):
+            if value not in (VALUE_MIN, VALUE_MAX, VALUE_CENTER):
+                raise ValueError(f"Profile '{profile.name}': {node_name} has invalid value '{value}'")
+        elif node_name not in (WIDTH, HEIGHT) + OFFSET_NODES:
+            resolve_value(nodemap, node_name, value)
+
+    # 비닝, 디시메이션이 바뀌지 않으면 ROI가 센서 안에 들어가는지 미리 검사
+    factors = (BINNING_HORIZONTAL, BINNING_VERTICAL, DECIMATION_HORIZONTAL, DECIMATION_VERTICAL)
+    if any(profile.settings.get(name, current.get(name)) != current.get(name) for name in factors):
+        return
+    for size_name, offset_name, size_max in zip((WIDTH, HEIGHT), OFFSET_NODES, sensor_extent(nodemap)):
+        size = profile.settings.get(size_name, current[size_name])
+        offset = profile.settings.get(offset_name, current[offset_name])
+        if isinstance(size, str) or isinstance(offset, str):
+            continue
+        node = st.PyIInteger(nodemap.get_node(size_name))
+        if not node.min <= size or (size - node.min) % max(node.inc, 1) != 0:
+            raise ValueError(f"Profile '{profile.name}': {size_name} {size} is below {node.min} or not a multiple of {node.inc}")
+        if offset + size > size_max:
+            raise ValueError(f"Profile '{profile.name}': {offset_name} {offset} + {size_name} {size} exceeds {size_max}")
+
+
+def apply_profile(nodemap, profile:CameraProfile) -> dict:
+    """
+    프로필을 노드 맵에 적용 (획득을 멈춘 상태에서 호출)
+    중간에 실패하면 적용 전 값으로 되돌린 후 예외를 다시 발생시키므로, 카메라는 이전 설정 아니면 새 설정 중 하나의 상태로 남음
+
+    Args:
+        nodemap: 카메라 노드 맵
+        profile: 적용할 프로필
+
+    Return:
+        변경된 노드 {노드 이름: (이전 값, 새 값)}
+    """
+
+    validate_profile(nodemap, profile)
+
+    previous = read_settings(nodemap)
+    try:
+        return _write_settings(nodemap, settings=profile.settings, reset_offsets=profile.changes_geometry)
+    except (ValueError, st.PyStError) as exception:
+        logger.warning("Failed to apply profile '%s' (%s). Restoring previous settings", profile.name, exception)
+        _write_settings(nodemap, settings=previous, reset_offsets=True)
+        raise
+
+
+def _write_settings(nodemap, settings:dict, reset_offsets:bool) -> dict:
+    """
+    PROFILE_NODES 순서대로 값을 씀, 이미 같은 값이면 쓰지 않음
+    크기를 바꾸기 전에 Offset을 0으로 옮겨 두어야 Width / Height 최대값이 Offset만큼 줄어들지 않음
+    """
+
+    changed = {}
+
+    def write(node_name:str, value) -> None:
+        node = nodemap.get_node(node_name)
+        if node_name in ENUM_NODES:
+            enum_node = st.PyIEnumeration(node)
+            current = enum_node.current_entry.symbolic_value
+            if current != value:
+                enum_node.set_entry_value(enum_node[value])
+        else:
+            int_node = st.PyIInteger(node)
+            current = int_node.value
+            if current != value:
+                int_node.value = value
+        if current != value:
+            changed[node_name] = (changed.get(node_name, (current,))[0], value)
+
+    settings = dict(settings)
+    if reset_offsets:
+        for node_name in OFFSET_NODES:
+            # 지정하지 않은 Offset은 크기를 바꾼 뒤 이전 값으로 다시 씀 (범위를 벗어나면 실패)
+            settings.setdefault(node_name, st.PyIInteger(nodemap.get_node(node_name)).value)
+            write(node_name, 0)
+
+    for node_name in PROFILE_NODES:
+        if node_name in settings:
+            # 앞에서 쓴 값에 따라 범위가 바뀌므로 쓰기 직전에 검사
+            write(node_name, resolve_value(nodemap, node_name, settings[node_name]))
+
+    # 0으로 옮겼다가 같은 값으로 돌아온 Offset은 변경 목록에서 제외
+    return {node_name: values for node_name, values in changed.items() if values[0] != values[1]}
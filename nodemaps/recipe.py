@@ -0,0 +1,335 @@
+"""
+FeatureBag 기반 카메라 설정(레시피) 저장소
+
+    python -m nodemaps.recipe save productA
+    python -m nodemaps.recipe apply productB
+"""
+
+from utils.backend import st
+import os
+import time
+import argparse
+import tempfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from nodemaps.profile import PROFILE_NODES, OFFSET_NODES, ENUM_NODES
+from utils.logger import get_logger
+
+logger = get_logger("recipe")
+
+RECIPE_EXTENSION = ".cfg"
+SELECTOR_SUFFIX = "Selector"
+
+
+class Recipe:
+    """
+    카메라 한 대의 피처 백 내용 (GenApi persistence 형식의 (노드 이름, 값 문자열) 목록)
+    셀렉터 값마다 같은 노드가 여러 번 나올 수 있으므로 순서를 유지한 리스트로 보관
+    """
+
+    def __init__(self, features:list) -> None:
+        self.features = list(features)
+
+    @classmethod
+    def from_string(cls, text:str) -> "Recipe":
+        """
+        save_to_string() / 파일 내용 해석 (# 주석 줄 제외, 줄마다 "노드 이름<TAB>값")
+        """
+
+        features = []
+        for line in text.splitlines():
+            if not line.strip() or line.startswith("#"):
+                continue
+            name, _, value = line.partition("\t") if "\t" in line else line.partition(" ")
+            features.append((name.strip(), value.strip()))
+
+        return cls(features)
+
+    def to_string(self) -> str:
+        return "".join(f"{name}\t{value}\n" for name, value in self.features)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def keyed(self) -> dict:
+        """
+        {(노드 이름, 몇 번째 등장인지): 값} 딕셔너리 (같은 기종이면 셀렉터 구조가 같으므로 위치로 비교 가능)
+        """
+
+        counts = {}
+        values = {}
+        for name, value in self.features:
+            occurrence = counts.get(name, 0)
+            counts[name] = occurrence + 1
+            values[(name, occurrence)] = value
+
+        return values
+
+    def diff(self, current:"Recipe") -> "Recipe":
+        """
+        current 상태에서 이 레시피 상태로 바꾸기 위해 써야 하는 피처만 담은 레시피
+        - 값이 다른 피처만 포함하고, 셀렉터(XxxSelector) 아래 피처(Xxx...)가 바뀌면 해당 셀렉터 값을 먼저 씀
+        - 크기, 비닝, 디시메이션이 바뀌면 Offset을 0으로 옮긴 뒤 ROI 노드를 의존 순서대로 모두 다시 씀
+
+        Args:
+            current: 카메라의 현재 상태 (None이면 전체)
+        """
+
+        current_values = current.keyed() if current is not None else {}
+        counts = {}
+        selectors = {}          # 셀렉터 이름 -> 이 위치에서 선택된 값
+        written_selectors = {}  # 셀렉터 이름 -> diff에 마지막으로 쓴 값
+        geometry = {}           # ROI 노드 이름 -> 값
+        features = []
+        for name, value in self.features:
+            occurrence = counts.get(name, 0)
+            counts[name] = occurrence + 1
+            if name in PROFILE_NODES:
+                geometry[name] = value
+                continue
+            if name.endswith(SELECTOR_SUFFIX):
+                selectors[name] = value
+                continue
+            if current_values.get((name, occurrence)) == value:
+                continue
+            for selector, selected in selectors.items():
+                if name.startswith(selector[:-len(SELECTOR_SUFFIX)]) and written_selectors.get(selector) != selected:
+                    features.append((selector, selected))
+                    written_selectors[selector] = selected
+            features.append((name, value))
+
+        changed = [name for name in PROFILE_NODES if name in geometry and current_values.get((name, 0)) != geometry[name]]
+        if any(name not in OFFSET_NODES + ENUM_NODES for name in changed):
+            # 크기가 바뀌면 Offset 때문에 최대값이 줄어들지 않도록 먼저 0으로 옮김
+            geometry_features = [(name, "0") for name in OFFSET_NODES if name in geometry]
+            geometry_features += [(name, geometry[name]) for name in PROFILE_NODES if name in geometry]
+        else:
+            geometry_features = [(name, geometry[name]) for name in changed]
+
+        return Recipe(geometry_features + features)
+
+    def touches(self, node_names:tuple) -> bool:
+        return any(name in node_names for name, _ in self.features)
+
+
+class RecipeStore:
+    """
+    카메라 설정(레시피) 저장소
+    레시피는 directory/<레시피 이름>/<시리얼 번호>.cfg (피처 백 파일)로 저장하고,
+    카메라별 현재 상태를 메모리에 캐시해 두었다가 바꿀 때는 달라진 피처만 모든 카메라에 동시에 적용
+    """
+
+    def __init__(self, directory:str='./recipes') -> None:
+        """
+        Args:
+            directory: 레시피 저장 디렉토리
+        """
+
+        self.directory = directory
+        self._recipes = {}      # (레시피 이름, 시리얼 번호) -> Recipe
+        self._current = {}      # 시리얼 번호 -> 카메라의 현재 상태 (Recipe)
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if os.path.isdir(os.path.join(self.directory, name)))
+
+    def file_path(self, name:str, serial:str) -> str:
+        return os.path.join(self.directory, name, f"{serial}{RECIPE_EXTENSION}")
+
+    def capture(self, nodemap) -> Recipe:
+        """
+        노드 맵 전체를 피처 백으로 읽어 레시피로 반환 (모든 노드를 읽으므로 느림)
+        """
+
+        featurebag = st.create_featurebag()
+        featurebag.store_nodemap_to_bag(nodemap)
+
+        return Recipe.from_string(featurebag.save_to_string())
+
+    def save(self, name:str, nodemaps:dict) -> None:
+        """
+        카메라들의 현재 설정을 레시피로 저장 (카메라별로 동시에 읽음)
+
+        Args:
+            name: 레시피 이름
+            nodemaps: {시리얼 번호: 노드 맵}
+        """
+
+        os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+
+        def save_one(item) -> None:
+            serial, nodemap = item
+            featurebag = st.create_featurebag()
+            featurebag.store_nodemap_to_bag(nodemap)
+            featurebag.save_to_file(self.file_path(name, serial))
+            recipe = Recipe.from_string(featurebag.save_to_string())
+            with self._lock:
+                self._recipes[(name, serial)] = recipe
+                self._current[serial] = recipe
+
+        self._run_all(save_one, list(nodemaps.items()))
+        logger.info("[Recipe] Saved '%s' for %d cameras", name, len(nodemaps))
+
+    def load(self, name:str, serial:str) -> Recipe:
+        """
+        저장된 레시피 (처음 읽을 때 파일에서 읽어 캐시)
+        """
+
+        with self._lock:
+            recipe = self._recipes.get((name, serial))
+        if recipe is None:
+            file_path = self.file_path(name, serial)
+            if not os.path.exists(file_path):
+                raise KeyError(f"Recipe '{name}' has no settings for camera {serial}")
+            with open(file_path, 'r', encoding='utf-8') as file:
+                recipe = Recipe.from_string(file.read())
+            with self._lock:
+                self._recipes[(name, serial)] = recipe
+
+        return recipe
+
+    def current(self, serial:str, nodemap) -> Recipe:
+        """
+        카메라의 현재 상태 (캐시가 없으면 노드 맵에서 읽음)
+        """
+
+        with self._lock:
+            recipe = self._current.get(serial)
+        if recipe is None:
+            recipe = self.capture(nodemap)
+            with self._lock:
+                self._current[serial] = recipe
+
+        return recipe
+
+    def invalidate(self, serial:str=None) -> None:
+        """
+        레시피 밖에서 노드를 바꾼 카메라의 현재 상태 캐시 삭제 (None이면 모든 카메라)
+        """
+
+        with self._lock:
+            if serial is None:
+                self._current.clear()
+            else:
+                self._current.pop(serial, None)
+
+    def plan(self, name:str, nodemaps:dict) -> dict:
+        """
+        카메라별로 써야 할 피처 (현재 상태와 레시피의 차이)
+
+        Return:
+            {시리얼 번호: Recipe}
+        """
+
+        return {serial: self.load(name, serial).diff(self.current(serial, nodemap)) for serial, nodemap in nodemaps.items()}
+
+    def apply(self, name:str, nodemaps:dict, pause=None) -> dict:
+        """
+        레시피를 모든 카메라에 동시에 적용 (달라진 피처만 씀)
+        한 카메라가 실패해도 나머지 카메라는 끝까지 적용한 후 예외를 다시 발생시킴
+
+        Args:
+            name: 레시피 이름
+            nodemaps: {시리얼 번호: 노드 맵}
+            pause: ROI / 픽셀 포맷이 바뀌는 카메라의 획득을 잠시 멈추는 함수 pause(serial) -> context manager
+
+        Return:
+            {시리얼 번호: (쓴 피처 수, 걸린 시간(초))}
+        """
+
+        diffs = self.plan(name, nodemaps)
+
+        def apply_one(item) -> tuple:
+            serial, nodemap = item
+            diff = diffs[serial]
+            start = time.perf_counter()
+            if len(diff) > 0:
+                locked = pause is not None and diff.touches(PROFILE_NODES)
+                try:
+                    with pause(serial) if locked else contextlib.nullcontext():
+                        load_features(nodemap=nodemap, recipe=diff)
+                except Exception:
+                    # 일부만 적용되었을 수 있으므로 다음에 다시 읽음
+                    self.invalidate(serial)
+                    raise
+            with self._lock:
+                self._current[serial] = self._recipes[(name, serial)]
+            return len(diff), time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = dict(zip(nodemaps, self._run_all(apply_one, list(nodemaps.items()))))
+        elapsed = time.perf_counter() - start
+
+        for serial, (count, camera_elapsed) in results.items():
+            logger.info("[Recipe] %s: %d features in %.1f ms", serial, count, camera_elapsed * 1e3)
+        logger.info("[Recipe] Applied '%s' to %d cameras in %.1f ms", name, len(results), elapsed * 1e3)
+
+        return results
+
+    def _run_all(self, func, items:list) -> list:
+        """
+        카메라마다 스레드 하나로 func(item) 실행, 모두 끝난 후 첫 번째 예외를 다시 발생시킴
+        """
+
+        if len(items) == 0:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(items)) as executor:
+            futures = [executor.submit(func, item) for item in items]
+
+        errors = [(item[0], future.exception()) for item, future in zip(items, futures) if future.exception() is not None]
+        if len(errors) > 0:
+            for serial, error in errors:
+                logger.error("[Recipe] Camera %s failed: %s", serial, error)
+            raise errors[0][1]
+
+        return [future.result() for future in futures]
+
+
+def load_features(nodemap, recipe:Recipe, verify:bool=True) -> None:
+    """
+    레시피의 피처만 피처 백으로 노드 맵에 씀
+
+    Args:
+        nodemap: 카메라 노드 맵
+        recipe: 쓸 피처 (Recipe.diff() 결과)
+        verify: 쓴 값을 다시 읽어 확인
+    """
+
+    descriptor, file_path = tempfile.mkstemp(suffix=RECIPE_EXTENSION)
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            file.write(recipe.to_string())
+        featurebag = st.create_featurebag()
+        featurebag.store_file_to_bag(file_path)
+        featurebag.load(nodemap, verify)
+    finally:
+        os.remove(file_path)
+
+
+if __name__ == "__main__":
+    from utils.discovery import DeviceDiscovery
+
+    parser = argparse.ArgumentParser(description="Save or apply camera recipes for every connected camera")
+    parser.add_argument("command", choices=["save", "apply", "list"])
+    parser.add_argument("name", nargs="?")
+    parser.add_argument("--directory", default="./recipes")
+    args = parser.parse_args()
+
+    store = RecipeStore(directory=args.directory)
+    if args.command == "list":
+        print(store.names)
+    else:
+        st.initialize()
+        st_system = st.create_system()
+        discovery = DeviceDiscovery(st_system=st_system)
+        devices = discovery.open_all()
+        nodemaps = {device.info.serial_number: device.remote_port.nodemap for device in devices}
+        if args.command == "save":
+            store.save(name=args.name, nodemaps=nodemaps)
+        else:
+            store.apply(name=args.name, nodemaps=nodemaps)
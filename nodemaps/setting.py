@@ -1,4 +1,4 @@
-import stapipy as st
+from utils.backend import st
 
 def set_enumeration(nodemap, enum_name, entry_name):
     """
@@ -0,0 +1,105 @@
+from utils.backend import st
+from nodemaps.setting import set_enumeration
+from nodemaps.node_values import *
+
+# action.yaml에서 선택 가능한 트리거 종류
+TRIGGER_TYPE_SOFTWARE = "software"  # 카메라마다 TriggerSoftware 실행 (순차)
+TRIGGER_TYPE_ACTION = "action"      # GigE Vision 액션 커맨드 한 번으로 동시 트리거
+TRIGGER_TYPE_LINE = "line"          # 마스터 카메라의 출력 라인으로 공유 라인 트리거
+
+# 트리거 종류별 TriggerSource 값
+TRIGGER_SOURCES = {
+    TRIGGER_TYPE_SOFTWARE: TRIGGER_SOURCE_SOFTWARE,
+    TRIGGER_TYPE_ACTION: TRIGGER_SOURCE_ACTION0,
+    TRIGGER_TYPE_LINE: TRIGGER_SOURCE_LINE0,
+}
+
+
+def set_integer(nodemap, node_name, value:int) -> None:
+    """
+    정수형 노드의 값을 설정하는 함수
+
+    Args:
+        nodemap: 카메라 설정을 위한 노드 맵
+        node_name: 정수형 노드 이름
+        value: 설정할 값
+    """
+
+    st.PyIInteger(nodemap.get_node(node_name)).value = value
+
+
+class ActionCommandBroadcaster:
+    """
+    GigE Vision 액션 커맨드 송신 클래스
+    인터페이스(NIC)마다 한 번의 브로드캐스트 패킷으로 선택된 카메라를 동시에 트리거
+    """
+
+    def __init__(self, st_system, device_key:int, group_key:int) -> None:
+        """
+        Args:
+            st_system: stApi 시스템 객체
+            device_key: 액션 디바이스 키
+            group_key: 액션 그룹 키
+        """
+
+        self.nodemaps = []
+        self.commands = []
+
+        # 액션 커맨드를 지원하는 인터페이스(GigE)만 사용
+        for i in range(st_system.interface_count):
+            nodemap = st_system.get_interface(i).port.nodemap
+            try:
+                set_integer(nodemap, ACTION_DEVICE_KEY, device_key)
+                set_integer(nodemap, ACTION_GROUP_KEY, group_key)
+                command = st.PyICommand(nodemap.get_node(ACTION_COMMAND))
+            except st.PyStError:
+                continue
+            self.nodemaps.append(nodemap)
+            self.commands.append(command)
+
+        if len(self.commands) == 0:
+            raise RuntimeError("No interface supports action commands")
+
+    def fire(self, group_mask:int) -> None:
+        """
+        액션 커맨드 브로드캐스트
+
+        Args:
+            group_mask: 트리거할 카메라들의 그룹 마스크 OR 값
+        """
+
+        for nodemap in self.nodemaps:
+            set_integer(nodemap, ACTION_GROUP_MASK, group_mask)
+        for command in self.commands:
+            command.execute()
+
+
+class LineTriggerMaster:
+    """
+    마스터 카메라의 출력 라인(UserOutput)으로 공유 트리거 라인에 펄스를 보내는 클래스
+    모든 카메라의 Line0 입력이 마스터 카메라의 Line1 출력에 배선되어 있어야 함
+    """
+
+    def __init__(self, nodemap) -> None:
+        """
+        Args:
+            nodemap: 마스터 카메라 노드 맵
+        """
+
+        self.nodemap = nodemap
+
+        # Line1을 UserOutput0 출력으로 설정
+        set_enumeration(nodemap, LINE_SELECTOR, LINE_SELECTOR_LINE1)
+        set_enumeration(nodemap, LINE_MODE, LINE_MODE_OUTPUT)
+        set_enumeration(nodemap, LINE_SOURCE, USER_OUTPUT0)
+        set_enumeration(nodemap, USER_OUTPUT_SELECTOR, USER_OUTPUT0)
+        self.output_value = st.PyIBoolean(nodemap.get_node(USER_OUTPUT_VALUE))
+        self.output_value.value = False
+
+    def fire(self) -> None:
+        """
+        트리거 라인에 상승 에지 펄스 출력
+        """
+
+        self.output_value.value = True
+        self.output_value.value = False
@@ -0,0 +1,17 @@
+"""
+stApi 백엔드 선택
+
+모든 모듈은 stapipy를 직접 import하지 않고 이 모듈을 통해 사용
+환경 변수 OMRON_BACKEND=sim 이면 카메라 없이 동작하는 시뮬레이션 백엔드(utils/sim_stapipy.py) 사용
+
+    from utils.backend import st
+"""
+
+import os
+
+BACKEND = os.environ.get("OMRON_BACKEND", "stapipy")
+
+if BACKEND == "sim":
+    from utils import sim_stapipy as st
+else:
+    import stapipy as st
@@ -0,0 +1,266 @@
+import time
+import queue
+import threading
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger("bundler")
+
+# 타임아웃까지 모든 카메라의 프레임이 모이지 않았을 때의 처리 정책
+PARTIAL_EMIT = "emit"   # 모인 프레임만으로 불완전 번들 전달 (complete=False)
+PARTIAL_DROP = "drop"   # 번들을 버림
+PARTIAL_POLICIES = (PARTIAL_EMIT, PARTIAL_DROP)
+
+
+class ActionBundle:
+    """
+    한 action에서 모든 카메라가 찍은 프레임 묶음
+    images는 N x H x W x C 배열(카메라 번호 순)로, 추론 모델에 바로 넘길 수 있음
+    """
+
+    def __init__(self, action, camera_indexes:list) -> None:
+        """
+        Args:
+            action: action 번호
+            camera_indexes: 이 action에서 트리거된 카메라 번호 리스트
+        """
+
+        self.action = action
+        self.camera_indexes = sorted(camera_indexes)
+        self.images = None          # N x H x W x C, 첫 프레임 도착 시 할당
+        self.frame_ids = {}         # camera_index -> frame_id
+        self.timestamps = {}        # camera_index -> 장치 타임스탬프
+        self.created = time.monotonic()
+        self.complete = False
+
+    @property
+    def received(self) -> list:
+        """
+        프레임이 도착한 카메라 번호 리스트
+        """
+
+        return sorted(self.frame_ids)
+
+    @property
+    def missing(self) -> list:
+        """
+        프레임이 도착하지 않은 카메라 번호 리스트
+        """
+
+        return [index for index in self.camera_indexes if index not in self.frame_ids]
+
+    def slot(self, camera_index:int, img_array:np.ndarray) -> np.ndarray:
+        """
+        카메라 프레임이 복사될 번들 배열 위치 (첫 프레임 도착 시 N x H x W x C 배열 할당)
+        """
+
+        if self.images is None:
+            self.images = np.empty((len(self.camera_indexes), *img_array.shape), dtype=img_array.dtype)
+        elif self.images.shape[1:] != img_array.shape or self.images.dtype != img_array.dtype:
+            return None
+
+        return self.images[self.camera_indexes.index(camera_index)]
+
+    def valid_images(self) -> np.ndarray:
+        """
+        도착한 카메라의 프레임만 모은 배열 (불완전 번들용)
+        """
+
+        if self.images is None:
+            return None
+        if self.complete:
+            return self.images
+
+        return self.images[[self.camera_indexes.index(index) for index in self.received]]
+
+
+class ActionBundler:
+    """
+    action별로 모든 카메라의 프레임을 메모리에서 하나의 번들로 모으는 동기화 클래스
+    번들은 consumer 콜백으로 전달하거나 bundles() 이터레이터로 꺼낼 수 있음
+    """
+
+    def __init__(self, consumer=None, timeout:float=1.0, partial_policy:str=PARTIAL_EMIT, max_queue_size:int=8) -> None:
+        """
+        Args:
+            consumer: 번들을 받을 함수 consumer(bundle), None이면 bundles()로 꺼내야 함
+            timeout: action 트리거 후 번들을 기다리는 최대 시간(초)
+            partial_policy: 타임아웃 시 처리 정책 (emit / drop)
+            max_queue_size: 전달 대기 번들 큐 크기, 가득 차면 가장 오래된 번들을 버림 (카메라 콜백 스레드를 막지 않음)
+        """
+
+        if partial_policy not in PARTIAL_POLICIES:
+            raise ValueError(f"Invalid partial policy '{partial_policy}'. Choose one of {PARTIAL_POLICIES}")
+
+        self.consumer = consumer
+        self.timeout = timeout
+        self.partial_policy = partial_policy
+        self._pending = {}      # action -> ActionBundle
+        self._lock = threading.Lock()
+        self._output = queue.Queue(maxsize=max_queue_size)
+        self._output_lock = threading.Lock()    # 자리를 비우고 넣는 동작을 한 번에 수행
+        self._running = False
+        self._thread = None
+        self._delivery_thread = None
+
+        # 카운터
+        self.completed = 0
+        self.partial = 0
+        self.dropped = 0
+        self.overflowed = 0     # 큐가 가득 차 버린 완성 / 불완전 번들 수
+
+    def start(self) -> None:
+        """
+        타임아웃 감시 및 번들 전달 스레드 실행
+        """
+
+        self._running = True
+        self._thread = threading.Thread(target=self._watch_loop, name="ActionBundler", daemon=True)
+        self._thread.start()
+
+        # consumer는 카메라 콜백 스레드가 아닌 별도 스레드에서 호출
+        if self.consumer is not None:
+            self._delivery_thread = threading.Thread(target=self._delivery_loop, name="BundleDelivery", daemon=True)
+            self._delivery_thread.start()
+
+    def stop(self) -> None:
+        """
+        남은 번들을 타임아웃 정책대로 처리하고 스레드 종료
+        """
+
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for bundle in pending:
+            self._finish(bundle)
+        self._enqueue(None)     # bundles() 이터레이터 종료 신호
+        if self._delivery_thread is not None:
+            self._delivery_thread.join()
+            self._delivery_thread = None
+
+    def expect(self, action, camera_indexes:list) -> None:
+        """
+        트리거 직전에 호출하여 action에 참여하는 카메라 등록
+
+        Args:
+            action: action 번호
+            camera_indexes: 트리거할 카메라 번호 리스트
+        """
+
+        with self._lock:
+            self._pending[action] = ActionBundle(action=action, camera_indexes=camera_indexes)
+
+    def add(self, camera_index:int, action, img_array:np.ndarray, frame_id:int, timestamp:int) -> None:
+        """
+        카메라 콜백에서 프레임 추가 (프레임은 번들 배열로 복사되므로 GenTL 버퍼 뷰를 그대로 넘겨도 됨)
+
+        Args:
+            camera_index: 카메라 번호
+            action: action 번호
+            img_array: 이미지 배열
+            frame_id: 프레임 ID
+            timestamp: 장치 타임스탬프
+        """
+
+        with self._lock:
+            bundle = self._pending.get(action)
+            if bundle is None or camera_index not in bundle.camera_indexes:
+                logger.warning("[Bundler] Unexpected frame from camera %d for action %s", camera_index, action)
+                return
+            slot = bundle.slot(camera_index=camera_index, img_array=img_array)
+            if slot is None:
+                logger.warning("[Bundler] Camera %d frame shape %s does not match action %s bundle", camera_index, img_array.shape, action)
+                return
+
+        # 카메라마다 다른 위치에 복사하므로 락 밖에서 병렬로 복사
+        np.copyto(slot, img_array)
+
+        with self._lock:
+            bundle.frame_ids[camera_index] = frame_id
+            bundle.timestamps[camera_index] = timestamp
+            if len(bundle.missing) > 0 or self._pending.get(action) is not bundle:
+                return
+            del self._pending[action]
+
+        bundle.complete = True
+        self._finish(bundle)
+
+    def bundles(self):
+        """
+        완성된 번들을 순서대로 꺼내는 이터레이터 (stop() 호출 시 종료)
+        """
+
+        while True:
+            bundle = self._output.get()
+            if bundle is None:
+                break
+            yield bundle
+
+    def _finish(self, bundle:ActionBundle) -> None:
+        """
+        번들을 전달 큐에 넣음 (불완전 번들은 정책에 따라 전달 또는 폐기)
+        카메라 콜백 스레드에서 호출되므로 큐가 가득 차도 기다리지 않음
+        """
+
+        with self._lock:
+            if bundle.complete:
+                self.completed += 1
+            elif self.partial_policy == PARTIAL_DROP or len(bundle.received) == 0:
+                self.dropped += 1
+                logger.warning("[Bundler] Dropped action %s bundle, missing cameras %s", bundle.action, bundle.missing)
+                return
+            else:
+                self.partial += 1
+                logger.warning("[Bundler] Partial action %s bundle, missing cameras %s", bundle.action, bundle.missing)
+
+        self._enqueue(bundle)
+
+    def _enqueue(self, bundle) -> None:
+        """
+        기다리지 않고 전달 큐에 넣음, 가득 차 있으면 가장 오래된 번들을 버리고 자리를 만듦
+        (꺼내는 쪽이 없거나 느려도 카메라 콜백과 stop()이 멈추지 않음)
+        """
+
+        with self._output_lock:
+            while True:
+                try:
+                    self._output.put_nowait(bundle)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    oldest = self._output.get_nowait()
+                except queue.Empty:
+                    continue
+                with self._lock:
+                    self.overflowed += 1
+                logger.warning("[Bundler] Output queue full, dropped action %s bundle", oldest.action)
+
+    def _delivery_loop(self) -> None:
+        """
+        번들을 consumer 콜백으로 전달하는 루프
+        """
+
+        for bundle in self.bundles():
+            try:
+                self.consumer(bundle)
+            except Exception as exception:
+                logger.error("[Bundler] Consumer failed on action %s: %s", bundle.action, exception)
+
+    def _watch_loop(self) -> None:
+        """
+        타임아웃된 번들을 정리하는 감시 루프
+        """
+
+        while self._running:
+            now = time.monotonic()
+            with self._lock:
+                expired = [action for action, bundle in self._pending.items() if now - bundle.created > self.timeout]
+                expired = [self._pending.pop(action) for action in expired]
+            for bundle in expired:
+                self._finish(bundle)
+            time.sleep(min(self.timeout / 4, 0.05))
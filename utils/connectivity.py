@@ -1,4 +1,4 @@
-import stapipy as st
+from utils.backend import st
 
 def node_callback(node=None, st_device=None) -> None:
     """
@@ -0,0 +1,175 @@
+import cv2
+import numpy as np
+
+
+def image_to_numpy(image, isColor:bool=True) -> np.ndarray:
+    """
+    변환된 stApi 이미지를 복사 없이 numpy 배열로 감싸는 함수
+    반환된 배열은 이미지 메모리를 그대로 참조하므로 GenTL 버퍼(또는 컨버터 출력)가 유효한 동안만 사용 가능
+    버퍼 해제 이후에도 사용해야 한다면 detach()로 복사본을 만들어야 함
+
+    Args:
+        image: 변환된 stApi 이미지 객체 (BGR8 또는 Mono8)
+        isColor: 컬러(BGR8) 이미지 여부
+
+    Return:
+        img_array: 이미지 메모리를 참조하는 넘파이 배열 (읽기 전용일 수 있음)
+    """
+
+    width, height = image.width, image.height
+
+    # 복사 없이 이미지 메모리를 numpy 배열로 감싸기
+    img_array = np.frombuffer(image.get_image_data(), dtype=np.uint8)
+
+    if isColor == True:
+        img_array = img_array.reshape((height, width, 3))
+    else:
+        img_array = img_array.reshape((height, width))
+
+    return img_array
+
+
+def detach(img_array:np.ndarray, out:np.ndarray=None) -> np.ndarray:
+    """
+    GenTL 버퍼보다 오래 살아야 하는 프레임을 복사하는 함수
+
+    Args:
+        img_array: image_to_numpy()가 반환한 배열
+        out: 복사할 대상 배열 (미리 할당된 풀 배열), None이면 새로 할당
+
+    Return:
+        버퍼와 독립적인 메모리를 가진 넘파이 배열
+    """
+
+    if out is None:
+        return img_array.copy()
+
+    np.copyto(out, img_array)
+    return out
+
+
+def raw_image_to_numpy(image) -> np.ndarray:
+    """
+    변환 전 원본(Bayer / Mono) stApi 이미지를 복사 없이 numpy 배열로 감싸는 함수
+    픽셀당 바이트 수는 버퍼 크기로 판단 (8비트: uint8, 10 ~ 16비트: uint16, packed 포맷은 1차원 uint8)
+
+    Args:
+        image: 컨버터를 거치지 않은 stApi 이미지 객체
+
+    Return:
+        img_array: 이미지 메모리를 참조하는 H x W 넘파이 배열
+    """
+
+    width, height = image.width, image.height
+    data = image.get_image_data()
+    num_bytes = len(data)
+
+    if num_bytes == width * height:
+        return np.frombuffer(data, dtype=np.uint8).reshape((height, width))
+    if num_bytes == width * height * 2:
+        return np.frombuffer(data, dtype=np.uint16).reshape((height, width))
+
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+
+class ConversionPlan:
+    """
+    픽셀 포맷별로 한 번만 계산해 두는 변환 계획 (비트 시프트, cv2 변환 코드, 출력 자료형)
+    10 ~ 16비트 데이터는 float 변환 없이 정수 오른쪽 시프트를 미리 할당한 8비트 배열에 바로 기록하고,
+    디베이어 결과도 미리 할당한 출력 배열에 기록하므로 프레임마다 새 배열을 만들지 않음
+
+    반환되는 배열은 다음 convert() 호출 시 덮어써지므로 계속 사용하려면 복사해야 함 (스트림마다 계획을 따로 사용)
+    """
+
+    def __init__(self, shift:int=0, code:int=None, keep_16bit:bool=False) -> None:
+        """
+        Args:
+            shift: 8비트로 맞추기 위한 오른쪽 시프트 (12비트이면 4), keep_16bit이면 무시
+            code: cv2.cvtColor 변환 코드 (Bayer 디베이어 등), None이면 변환하지 않음
+            keep_16bit: 10 ~ 16비트 데이터를 시프트하지 않고 uint16 그대로 변환
+        """
+
+        self.shift = 0 if keep_16bit else shift
+        self.code = code
+        self.keep_16bit = keep_16bit
+        self._scaled = None     # 시프트 결과 (H x W uint8)
+        self._output = None     # 변환 결과
+
+    @property
+    def params(self) -> tuple:
+        """
+        같은 계획을 다시 만들 수 있는 인자 (다른 프로세스에 전달할 때 사용)
+        """
+
+        return (self.shift, self.code, self.keep_16bit)
+
+    def convert(self, raw_array:np.ndarray, out:np.ndarray=None) -> np.ndarray:
+        """
+        원본 버퍼를 변환
+
+        Args:
+            raw_array: raw_image_to_numpy()가 반환한 H x W 배열
+            out: 결과를 기록할 배열 (프레임 풀 슬롯 등), None이면 계획 내부 배열에 기록
+
+        Return:
+            변환된 배열 (out 또는 계획 내부 배열)
+        """
+
+        if self.shift > 0:
+            if self._scaled is None or self._scaled.shape != raw_array.shape:
+                self._scaled = np.empty(raw_array.shape, dtype=np.uint8)
+            # uint16 -> uint8 시프트를 한 번에 기록 (중간 배열, float 변환 없음)
+            raw_array = np.right_shift(raw_array, self.shift, out=self._scaled, casting='unsafe')
+
+        if self.code is None:
+            if out is None:
+                return raw_array
+            np.copyto(out, raw_array)
+            return out
+
+        if out is None:
+            if self._output is None or self._output.shape[:2] != raw_array.shape[:2] or self._output.dtype != raw_array.dtype:
+                self._output = cv2.cvtColor(raw_array, self.code)
+                return self._output
+            out = self._output
+
+        return cv2.cvtColor(raw_array, self.code, dst=out)
+
+
+_BAYER_CODES = None
+
+
+def create_plan(pixel_format, isColor:bool=True, keep_16bit:bool=False) -> ConversionPlan:
+    """
+    stApi 픽셀 포맷으로 변환 계획 생성 (스트림 시작 시 또는 픽셀 포맷이 바뀌었을 때 한 번만 호출)
+
+    Args:
+        pixel_format: stApi 픽셀 포맷 값 (image.pixel_format)
+        isColor: BGR 출력 여부 (False이면 Mono 출력)
+        keep_16bit: 10 ~ 16비트 데이터를 uint16 그대로 유지
+    """
+
+    global _BAYER_CODES
+
+    # 워커 프로세스는 이 함수를 호출하지 않으므로 stApi는 여기서만 import
+    from utils.backend import st
+
+    if _BAYER_CODES is None:
+        _BAYER_CODES = {
+            st.EStPixelColorFilter.BayerRG: (cv2.COLOR_BAYER_RG2BGR, cv2.COLOR_BAYER_RG2GRAY),
+            st.EStPixelColorFilter.BayerGR: (cv2.COLOR_BAYER_GR2BGR, cv2.COLOR_BAYER_GR2GRAY),
+            st.EStPixelColorFilter.BayerGB: (cv2.COLOR_BAYER_GB2BGR, cv2.COLOR_BAYER_GB2GRAY),
+            st.EStPixelColorFilter.BayerBG: (cv2.COLOR_BAYER_BG2BGR, cv2.COLOR_BAYER_BG2GRAY),
+        }
+
+    info = st.get_pixel_format_info(pixel_format)
+    shift = info.each_component_valid_bit_count - 8 if info.each_component_total_bit_count > 8 else 0
+    if info.is_bayer:
+        code = _BAYER_CODES[info.get_pixel_color_filter()][0 if isColor == True else 1]
+    elif info.is_mono:
+        code = cv2.COLOR_GRAY2BGR if isColor == True else None
+    else:
+        code = None if isColor == True else cv2.COLOR_BGR2GRAY
+
+    return ConversionPlan(shift=shift, code=code, keep_16bit=keep_16bit)
@@ -1,4 +1,4 @@
-import stapipy as st
+from utils.backend import st
 
 def print_info(device) -> None:
     """
@@ -0,0 +1,152 @@
+from utils.backend import st
+from concurrent.futures import ThreadPoolExecutor
+from nodemaps.read_yaml import read_yaml
+
+
+class DeviceEntry:
+    """
+    열거된 카메라 장치 정보 (장치를 열지 않고 캐시해 둔 정보)
+    """
+
+    def __init__(self, interface_index:int, device_index:int, device_info) -> None:
+        """
+        Args:
+            interface_index: 장치가 연결된 인터페이스 번호
+            device_index: 인터페이스 내 장치 번호
+            device_info: stApi 장치 정보 객체
+        """
+
+        self.interface_index = interface_index
+        self.device_index = device_index
+        self.device_id = device_info.device_id
+        self.serial_number = device_info.serial_number
+        self.model = device_info.model
+        self.display_name = device_info.display_name
+        self.user_defined_name = device_info.user_defined_name
+
+    def matches(self, key:str) -> bool:
+        """
+        시리얼 번호 또는 사용자 정의 이름이 일치하는지 확인
+        """
+
+        return key in (self.serial_number, self.user_defined_name, self.display_name)
+
+    def __repr__(self) -> str:
+        return f"DeviceEntry(serial={self.serial_number}, model={self.model}, name={self.display_name})"
+
+
+class DeviceDiscovery:
+    """
+    모든 인터페이스와 장치를 한 번만 열거하여 캐시하고,
+    시리얼 번호 또는 사용자 정의 이름으로 장치를 병렬로 여는 클래스
+    """
+
+    def __init__(self, st_system) -> None:
+        """
+        Args:
+            st_system: stApi 시스템 객체
+        """
+
+        self.st_system = st_system
+        self.entries = []
+        self.enumerate()
+
+    def enumerate(self) -> list:
+        """
+        모든 인터페이스의 장치를 열거하고 정보를 캐시
+
+        Return:
+            entries: 시리얼 번호 순으로 정렬된 장치 정보 리스트
+        """
+
+        entries = []
+        self.st_system.update_interface_list()
+        for i in range(self.st_system.interface_count):
+            interface = self.st_system.get_interface(i)
+            interface.update_device_list()
+            for j in range(interface.device_count):
+                entries.append(DeviceEntry(interface_index=i, device_index=j, device_info=interface.get_device_info(j)))
+
+        # 부팅마다 바뀌지 않는 순서를 위해 시리얼 번호로 정렬
+        self.entries = sorted(entries, key=lambda entry: entry.serial_number)
+
+        return self.entries
+
+    def find(self, key:str) -> DeviceEntry:
+        """
+        시리얼 번호 또는 사용자 정의 이름으로 장치 정보 검색
+
+        Args:
+            key: 시리얼 번호 또는 사용자 정의 이름
+        """
+
+        for entry in self.entries:
+            if entry.matches(str(key)):
+                return entry
+
+        raise KeyError(f"Device '{key}' not found. Available: {self.entries}")
+
+    def open(self, key:str):
+        """
+        시리얼 번호 또는 사용자 정의 이름으로 장치 열기
+
+        Args:
+            key: 시리얼 번호 또는 사용자 정의 이름
+
+        Return:
+            device: stApi 장치 객체
+        """
+
+        entry = self.find(key)
+        interface = self.st_system.get_interface(entry.interface_index)
+
+        return interface.create_device_by_index(entry.device_index)
+
+    def open_many(self, keys:list) -> list:
+        """
+        여러 장치를 병렬로 열기
+
+        Args:
+            keys: 시리얼 번호 또는 사용자 정의 이름 리스트
+
+        Return:
+            devices: keys 순서대로 정렬된 stApi 장치 객체 리스트
+        """
+
+        if len(keys) == 0:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            return list(executor.map(self.open, keys))
+
+    def open_all(self) -> list:
+        """
+        열거된 모든 장치를 병렬로 열기
+        """
+
+        return self.open_many([entry.serial_number for entry in self.entries])
+
+
+def read_camera_config(file_path:str) -> dict:
+    """
+    camera_index -> 시리얼 번호(또는 사용자 정의 이름) 매핑 파일을 읽는 함수
+
+    Args:
+        file_path: yaml 파일 경로
+
+    Return:
+        mapping: {camera_index: serial} 딕셔너리
+    """
+
+    data = read_yaml(file_path) or {}
+
+    return {int(index): str(serial) for index, serial in data.items()}
+
+
+if __name__ == "__main__":
+    st.initialize()
+    st_system = st.create_system()
+
+    discovery = DeviceDiscovery(st_system=st_system)
+    for entry in discovery.entries:
+        print(f"[{entry.interface_index}-{entry.device_index}] {entry.model} Serial={entry.serial_number} Name={entry.display_name} UserDefinedName={entry.user_defined_name}")
@@ -0,0 +1,144 @@
+import threading
+from collections import deque
+import numpy as np
+
+
+class PooledFrame:
+    """
+    FramePool에서 빌려온 슬롯
+    사용이 끝나면 반드시 release()로 풀에 반환해야 함
+    """
+
+    def __init__(self, pool, slot:int, array:np.ndarray) -> None:
+        self.pool = pool
+        self.slot = slot
+        self.array = array
+
+    def release(self) -> None:
+        """
+        슬롯을 풀에 반환
+        """
+
+        if self.pool is not None:
+            self.pool.release(self.slot)
+            self.pool = None
+
+
+class FramePool:
+    """
+    카메라별로 미리 할당된 고정 크기 프레임 링 버퍼
+    프레임마다 새 배열을 할당하지 않으므로 장시간 실행 시에도 메모리 사용량이 일정함
+    """
+
+    def __init__(self, width:int, height:int, channels:int=3, num_slots:int=8, dtype=np.uint8) -> None:
+        """
+        Args:
+            width: 센서 가로 크기
+            height: 센서 세로 크기
+            channels: 채널 수 (BGR8: 3, Mono8: 1)
+            num_slots: 미리 할당할 슬롯 개수
+            dtype: 배열 자료형
+        """
+
+        if channels == 1:
+            self.shape = (height, width)
+        else:
+            self.shape = (height, width, channels)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+
+        # 슬롯 미리 할당
+        self._slots = [np.empty(self.shape, dtype=dtype) for _ in range(num_slots)]
+        self._free = deque(range(num_slots))    # 반환된 순서대로 다시 사용 (링 순서 유지)
+        self._cond = threading.Condition()
+
+        # 통계
+        self._acquired = 0
+        self._overruns = 0
+        self._peak_in_use = 0
+
+    def acquire(self, block:bool=True, timeout:float=None) -> PooledFrame:
+        """
+        비어 있는 슬롯을 빌려오는 메소드
+        빈 슬롯이 없으면 overrun으로 기록하고, block이면 반환될 때까지 대기
+
+        Args:
+            block: 빈 슬롯이 생길 때까지 대기할지 여부
+            timeout: 최대 대기 시간(초), None이면 무한 대기
+
+        Return:
+            빌려온 슬롯, 슬롯을 얻지 못하면 None
+        """
+
+        with self._cond:
+            if not self._free:
+                self._overruns += 1
+                if block == False:
+                    return None
+                if not self._cond.wait_for(lambda: len(self._free) > 0, timeout=timeout):
+                    return None
+
+            slot = self._free.popleft()
+            self._acquired += 1
+            self._peak_in_use = max(self._peak_in_use, self.num_slots - len(self._free))
+
+        return PooledFrame(pool=self, slot=slot, array=self._slots[slot])
+
+    def release(self, slot:int) -> None:
+        """
+        슬롯을 풀에 반환하는 메소드
+
+        Args:
+            slot: 반환할 슬롯 번호
+        """
+
+        with self._cond:
+            self._free.append(slot)
+            self._cond.notify()
+
+    def copy_in(self, img_array:np.ndarray, block:bool=True, timeout:float=None) -> PooledFrame:
+        """
+        프레임을 빈 슬롯에 복사하는 메소드
+        프레임 크기나 자료형이 슬롯과 다르면(ROI 변경 등) None 반환
+
+        Args:
+            img_array: 복사할 이미지 배열
+            block: 빈 슬롯이 생길 때까지 대기할지 여부
+            timeout: 최대 대기 시간(초)
+
+        Return:
+            프레임이 복사된 슬롯, 실패하면 None
+        """
+
+        if not self.fits(img_array):
+            return None
+
+        frame = self.acquire(block=block, timeout=timeout)
+        if frame is not None:
+            np.copyto(frame.array, img_array)
+
+        return frame
+
+    def fits(self, img_array:np.ndarray) -> bool:
+        """
+        프레임을 슬롯에 그대로 복사할 수 있는지 (크기와 자료형이 같은지) 여부
+        """
+
+        return img_array.shape == self.shape and img_array.dtype == self.dtype
+
+    @property
+    def stats(self) -> dict:
+        """
+        풀 사용 현황 스냅샷
+        """
+
+        with self._cond:
+            in_use = self.num_slots - len(self._free)
+            return {
+                "capacity": self.num_slots,
+                "in_use": in_use,
+                "occupancy": in_use / self.num_slots,
+                "peak_in_use": self._peak_in_use,
+                "acquired": self._acquired,
+                "overruns": self._overruns,
+            }
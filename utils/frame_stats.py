@@ -0,0 +1,156 @@
+import csv
+import os
+import time
+import threading
+from utils.backend import st
+
+# 데이터 스트림 노드 맵의 통계 노드 (GenTL 스트림 모듈)
+STREAM_COUNTERS = ("StreamDeliveredFrameCount", "StreamLostFrameCount", "StreamIncompleteFrameCount",
+                    "StreamUnderrunCount", "StreamBufferCountAnnounced")
+
+# 카메라별 계수기 (snapshot()의 키 순서)
+COUNTERS = (
+    "triggered",        # 트리거(또는 브로드캐스트 트리거 준비) 횟수
+    "received",         # 도착한 버퍼 수
+    "matched",          # 대기 중인 action에 매칭된 버퍼 수
+    "unmatched",        # 대기 중인 action 없이 도착한 버퍼 수 (트리거하지 않은 프레임)
+    "incomplete",       # 전송이 끝나지 않은 채 전달된 버퍼 수 (패킷 손실)
+    "no_image",         # 이미지가 없는 버퍼 수
+    "missing_frame_ids",    # 프레임 ID가 건너뛴 개수 (전달되지 않은 프레임)
+    "lost_actions",     # 프레임 ID 누락으로 실패 처리한 action 수
+    "expired_actions",  # 타임아웃으로 실패 처리한 action 수
+    "errors",           # 콜백에서 발생한 stApi 예외 수
+)
+
+
+class FrameStats:
+    """
+    카메라 한 대의 프레임 수신 계수기
+    트리거 수와 도착한 프레임 ID를 비교해 전송 중 사라진 프레임, 불완전 버퍼, 트리거와 매칭되지 않은 프레임을 집계하고
+    데이터 스트림 통계 노드(Lost / Underrun / Incomplete / Announced)와 함께 스냅샷으로 제공
+    """
+
+    def __init__(self, camera_index:int, serial:str=None, datastream=None) -> None:
+        """
+        Args:
+            camera_index: 카메라 번호
+            serial: 시리얼 번호
+            datastream: 통계 노드를 읽을 데이터 스트림, None이면 스트림 통계 제외
+        """
+
+        self.camera_index = camera_index
+        self.serial = serial
+        self.datastream = datastream
+        self._counts = dict.fromkeys(COUNTERS, 0)
+        self._last_frame_id = None
+        self._lock = threading.Lock()
+
+    def count(self, name:str, amount:int=1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def frame(self, frame_id:int, image_present:bool=True, incomplete:bool=False) -> int:
+        """
+        도착한 버퍼 기록 (action 매칭 결과는 count("matched") / count("unmatched")로 따로 기록)
+
+        Args:
+            frame_id: 버퍼의 프레임 ID
+            image_present: 버퍼에 이미지가 있는지 여부
+            incomplete: 불완전 버퍼 여부
+
+        Return:
+            직전 프레임 ID와의 사이에서 빠진 프레임 수
+        """
+
+        with self._lock:
+            gap = 0
+            if self._last_frame_id is not None and frame_id > self._last_frame_id:
+                gap = frame_id - self._last_frame_id - 1
+            self._last_frame_id = frame_id
+            counts = self._counts
+            counts["received"] += 1
+            counts["missing_frame_ids"] += gap
+            if incomplete:
+                counts["incomplete"] += 1
+            if not image_present:
+                counts["no_image"] += 1
+
+        return gap
+
+    def restart(self) -> None:
+        """
+        획득을 다시 시작할 때 호출 (프레임 ID가 처음부터 다시 시작할 수 있으므로 연속성 검사 초기화)
+        """
+
+        with self._lock:
+            self._last_frame_id = None
+
+    def stream_counters(self) -> dict:
+        """
+        데이터 스트림 통계 노드 값 (지원하지 않는 노드는 제외)
+        """
+
+        counters = {}
+        if self.datastream is None:
+            return counters
+        for name in STREAM_COUNTERS:
+            try:
+                counters[name] = st.PyIInteger(self.datastream.nodemap.get_node(name)).value
+            except st.PyStError:
+                continue
+
+        return counters
+
+    def snapshot(self) -> dict:
+        """
+        계수기 스냅샷
+
+        Return:
+            {camera_index, serial, time, COUNTERS..., outstanding, last_frame_id, STREAM_COUNTERS...}
+            outstanding: 트리거했지만 아직 프레임이 도착하지도 실패 처리되지도 않은 action 수
+        """
+
+        with self._lock:
+            counts = dict(self._counts)
+            last_frame_id = self._last_frame_id
+
+        snapshot = {"camera_index": self.camera_index, "serial": self.serial, "time": time.time()}
+        snapshot.update(counts)
+        snapshot["outstanding"] = counts["triggered"] - counts["matched"] - counts["lost_actions"] - counts["expired_actions"]
+        snapshot["last_frame_id"] = last_frame_id
+        snapshot.update(self.stream_counters())
+
+        return snapshot
+
+    @property
+    def healthy(self) -> bool:
+        """
+        손실, 불완전 버퍼, 오류가 하나도 없는지 여부
+        """
+
+        with self._lock:
+            counts = self._counts
+            return not any(counts[name] for name in ("unmatched", "incomplete", "no_image", "missing_frame_ids",
+                                                        "lost_actions", "expired_actions", "errors"))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(COUNTERS, 0)
+
+
+def export_snapshots(snapshots:list, file_path:str) -> None:
+    """
+    스냅샷을 CSV 파일 끝에 추가 (주기적으로 호출하면 시간에 따른 변화를 기록, 처음에만 헤더를 씀)
+
+    Args:
+        snapshots: FrameStats.snapshot() 리스트
+        file_path: CSV 파일 경로
+    """
+
+    columns = ["camera_index", "serial", "time", *COUNTERS, "outstanding", "last_frame_id", *STREAM_COUNTERS]
+    exists = os.path.exists(file_path) and os.path.getsize(file_path) > 0
+    with open(file_path, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=columns, extrasaction='ignore')
+        if not exists:
+            writer.writeheader()
+        writer.writerows(snapshots)
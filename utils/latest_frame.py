@@ -0,0 +1,189 @@
+import threading
+import numpy as np
+from utils.preview import PreviewPyramid, PREVIEW_AREA
+
+
+class LiveFrame:
+    """
+    LatestFrameCache에서 읽은 프레임 (슬롯 메모리를 그대로 참조하는 읽기 전용 배열)
+    release()하기 전까지는 카메라가 이 슬롯을 덮어쓰지 않으므로, 사용이 끝나면 반드시 release()하거나 with 구문으로 사용
+    """
+
+    def __init__(self, cache, slot:int, array:np.ndarray, sequence:int, frame_id:int, timestamp:int,
+                    pyramid:PreviewPyramid=None) -> None:
+        self.cache = cache
+        self.slot = slot
+        self.array = array
+        self.pyramid = pyramid
+        self.sequence = sequence
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+
+    def release(self) -> None:
+        """
+        슬롯 고정 해제
+        """
+
+        if self.cache is not None:
+            self.cache.unpin(self.slot)
+            self.cache = None
+
+    def preview(self, factor:int=2, mode:str=PREVIEW_AREA) -> np.ndarray:
+        """
+        1/factor 크기의 읽기 전용 축소 이미지 (같은 프레임에서 처음 요청할 때만 계산, release() 전까지 유효)
+
+        Args:
+            factor: 축소 배율 (1, 2, 4, 8 ...)
+            mode: PREVIEW_AREA (평균 축소) 또는 PREVIEW_STRIDE (픽셀 건너뛰기 뷰)
+        """
+
+        if self.pyramid is None:
+            return self.array[::factor, ::factor]
+
+        return self.pyramid.get(factor=factor, mode=mode)
+
+    def copy(self) -> np.ndarray:
+        """
+        release() 이후에도 사용할 복사본
+        """
+
+        return self.array.copy()
+
+    def __enter__(self) -> "LiveFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class LatestFrameCache:
+    """
+    카메라 한 대의 최신 프레임 슬롯 (프리런 미리보기용)
+    카메라 콜백은 게시되지도 읽히고 있지도 않은 슬롯에 프레임을 쓴 뒤 순번(sequence)을 올려 게시하고,
+    읽는 쪽은 게시된 슬롯을 고정(pin)해 복사 없이 읽기 전용 배열로 사용
+    슬롯이 3개 이상이면 읽는 쪽이 하나를 붙잡고 있어도 카메라는 멈추지 않음 (모든 슬롯이 고정되어 있으면 그 프레임만 버림)
+    """
+
+    def __init__(self, num_slots:int=3) -> None:
+        """
+        Args:
+            num_slots: 프레임 슬롯 개수 (게시 1 + 쓰기 1 + 읽는 쪽이 고정할 수 있는 슬롯)
+        """
+
+        if num_slots < 2:
+            raise ValueError(f"num_slots must be at least 2, got {num_slots}")
+
+        self.num_slots = num_slots
+        self._arrays = [None] * num_slots     # 슬롯 배열 (크기가 바뀌면 다시 할당)
+        self._views = [None] * num_slots      # 슬롯별 읽기 전용 뷰
+        self._meta = [None] * num_slots       # 슬롯별 (순번, 프레임 ID, 타임스탬프)
+        self._pins = [0] * num_slots          # 슬롯별 고정 수
+        self._pyramids = [PreviewPyramid() for _ in range(num_slots)]    # 슬롯별 축소 이미지 캐시 (슬롯과 함께 교체)
+        self._writing = None                  # 콜백이 쓰고 있는 슬롯
+        self._published = None                # 최신 프레임 슬롯
+        self._sequence = 0
+        self._cond = threading.Condition()
+
+        # 통계
+        self._dropped = 0
+        self._reads = 0
+
+    @property
+    def sequence(self) -> int:
+        """
+        마지막으로 게시한 프레임 순번 (게시할 때마다 1씩 증가, 프레임이 없으면 0)
+        """
+
+        return self._sequence
+
+    def publish(self, img_array:np.ndarray, frame_id:int=None, timestamp:int=None) -> int:
+        """
+        프레임을 빈 슬롯에 복사해 최신 프레임으로 게시 (카메라 콜백에서 호출, 프레임당 복사 한 번)
+        크기나 자료형이 바뀌면(ROI 변경 등) 슬롯을 다시 할당
+
+        Args:
+            img_array: 게시할 이미지 배열 (GenTL 버퍼나 변환 계획 내부 배열이어도 됨)
+            frame_id: 프레임 ID
+            timestamp: 프레임 타임스탬프
+
+        Return:
+            게시한 프레임 순번, 모든 슬롯이 고정되어 버렸으면 0
+        """
+
+        with self._cond:
+            slot = next((slot for slot in range(self.num_slots)
+                            if slot not in (self._published, self._writing) and self._pins[slot] == 0), None)
+            if slot is None:
+                self._dropped += 1
+                return 0
+            self._writing = slot
+
+        # 게시되지도 고정되지도 않은 슬롯이므로 잠금 없이 씀
+        array = self._arrays[slot]
+        if array is None or array.shape != img_array.shape or array.dtype != img_array.dtype:
+            array = self._arrays[slot] = np.empty_like(img_array)
+            view = array.view()
+            view.flags.writeable = False
+            self._views[slot] = view
+        np.copyto(array, img_array)
+        self._pyramids[slot].reset(source=self._views[slot])
+
+        with self._cond:
+            self._sequence += 1
+            self._meta[slot] = (self._sequence, frame_id, timestamp)
+            self._published = slot
+            self._writing = None
+            self._cond.notify_all()
+            return self._sequence
+
+    def read(self, newer_than:int=0, timeout:float=None) -> LiveFrame:
+        """
+        최신 프레임을 고정해 반환 (복사 없음)
+
+        Args:
+            newer_than: 이 순번보다 새로운 프레임이 게시될 때까지 대기 (0이면 아무 프레임이나)
+            timeout: 최대 대기 시간(초), None이면 무한 대기
+
+        Return:
+            LiveFrame, 시간 안에 새 프레임이 없으면 None
+        """
+
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._published is not None and self._sequence > newer_than, timeout=timeout):
+                return None
+            slot = self._published
+            self._pins[slot] += 1
+            self._reads += 1
+            sequence, frame_id, timestamp = self._meta[slot]
+
+        return LiveFrame(cache=self, slot=slot, array=self._views[slot], sequence=sequence, frame_id=frame_id, timestamp=timestamp,
+                            pyramid=self._pyramids[slot])
+
+    def unpin(self, slot:int) -> None:
+        with self._cond:
+            self._pins[slot] -= 1
+
+    def clear(self) -> None:
+        """
+        게시된 프레임 제거 (스트리밍을 멈출 때 호출, 이후 read()는 새 프레임을 기다림)
+        순번은 계속 증가하므로 읽는 쪽의 newer_than 값은 그대로 유효
+        """
+
+        with self._cond:
+            self._published = None
+
+    @property
+    def stats(self) -> dict:
+        """
+        게시 / 읽기 / 버린 프레임 수 스냅샷
+        """
+
+        with self._cond:
+            return {
+                "published": self._sequence,
+                "reads": self._reads,
+                "dropped": self._dropped,
+                "pinned": sum(1 for pins in self._pins if pins > 0),
+                "previews_built": sum(pyramid.built for pyramid in self._pyramids),
+                "preview_hits": sum(pyramid.hits for pyramid in self._pyramids),
+            }
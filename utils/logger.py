@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT_LOGGER_NAME = "omron"
+LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    호출 위치(파일, 줄 번호)별로 초당 로그 개수를 제한하는 필터
+    제한으로 버려진 개수는 다음에 통과하는 로그에 덧붙여 표시
+    """
+
+    def __init__(self, max_per_second:float=20.0) -> None:
+        """
+        Args:
+            max_per_second: 호출 위치별 초당 최대 로그 개수
+        """
+
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._buckets = {}     # (pathname, lineno) -> [tokens, last_time, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record:logging.LogRecord) -> bool:
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.max_per_second, now, 0]
+                self._buckets[key] = bucket
+            # 토큰 버킷: 경과 시간만큼 토큰 충전
+            bucket[0] = min(self.max_per_second, bucket[0] + (now - bucket[1]) * self.max_per_second)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+
+        return True
+
+
+def setup_logging(level=None, max_per_second:float=None) -> None:
+    """
+    큐 기반 로깅 설정
+    호출 스레드(GenTL 콜백 등)는 로그 레코드를 큐에 넣기만 하고, 출력은 별도 리스너 스레드가 담당
+
+    Args:
+        level: 로그 레벨, None이면 환경 변수 OMRON_LOG_LEVEL (기본값 INFO)
+        max_per_second: 호출 위치별 초당 최대 로그 개수, None이면 환경 변수 OMRON_LOG_RATE (기본값 20, 0이면 제한 없음)
+    """
+
+    global _listener
+
+    if level is None:
+        level = os.environ.get("OMRON_LOG_LEVEL", "INFO").upper()
+    if max_per_second is None:
+        max_per_second = float(os.environ.get("OMRON_LOG_RATE", 20))
+
+    with _setup_lock:
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(level)
+        root.propagate = False
+
+        if _listener is not None:
+            return
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        if max_per_second > 0:
+            queue_handler.addFilter(RateLimitFilter(max_per_second=max_per_second))
+        root.addHandler(queue_handler)
+
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    큐에 남은 로그를 모두 출력하고 리스너 스레드 종료
+    """
+
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name:str) -> logging.Logger:
+    """
+    프로젝트 로거 반환 (처음 호출 시 큐 기반 로깅 설정)
+
+    Args:
+        name: 로거 이름 (예: "camera", "manager")
+    """
+
+    if _listener is None:
+        setup_logging()
+
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
@@ -0,0 +1,126 @@
+import time
+import threading
+from utils.logger import get_logger
+
+logger = get_logger("parallel")
+
+
+class ParallelResult:
+    """
+    run_parallel() 결과 (성공 / 예외 / 시간 초과를 항목별로 구분)
+    """
+
+    def __init__(self, keys:list) -> None:
+        self.keys = list(keys)
+        self.results = {}       # 키 -> 반환값
+        self.errors = {}        # 키 -> 예외
+        self.timed_out = []     # 시간 안에 끝나지 않은 키
+        self.elapsed = 0.0
+        self.threads = {}       # 시간 안에 끝나지 않은 키 -> 아직 실행 중일 수 있는 스레드
+
+    @property
+    def ok(self) -> bool:
+        return len(self.errors) == 0 and len(self.timed_out) == 0
+
+    @property
+    def failed(self) -> dict:
+        """
+        실패한 항목 {키: 원인 문자열}
+        """
+
+        failed = {key: f"{type(error).__name__}: {error}" for key, error in self.errors.items()}
+        failed.update({key: "timed out" for key in self.timed_out})
+
+        return {key: failed[key] for key in self.keys if key in failed}
+
+    def ordered(self) -> list:
+        """
+        성공한 항목의 반환값 (keys 순서)
+        """
+
+        return [self.results[key] for key in self.keys if key in self.results]
+
+    def join(self, timeout:float=None) -> list:
+        """
+        시간 안에 끝나지 않았던 스레드가 끝날 때까지 대기 (자원을 해제하기 전에 호출)
+
+        Args:
+            timeout: 전체 스레드를 기다리는 최대 시간(초), None이면 무한 대기
+
+        Return:
+            그래도 끝나지 않은 키 리스트
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads.values():
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+        return [key for key, thread in self.threads.items() if thread.is_alive()]
+
+
+def run_parallel(func, items:dict, timeout:float=None, name:str="parallel", on_late=None) -> ParallelResult:
+    """
+    항목마다 데몬 스레드 하나로 func(item)을 동시에 실행하고, 모든 항목이 끝나거나 timeout이 지날 때까지 대기
+    응답하지 않는 장치 때문에 전체가 멈추지 않도록 시간 안에 끝나지 않은 항목은 기다리지 않고 timed_out으로 보고
+    (그 스레드는 데몬이므로 프로세스 종료를 막지 않고, 늦게 끝난 결과는 결과에 넣지 않고 on_late로 넘겨 해제)
+    한 항목이 실패해도 나머지 항목은 끝까지 실행
+
+    Args:
+        func: 실행할 함수 func(item)
+        items: {키(카메라 번호 등): 인자}
+        timeout: 전체 항목을 기다리는 최대 시간(초), None이면 무한 대기
+        name: 스레드 이름 접두어 (로그 구분용)
+        on_late: 시간 초과 후에 성공한 항목의 반환값을 해제하는 함수 on_late(key, value), 해당 스레드에서 호출
+
+    Return:
+        ParallelResult
+    """
+
+    result = ParallelResult(keys=items)
+    lock = threading.Lock()
+    finished = set()
+    abandoned = set()   # 시간 초과로 보고한 키
+
+    def run_one(key, item) -> None:
+        late = False
+        try:
+            value = func(item)
+            with lock:
+                late = key in abandoned
+                if late == False:
+                    result.results[key] = value
+            if late == True:
+                logger.warning("[%s] %s finished after timeout, releasing result", name, key)
+                if on_late is not None:
+                    on_late(key, value)
+        except Exception as exception:
+            with lock:
+                if key not in abandoned:
+                    result.errors[key] = exception
+                    return
+            logger.warning("[%s] %s failed after timeout: %s: %s", name, key, type(exception).__name__, exception)
+        finally:
+            with lock:
+                finished.add(key)
+
+    start = time.perf_counter()
+    threads = {key: threading.Thread(target=run_one, args=(key, item), name=f"{name}-{key}", daemon=True)
+                for key, item in items.items()}
+    for thread in threads.values():
+        thread.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for thread in threads.values():
+        thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    with lock:
+        # 이후에 끝나는 스레드의 결과는 반영하지 않음 (on_late로 해제)
+        result.timed_out = [key for key in threads if key not in finished]
+        abandoned.update(result.timed_out)
+        result.threads = {key: threads[key] for key in result.timed_out}
+    result.elapsed = time.perf_counter() - start
+
+    for key, reason in result.failed.items():
+        logger.error("[%s] %s failed: %s", name, key, reason)
+
+    return result
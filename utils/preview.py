@@ -0,0 +1,82 @@
+import threading
+import cv2
+import numpy as np
+
+# 축소 방식
+PREVIEW_AREA = "area"       # 이전 단계를 2x2 평균으로 절반씩 축소 (계단 현상 없음, 1/2 단계부터 순서대로 만들어 재사용)
+PREVIEW_STRIDE = "stride"   # n 픽셀마다 하나씩 고르는 뷰 (계산 / 복사 없음, 앨리어싱 있음)
+PREVIEW_MODES = (PREVIEW_AREA, PREVIEW_STRIDE)
+
+
+class PreviewPyramid:
+    """
+    프레임 한 장의 축소 이미지 피라미드 (1/2, 1/4, 1/8 ...)
+    처음 요청될 때 필요한 단계까지만 만들고 캐시하므로 아무도 보지 않는 프레임은 축소하지 않고,
+    여러 소비자(대시보드, 썸네일 그리드 등)가 같은 크기를 요청해도 한 번만 계산
+    원본 배열이 바뀌기 전에 reset()해야 함 (LatestFrameCache가 슬롯을 다시 쓸 때 호출)
+    """
+
+    def __init__(self) -> None:
+        self._source = None
+        self._levels = {}       # 축소 배율 -> 읽기 전용 배열
+        self._lock = threading.Lock()
+
+        # 통계
+        self.built = 0
+        self.hits = 0
+
+    def reset(self, source:np.ndarray=None) -> None:
+        """
+        새 프레임으로 교체 (캐시된 단계 삭제)
+
+        Args:
+            source: 원본 프레임 배열 (H x W 또는 H x W x C)
+        """
+
+        with self._lock:
+            self._source = source
+            self._levels = {}
+
+    def get(self, factor:int, mode:str=PREVIEW_AREA) -> np.ndarray:
+        """
+        1/factor 크기의 축소 이미지
+
+        Args:
+            factor: 축소 배율 (1, 2, 4, 8 ... 2의 거듭제곱), 1이면 원본
+            mode: PREVIEW_AREA 또는 PREVIEW_STRIDE
+
+        Return:
+            읽기 전용 배열 (프레임이 없으면 None)
+        """
+
+        if factor < 1 or factor & (factor - 1) != 0:
+            raise ValueError(f"Preview factor must be a power of two, got {factor}")
+        if mode not in PREVIEW_MODES:
+            raise ValueError(f"Invalid preview mode '{mode}'. Choose one of {list(PREVIEW_MODES)}")
+
+        source = self._source
+        if source is None or factor == 1:
+            return source
+        if mode == PREVIEW_STRIDE:
+            return source[::factor, ::factor]
+
+        with self._lock:
+            level = self._levels.get(factor)
+            if level is not None:
+                self.hits += 1
+                return level
+
+            # 가장 가까운 작은 배율 단계부터 절반씩 축소
+            scale = factor // 2
+            while scale > 1 and scale not in self._levels:
+                scale //= 2
+            level = self._levels.get(scale, source)
+            while scale < factor:
+                height, width = level.shape[:2]
+                level = cv2.resize(level, (max(width // 2, 1), max(height // 2, 1)), interpolation=cv2.INTER_AREA)
+                level.flags.writeable = False
+                scale *= 2
+                self._levels[scale] = level
+                self.built += 1
+
+        return level
@@ -0,0 +1,366 @@
+import time
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from utils.conversion import ConversionPlan
+from utils.writers import create_writer
+from utils.logger import get_logger
+
+logger = get_logger("process_pool")
+
+# 결과를 기다리는 중 워커 프로세스 생존 여부를 확인하는 주기(초)
+WORKER_CHECK_INTERVAL = 0.5
+# 워커가 준비되었음을 알리는 결과 큐 메시지 (READY, 워커 번호)
+READY = "ready"
+
+
+def _worker_main(index:int, shm_name:str, slot_bytes:int, tasks, results) -> None:
+    """
+    워커 프로세스 루프: 공유 메모리 슬롯의 원본 버퍼를 변환, 인코딩하여 파일로 저장하고 결과만 보고
+    (stApi를 import하지 않으므로 카메라 없이 실행됨)
+    """
+
+    # 프로세스끼리 코어를 나눠 쓰므로 OpenCV 내부 스레드는 사용하지 않음
+    cv2.setNumThreads(1)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # import와 공유 메모리 연결이 끝났으므로 작업을 받을 수 있음
+    results.put((READY, index))
+    writers = {}    # 포맷 문자열 -> ImageWriter
+    plans = {}      # 변환 계획 인자 -> ConversionPlan (출력 배열 재사용)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            task_id, slot, shape, dtype, plan_params, file_name, spec = task
+            try:
+                start = time.perf_counter()
+                raw_array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=slot * slot_bytes)
+                writer = writers.get(spec)
+                if writer is None:
+                    writer = writers[spec] = create_writer(spec)
+                if writer.raw:
+                    img_array = raw_array
+                else:
+                    plan = plans.get(plan_params)
+                    if plan is None:
+                        plan = plans[plan_params] = ConversionPlan(*plan_params)
+                    img_array = plan.convert(raw_array)
+                converted = time.perf_counter()
+                encoded = writer.encode(img_array)
+                encoded_time = time.perf_counter()
+                with open(file_name, 'wb') as file:
+                    file.write(encoded)
+                end = time.perf_counter()
+                results.put((task_id, None, img_array.nbytes, len(encoded), converted - start, encoded_time - converted, end - encoded_time))
+            except Exception as exception:
+                results.put((task_id, f"{type(exception).__name__}: {exception}", 0, 0, 0.0, 0.0, 0.0))
+            finally:
+                raw_array = img_array = None
+    finally:
+        shm.close()
+
+
+class ProcessEncodePool:
+    """
+    변환(디베이어)과 인코딩을 워커 프로세스에서 수행하는 저장 풀 (GIL 경합 회피)
+    콜백 스레드는 원본 버퍼를 공유 메모리 슬롯에 한 번 복사하고 작은 작업 메시지(변환 계획 인자 포함)만 보냄
+    결과(크기, 시간)는 결과 큐로 돌아와 결과 스레드가 슬롯 반환과 완료 콜백을 처리
+    작업 큐는 워커마다 따로 두어 워커 하나가 죽어도 다른 워커가 막히지 않고, 죽은 워커가 맡은 작업만 실패로 처리
+    """
+
+    def __init__(self, num_workers:int=4, num_slots:int=16, slot_bytes:int=4000 * 3000 * 3) -> None:
+        """
+        Args:
+            num_workers: 워커 프로세스 개수
+            num_slots: 공유 메모리 슬롯 개수 (동시에 처리 대기할 수 있는 최대 프레임 수)
+            slot_bytes: 슬롯 하나의 크기 (가장 큰 원본 프레임 크기 이상)
+        """
+
+        self.num_workers = num_workers
+        self.num_slots = num_slots
+        self.slot_bytes = slot_bytes
+        self._context = multiprocessing.get_context("spawn")   # 카메라 스레드가 실행 중이므로 fork 대신 spawn
+        self._shm = None
+        self._tasks = []        # 워커별 작업 큐
+        self._results = None
+        self._processes = []
+        self._result_thread = None
+        self._free = deque(range(num_slots))
+        self._cond = threading.Condition()
+        self._pending = {}      # task_id -> (slot, writer, on_done, 워커 번호)
+        self._load = []         # 워커별 처리 대기 작업 수
+        self._dead = set()      # 종료가 확인된 워커 번호
+        self._stopping = False
+        self._next_task = 0
+
+        # 통계
+        self._submitted = 0
+        self._completed = 0
+        self._errors = 0
+        self._dropped = 0
+        self._convert_time = 0.0
+
+    def start(self, timeout:float=30.0) -> None:
+        """
+        공유 메모리 할당 및 워커 프로세스 실행
+        spawn된 워커는 모듈을 다시 import하므로, 모든 워커가 준비를 알릴 때까지 기다린 후 반환
+
+        Args:
+            timeout: 모든 워커가 준비되기를 기다리는 최대 시간(초), 넘거나 준비 전에 죽은 워커가 있으면 RuntimeError
+        """
+
+        self._shm = shared_memory.SharedMemory(create=True, size=self.num_slots * self.slot_bytes)
+        self._tasks = [self._context.Queue() for _ in range(self.num_workers)]
+        self._results = self._context.Queue()
+        self._load = [0] * self.num_workers
+        self._dead = set()
+        self._stopping = False
+        for i in range(self.num_workers):
+            process = self._context.Process(target=_worker_main, args=(i, self._shm.name, self.slot_bytes, self._tasks[i], self._results),
+                                            name=f"EncodeWorker-{i}", daemon=True)
+            process.start()
+            self._processes.append(process)
+        self._wait_ready(timeout=timeout)
+        self._result_thread = threading.Thread(target=self._result_loop, name="EncodeResults", daemon=True)
+        self._result_thread.start()
+
+        logger.info("[ProcessPool] Started %d workers, %d slots x %.1f MB shared memory", self.num_workers, self.num_slots, self.slot_bytes / 1e6)
+
+    def _wait_ready(self, timeout:float) -> None:
+        """
+        모든 워커의 준비 메시지를 기다림 (결과 스레드 시작 전이므로 결과 큐를 직접 읽음)
+        실패하면 워커와 공유 메모리를 정리하고 RuntimeError
+        """
+
+        ready = set()
+        deadline = time.monotonic() + timeout
+        while len(ready) < self.num_workers:
+            dead = [process.name for i, process in enumerate(self._processes) if i not in ready and not process.is_alive()]
+            remaining = deadline - time.monotonic()
+            if len(dead) > 0 or remaining <= 0:
+                reason = f"{dead} exited during startup" if len(dead) > 0 else f"not ready within {timeout:.1f} s"
+                self._abort_start()
+                raise RuntimeError(f"[ProcessPool] {self.num_workers - len(ready)} workers failed to start: {reason}")
+            try:
+                message = self._results.get(timeout=min(WORKER_CHECK_INTERVAL, remaining))
+            except queue.Empty:
+                continue
+            if message[0] == READY:
+                ready.add(message[1])
+
+    def _abort_start(self) -> None:
+        """
+        준비되지 않은 풀의 워커 프로세스를 강제 종료하고 공유 메모리 해제
+        """
+
+        for process in self._processes:
+            if process.is_alive():
+                process.kill()
+            process.join(WORKER_CHECK_INTERVAL)
+        self._processes = []
+        self._tasks = []
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def stop(self, timeout:float=10.0) -> None:
+        """
+        남은 작업을 모두 처리한 후 워커 프로세스 종료 및 공유 메모리 해제
+        timeout 안에 끝나지 않은 워커는 강제 종료하고, 끝내지 못한 작업은 실패로 처리
+
+        Args:
+            timeout: 워커가 남은 작업을 마치기를 기다리는 최대 시간(초)
+        """
+
+        if self._shm is None:
+            return
+
+        # 종료 신호를 받고 끝나는 워커는 비정상 종료로 보지 않음
+        self._stopping = True
+        for tasks in self._tasks:
+            tasks.put(None)
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self._processes:
+            if process.is_alive():
+                logger.error("[ProcessPool] %s did not stop within %.1f s, terminating", process.name, timeout)
+                process.terminate()
+                process.join(WORKER_CHECK_INTERVAL)
+                if process.is_alive():
+                    process.kill()
+                    process.join(WORKER_CHECK_INTERVAL)
+        self._results.put(None)
+        self._result_thread.join(timeout)
+        if self._result_thread.is_alive():
+            logger.error("[ProcessPool] Result thread did not stop within %.1f s", timeout)
+        self._result_thread = None
+        self._processes = []
+        self._tasks = []
+
+        # 결과가 오지 않은 작업 (죽거나 강제 종료된 워커가 맡았던 작업)
+        self._fail_tasks(list(self._pending), reason="worker stopped before finishing")
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+        logger.info("[ProcessPool] Stopped. %s", self.stats)
+
+    def submit(self, raw_array:np.ndarray, file_name:str, writer, plan:ConversionPlan=None, on_done=None, block:bool=True) -> bool:
+        """
+        원본 프레임을 공유 메모리에 복사하고 워커에 변환, 저장 요청 (콜백 스레드에서 호출)
+
+        Args:
+            raw_array: 원본 버퍼 배열 (GenTL 버퍼 뷰를 그대로 넘겨도 됨)
+            file_name: 저장할 파일 경로 (확장자 포함)
+            writer: 저장 포맷 (ImageWriter), 통계는 이 객체에 반영
+            plan: 워커에서 사용할 변환 계획 (인자만 전달됨), None이면 변환하지 않음
+            on_done: 저장되거나 실패한 뒤 호출할 함수 on_done(saved), 저장했을 때만 saved가 True
+            block: 빈 슬롯이 없을 때 대기할지 여부
+
+        Return:
+            요청했으면 True, 슬롯이 없거나 살아 있는 워커가 없어 버렸으면 False
+        """
+
+        if raw_array.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {raw_array.nbytes} bytes does not fit in a {self.slot_bytes} byte slot")
+
+        with self._cond:
+            # 살아 있는 워커가 없으면 슬롯이 반환되지 않으므로 기다리지 않고 버림
+            while not self._free and block == True and self.alive_workers > 0:
+                self._cond.wait(WORKER_CHECK_INTERVAL)
+            if not self._free or self.alive_workers == 0:
+                self._dropped += 1
+                return False
+            slot = self._free.popleft()
+            # 살아 있는 워커 중 대기 작업이 가장 적은 워커에 배정
+            worker = min((i for i in range(len(self._processes)) if i not in self._dead), key=lambda i: self._load[i])
+            self._load[worker] += 1
+            task_id = self._next_task
+            self._next_task += 1
+            self._pending[task_id] = (slot, writer, on_done, worker)
+            self._submitted += 1
+
+        target = np.ndarray(raw_array.shape, dtype=raw_array.dtype, buffer=self._shm.buf, offset=slot * self.slot_bytes)
+        np.copyto(target, raw_array)
+        del target
+        plan_params = plan.params if plan is not None else (0, None, False)
+        self._tasks[worker].put((task_id, slot, raw_array.shape, raw_array.dtype.str, plan_params, file_name, writer.spec))
+
+        return True
+
+    @property
+    def alive_workers(self) -> int:
+        """
+        실행 중인 워커 프로세스 수 (결과 스레드가 WORKER_CHECK_INTERVAL마다 갱신)
+        """
+
+        return len(self._processes) - len(self._dead)
+
+    @property
+    def stats(self) -> dict:
+        """
+        풀 카운터 스냅샷
+        """
+
+        with self._cond:
+            return {
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "errors": self._errors,
+                "dropped": self._dropped,
+                "in_flight": len(self._pending),
+                "dead_workers": len(self._dead),
+                "mean_convert_ms": self._convert_time / max(self._completed, 1) * 1e3,
+            }
+
+    def _result_loop(self) -> None:
+        """
+        워커 결과를 받아 슬롯 반환, writer 통계 반영, 완료 콜백 호출
+        워커 프로세스가 죽으면 그 워커가 맡았던 작업을 실패로 처리
+        """
+
+        next_check = time.monotonic() + WORKER_CHECK_INTERVAL
+        while True:
+            # 다른 워커의 결과가 계속 와도 주기적으로 확인
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + WORKER_CHECK_INTERVAL
+            try:
+                result = self._results.get(timeout=WORKER_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            if result is None:
+                break
+
+            task_id, error, input_bytes, encoded_bytes, convert_time, encode_time, write_time = result
+            with self._cond:
+                pending = self._pending.pop(task_id, None)
+                if pending is None:
+                    # 워커가 결과를 보낸 직후 죽어 이미 실패로 처리한 작업
+                    continue
+                slot, writer, on_done, worker = pending
+                self._free.append(slot)
+                self._load[worker] -= 1
+                if error is None:
+                    self._completed += 1
+                    self._convert_time += convert_time
+                else:
+                    self._errors += 1
+                self._cond.notify()
+
+            if error is None:
+                writer.record(input_bytes=input_bytes, encoded_bytes=encoded_bytes, encode_time=encode_time, write_time=write_time)
+            else:
+                writer.record_error()
+                logger.error("[ProcessPool] Failed to save image (task %d): %s", task_id, error)
+            if on_done is not None:
+                on_done(error is None)
+
+    def _check_workers(self) -> None:
+        """
+        새로 죽은 워커를 찾아 그 워커에 배정된 작업을 실패로 처리
+        """
+
+        if self._stopping:
+            return
+
+        for i, process in enumerate(self._processes):
+            if i in self._dead or process.is_alive():
+                continue
+            with self._cond:
+                self._dead.add(i)
+                orphaned = [task_id for task_id, pending in self._pending.items() if pending[3] == i]
+            logger.error("[ProcessPool] %s exited unexpectedly (exit code %s)", process.name, process.exitcode)
+            self._fail_tasks(orphaned, reason=f"{process.name} died")
+
+    def _fail_tasks(self, task_ids:list, reason:str) -> None:
+        """
+        결과가 오지 않을 작업의 슬롯을 반환하고 실패로 완료 콜백 호출
+        """
+
+        failed = []
+        with self._cond:
+            for task_id in task_ids:
+                pending = self._pending.pop(task_id, None)
+                if pending is None:
+                    continue
+                slot, writer, on_done, worker = pending
+                self._free.append(slot)
+                self._load[worker] -= 1
+                self._errors += 1
+                failed.append((writer, on_done))
+            self._cond.notify_all()
+
+        if len(failed) > 0:
+            logger.error("[ProcessPool] %d tasks failed: %s", len(failed), reason)
+        for writer, on_done in failed:
+            writer.record_error()
+            if on_done is not None:
+                on_done(False)
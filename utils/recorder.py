@@ -0,0 +1,329 @@
+import os
+import re
+import errno
+import mmap
+import threading
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger("recorder")
+
+INDEX_FILE = "index.bin"
+SEGMENT_FILE = "segment_{:05d}.dat"
+SEGMENT_PATTERN = re.compile(r"segment_\d{5}\.dat")
+ALIGNMENT = 64      # 프레임 시작 위치 정렬 (byte)
+INDEX_FLUSH_RECORDS = 256   # 인덱스를 OS에 넘기는 레코드 간격 (프로세스가 죽어도 그 이전 프레임은 읽을 수 있음)
+
+# 프레임 인덱스 레코드 (index.bin에 순서대로 추가)
+INDEX_DTYPE = np.dtype([
+    ("camera_index", "<i4"),
+    ("action", "<i8"),
+    ("frame_id", "<u8"),
+    ("timestamp", "<u8"),
+    ("segment", "<u4"),
+    ("offset", "<u8"),
+    ("nbytes", "<u8"),
+    ("height", "<u4"),
+    ("width", "<u4"),
+    ("channels", "<u4"),
+    ("dtype", "S4"),
+])
+
+
+def _preallocate(file, size:int) -> None:
+    """
+    파일에 디스크 블록을 미리 할당 (posix_fallocate가 없거나 파일 시스템이 지원하지 않으면 truncate로 크기만 지정)
+    블록을 미리 잡아두면 기록 중 디스크가 가득 차도 메모리 맵 쓰기에서 SIGBUS가 나지 않고 세그먼트를 만들 때 OSError로 드러남
+    """
+
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(file.fileno(), 0, size)
+            return
+        except OSError as exception:
+            if exception.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                raise
+    file.truncate(size)
+
+
+class _Segment:
+    """
+    미리 할당된 메모리 맵 세그먼트 파일
+    """
+
+    def __init__(self, file_path:str, index:int, size:int) -> None:
+        self.index = index
+        self.size = size
+        self.used = 0           # 예약된 크기
+        self.pending = 0        # 복사 중인 프레임 수
+        self.sealed = False     # 더 이상 예약하지 않음
+        self._file = open(file_path, 'w+b')
+        _preallocate(self._file, size)
+        self.mmap = mmap.mmap(self._file.fileno(), size)
+
+    def close(self) -> None:
+        """
+        디스크에 반영하고 사용한 크기로 파일을 줄인 뒤 닫음
+        """
+
+        self.mmap.flush()
+        self.mmap.close()
+        self._file.truncate(self.used)
+        self._file.close()
+
+
+class SequenceRecorder:
+    """
+    프레임을 세그먼트 파일에 이어 붙이는 청크 컨테이너 기록기
+    프레임마다 파일을 만들지 않으므로 장시간 다중 카메라 기록에도 파일 수가 세그먼트 개수만큼만 늘어남
+
+    디렉토리 구성:
+        segment_00000.dat, segment_00001.dat, ...: 미리 할당된 메모리 맵 세그먼트 (프레임 원본 바이트)
+        index.bin: 프레임별 (camera, action, frame_id, timestamp, segment, offset, 크기) 레코드
+    """
+
+    def __init__(self, directory:str, segment_size:int=1 << 30, overwrite:bool=False, index_flush:int=INDEX_FLUSH_RECORDS) -> None:
+        """
+        Args:
+            directory: 기록할 디렉토리
+            segment_size: 세그먼트 파일 크기 (byte), 프레임 하나보다 커야 함
+            index_flush: 인덱스를 flush하는 레코드 간격 (세그먼트를 닫을 때도 flush)
+            overwrite: 디렉토리에 이미 컨테이너가 있으면 지우고 새로 기록, False이면 FileExistsError
+                        (세그먼트 번호가 0부터 다시 시작하므로 기존 컨테이너에 이어 쓸 수 없음)
+        """
+
+        os.makedirs(name=directory, exist_ok=True)
+        existing = [name for name in os.listdir(directory) if name == INDEX_FILE or SEGMENT_PATTERN.fullmatch(name)]
+        if len(existing) > 0:
+            if not overwrite:
+                raise FileExistsError(f"{directory} already contains a recording ({len(existing)} files). "
+                                        "Use another directory or overwrite=True")
+            for name in existing:
+                os.remove(os.path.join(directory, name))
+            logger.warning("[Recorder] Removed previous recording in %s (%d files)", directory, len(existing))
+        self.directory = directory
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._segment = None
+        self._next_segment = 0
+        self._index_file = open(os.path.join(directory, INDEX_FILE), 'wb')
+        self._index_flush = index_flush
+        self._unflushed = 0     # 마지막 flush 이후 기록한 인덱스 레코드 수
+        self._closed = False
+
+        # 통계
+        self.frames = 0
+        self.bytes = 0
+
+    def append(self, camera_index:int, action, frame_id:int, timestamp:int, img_array:np.ndarray) -> bool:
+        """
+        프레임 추가 (카메라 콜백에서 호출)
+        자리 예약만 락 안에서 하고 복사는 락 밖에서 하므로 여러 카메라가 동시에 기록 가능
+
+        Args:
+            camera_index: 카메라 번호
+            action: action 번호
+            frame_id: 프레임 ID
+            timestamp: 장치 타임스탬프
+            img_array: 이미지 배열 (GenTL 버퍼 뷰를 그대로 넘겨도 됨)
+
+        Return:
+            기록했으면 True
+        """
+
+        nbytes = img_array.nbytes
+        if nbytes > self.segment_size:
+            raise ValueError(f"Frame of {nbytes} bytes does not fit in a {self.segment_size} byte segment")
+
+        with self._lock:
+            if self._closed:
+                return False
+            segment = self._reserve_segment(nbytes)
+            offset = segment.used
+            segment.used = offset + (nbytes + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+            segment.pending += 1
+
+        # 세그먼트 메모리 맵에 직접 복사 (디스크 쓰기는 OS가 비동기로 처리)
+        target = np.frombuffer(segment.mmap, dtype=img_array.dtype, count=img_array.size, offset=offset)
+        np.copyto(target.reshape(img_array.shape), img_array)
+        del target
+
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record[0] = (camera_index, -1 if action is None else int(action), frame_id, timestamp, segment.index, offset, nbytes,
+                        img_array.shape[0], img_array.shape[1] if img_array.ndim > 1 else 1,
+                        img_array.shape[2] if img_array.ndim > 2 else 1, img_array.dtype.str)
+
+        with self._lock:
+            # 복사가 끝난 프레임만 인덱스에 기록
+            self._index_file.write(record.tobytes())
+            self._unflushed += 1
+            self.frames += 1
+            self.bytes += nbytes
+            segment.pending -= 1
+            if segment.sealed and segment.pending == 0:
+                self._close_segment(segment)
+            elif self._unflushed >= self._index_flush:
+                self._flush_index()
+
+        return True
+
+    def close(self) -> None:
+        """
+        현재 세그먼트와 인덱스를 디스크에 반영하고 닫음
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._segment is not None:
+                self._segment.sealed = True
+                if self._segment.pending == 0:
+                    self._segment.close()
+            self._index_file.close()
+
+        logger.info("[Recorder] Closed %s: %d frames, %.1f MB in %d segments", self.directory, self.frames, self.bytes / 1e6, self._next_segment)
+
+    def _reserve_segment(self, nbytes:int) -> _Segment:
+        """
+        nbytes를 기록할 공간이 있는 세그먼트 반환, 부족하면 새 세그먼트 생성 (락을 잡은 상태에서 호출)
+        """
+
+        segment = self._segment
+        if segment is not None and segment.used + nbytes <= segment.size:
+            return segment
+
+        if segment is not None:
+            # 복사 중인 프레임이 모두 끝나면 닫힘
+            segment.sealed = True
+            if segment.pending == 0:
+                self._close_segment(segment)
+
+        file_path = os.path.join(self.directory, SEGMENT_FILE.format(self._next_segment))
+        self._segment = _Segment(file_path=file_path, index=self._next_segment, size=self.segment_size)
+        self._next_segment += 1
+
+        return self._segment
+
+    def _close_segment(self, segment:_Segment) -> None:
+        """
+        봉인된 세그먼트를 닫고, 그 세그먼트의 레코드가 모두 기록되었으므로 인덱스도 flush (락을 잡은 상태에서 호출)
+        """
+
+        segment.close()
+        self._flush_index()
+
+    def _flush_index(self) -> None:
+        """
+        버퍼에 쌓인 인덱스 레코드를 파일에 씀 (락을 잡은 상태에서 호출)
+        """
+
+        self._index_file.flush()
+        self._unflushed = 0
+
+
+class SequenceReader:
+    """
+    SequenceRecorder로 기록한 컨테이너를 읽는 클래스
+    프레임은 세그먼트 메모리 맵을 참조하는 numpy 배열로 반환 (복사 없음)
+    """
+
+    def __init__(self, directory:str) -> None:
+        """
+        Args:
+            directory: 기록된 디렉토리
+        """
+
+        self.directory = directory
+        self.index = np.fromfile(os.path.join(directory, INDEX_FILE), dtype=INDEX_DTYPE)
+        self._segments = {}     # segment 번호 -> mmap
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, position:int) -> np.ndarray:
+        return self.read(position)
+
+    def __iter__(self):
+        """
+        기록된 순서대로 (인덱스 레코드, 이미지 배열) 반환
+        """
+
+        for position in range(len(self.index)):
+            yield self.index[position], self.read(position)
+
+    def read(self, position:int) -> np.ndarray:
+        """
+        인덱스 위치의 프레임을 numpy 배열로 반환
+
+        Args:
+            position: 인덱스 위치 (기록 순서)
+        """
+
+        record = self.index[position]
+        dtype = np.dtype(record["dtype"].decode())
+        shape = (int(record["height"]), int(record["width"]))
+        if record["channels"] > 1:
+            shape = (*shape, int(record["channels"]))
+
+        array = np.frombuffer(self._segment(int(record["segment"])), dtype=dtype,
+                                count=int(record["nbytes"]) // dtype.itemsize, offset=int(record["offset"]))
+
+        return array.reshape(shape)
+
+    def find(self, camera_index:int=None, action=None, frame_id:int=None) -> np.ndarray:
+        """
+        조건에 맞는 인덱스 위치 배열
+
+        Args:
+            camera_index: 카메라 번호, None이면 전체
+            action: action 번호, None이면 전체
+            frame_id: 프레임 ID, None이면 전체
+        """
+
+        mask = np.ones(len(self.index), dtype=bool)
+        if camera_index is not None:
+            mask &= self.index["camera_index"] == camera_index
+        if action is not None:
+            mask &= self.index["action"] == int(action)
+        if frame_id is not None:
+            mask &= self.index["frame_id"] == frame_id
+
+        return np.flatnonzero(mask)
+
+    def frame(self, camera_index:int, action) -> np.ndarray:
+        """
+        특정 카메라, action의 프레임 (없으면 None)
+        """
+
+        positions = self.find(camera_index=camera_index, action=action)
+        if len(positions) == 0:
+            return None
+
+        return self.read(int(positions[0]))
+
+    def iter_camera(self, camera_index:int):
+        """
+        한 카메라의 프레임을 기록 순서대로 반환
+        """
+
+        for position in self.find(camera_index=camera_index):
+            yield self.index[position], self.read(int(position))
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def _segment(self, segment_index:int) -> mmap.mmap:
+        """
+        세그먼트 파일을 읽기 전용 메모리 맵으로 열기 (처음 접근할 때)
+        """
+
+        segment = self._segments.get(segment_index)
+        if segment is None:
+            with open(os.path.join(self.directory, SEGMENT_FILE.format(segment_index)), 'rb') as file:
+                segment = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._segments[segment_index] = segment
+
+        return segment
@@ -0,0 +1,516 @@
+"""
+기록된 세션(이미지 디렉토리 또는 SequenceRecorder 컨테이너)을 라이브 데이터 스트림처럼 다시 재생
+
+    python -m utils.replay multiCamTrigger8 --speed 0 --loop 5
+
+CameraWorker의 데이터 스트림 대신 재생 스트림을 연결하면 같은 콜백 경로(변환 / 번들 / 저장)로 기록된 프레임을 처리
+
+    stream = ReplayDataStream(ReplaySource("multiCamTrigger8", speed=0, camera_index=cam.camera_index))
+    stream.attach(cam)
+    stream.start_acquisition()
+"""
+
+import os
+import re
+import time
+import queue
+import struct
+import argparse
+import threading
+from collections import deque
+import cv2
+import numpy as np
+from utils.recorder import SequenceReader, INDEX_FILE
+from utils.logger import get_logger
+
+logger = get_logger("replay")
+
+IMAGE_EXTENSIONS = (".bmp", ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".webp")
+
+# CameraWorker.save_image 파일 이름: action{action}_{camera_index}_{display_name}_{frame_id}[_{W}x{H}_{PixelFormat}].ext
+FILE_NAME_PATTERN = re.compile(r"^action(?P<action>-?\d+)_(?P<camera_index>\d+)_.*?_(?P<frame_id>\d+)(?:_\d+x\d+_\w+)?\.\w+$")
+
+
+def read_bmp(file_path:str) -> np.ndarray:
+    """
+    무압축 BMP를 메모리 맵으로 읽는 함수 (디코딩, 복사 없음)
+
+    Args:
+        file_path: BMP 파일 경로
+
+    Return:
+        파일을 참조하는 H x W (x C) 배열, 지원하지 않는 BMP(압축, 팔레트 등)이면 None
+    """
+
+    with open(file_path, 'rb') as file:
+        header = file.read(34)
+    if len(header) < 34 or header[:2] != b"BM":
+        return None
+
+    data_offset = struct.unpack_from("<I", header, 10)[0]
+    width, height, _, bits, compression = struct.unpack_from("<iiHHI", header, 18)
+    if compression != 0 or bits not in (8, 24, 32):
+        return None
+
+    channels = bits // 8
+    stride = (width * channels + 3) & ~3   # 행은 4 byte 단위로 정렬됨
+    rows = np.memmap(file_path, dtype=np.uint8, mode='r', offset=data_offset, shape=(abs(height), stride))
+    img_array = rows[:, :width * channels].reshape(abs(height), width, channels)
+    if channels == 1:
+        img_array = img_array[:, :, 0]
+
+    # 높이가 양수이면 아래 행부터 저장된 bottom-up 이미지
+    return img_array[::-1] if height > 0 else img_array
+
+
+def read_image(file_path:str) -> np.ndarray:
+    """
+    이미지 파일 읽기 (BMP는 메모리 맵, 나머지 포맷은 OpenCV 디코딩)
+    """
+
+    if file_path.lower().endswith(".bmp"):
+        img_array = read_bmp(file_path)
+        if img_array is not None:
+            return img_array
+
+    return cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+
+
+class ReplayFrame:
+    """
+    재생되는 프레임 (라이브 버퍼의 frame_id, timestamp 정보 포함)
+    """
+
+    def __init__(self, camera_index:int, action, frame_id:int, timestamp:int, array:np.ndarray) -> None:
+        self.camera_index = camera_index
+        self.action = action
+        self.frame_id = frame_id
+        self.timestamp = timestamp      # ns
+        self.array = array
+
+
+class ReplayImage:
+    """
+    재생 프레임의 stApi 이미지 형태 (width / height / pixel_format / get_image_data(), 복사 없음)
+    """
+
+    def __init__(self, array:np.ndarray, pixel_format) -> None:
+        self.array = np.ascontiguousarray(array)
+        self.width = array.shape[1]
+        self.height = array.shape[0]
+        self.pixel_format = pixel_format
+
+    def get_image_data(self) -> memoryview:
+        return memoryview(self.array.reshape(-1))
+
+
+class ReplayBufferInfo:
+    def __init__(self, frame_id:int, timestamp:int) -> None:
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.is_image_present = True
+        self.is_incomplete = False
+
+
+class ReplayBuffer:
+    """
+    retrieve_buffer()가 반환하는 버퍼 (with 구문으로 사용, 반환할 GenTL 버퍼는 없음)
+    """
+
+    def __init__(self, frame:ReplayFrame, pixel_format) -> None:
+        self.frame = frame
+        self.info = ReplayBufferInfo(frame_id=frame.frame_id, timestamp=frame.timestamp)
+        self._image = ReplayImage(array=frame.array, pixel_format=pixel_format)
+
+    def get_image(self) -> ReplayImage:
+        return self._image
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+class ReplayConverter:
+    """
+    재생 프레임용 픽셀 포맷 컨버터 (기록된 프레임은 이미 BGR8 / Mono8이므로 채널 수만 맞춤)
+    """
+
+    def __init__(self, isColor:bool=True) -> None:
+        from utils.backend import st
+
+        self._bgr8 = st.EStPixelFormatNamingConvention.BGR8
+        self._mono8 = st.EStPixelFormatNamingConvention.Mono8
+        self.destination_pixel_format = self._bgr8 if isColor == True else self._mono8
+
+    def convert(self, image:ReplayImage) -> ReplayImage:
+        if image.pixel_format == self.destination_pixel_format:
+            return image
+        code = cv2.COLOR_GRAY2BGR if self.destination_pixel_format == self._bgr8 else cv2.COLOR_BGR2GRAY
+        return ReplayImage(array=cv2.cvtColor(image.array, code), pixel_format=self.destination_pixel_format)
+
+
+class ReplayCallback:
+    """
+    register_callback()이 반환하는 콜백 등록 객체
+    """
+
+    def __init__(self, stream, func, context) -> None:
+        self.stream = stream
+        self.func = func
+        self.context = context
+
+    def deregister(self) -> None:
+        if self in self.stream._callbacks:
+            self.stream._callbacks.remove(self)
+
+
+class ReplayCallbackHandle:
+    def __init__(self, callback_type, stream) -> None:
+        self.callback_type = callback_type
+        self.module = stream
+
+
+class ReplayDataStream:
+    """
+    ReplaySource를 stApi 데이터 스트림과 같은 형태로 감싼 어댑터
+    register_callback(func, context)로 등록한 콜백을 func(handle, context)로 호출하고 (handle.callback_type은 새 버퍼 이벤트),
+    콜백 안에서 retrieve_buffer()로 버퍼를 꺼내 info / get_image()를 사용하는 CameraWorker 콜백 경로를 그대로 실행
+    """
+
+    def __init__(self, source:"ReplaySource", max_buffers:int=16) -> None:
+        """
+        Args:
+            source: 재생 소스 (카메라 한 대에 연결하면 camera_index를 지정해 해당 카메라 프레임만 재생)
+            max_buffers: 콜백이 꺼내지 않은 버퍼를 보관할 최대 개수 (넘으면 재생 스레드가 대기)
+        """
+
+        from utils.backend import st
+
+        self.source = source
+        self.max_buffers = max_buffers
+        self.on_frame = None            # 버퍼를 전달하기 직전에 호출할 함수 on_frame(frame) (스케줄러 / 번들 등록 등)
+        self._worker = None
+        self._callback_type = st.EStCallbackType.GenTLDataStreamNewBuffer
+        self._bgr8 = st.EStPixelFormatNamingConvention.BGR8
+        self._mono8 = st.EStPixelFormatNamingConvention.Mono8
+        self._timeout_error = st.PyStError
+        self._callbacks = []
+        self._output = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        # 통계
+        self.delivered = 0
+
+    @property
+    def is_grabbing(self) -> bool:
+        return self._running
+
+    def register_callback(self, func, context=None) -> ReplayCallback:
+        callback = ReplayCallback(self, func, context)
+        self._callbacks.append(callback)
+        return callback
+
+    def attach(self, worker) -> ReplayCallback:
+        """
+        CameraWorker가 카메라 대신 이 스트림의 프레임을 처리하도록 연결 (start_acquisition() 전에 호출)
+        워커의 데이터 스트림과 컨버터를 교체하고, 프레임마다 기록된 action 번호로 워커를 arm
+        (스케줄러 완료 / 번들 수집까지 확인하려면 on_frame에서 scheduler.begin() / bundler.expect() 호출)
+
+        Args:
+            worker: CameraWorker
+
+        Return:
+            콜백 등록 객체
+        """
+
+        worker.datastream = self
+        worker.st_converter_pixelformat = ReplayConverter(isColor=worker.isColor)
+        self._worker = worker
+
+        return self.register_callback(worker.datastream_callback)
+
+    def start_acquisition(self, num_images:int=None) -> None:
+        """
+        재생 시작 (재생 스레드가 프레임마다 버퍼를 넣고 등록된 콜백 호출)
+        """
+
+        self._running = True
+        self._thread = threading.Thread(target=self._deliver_loop, name="ReplayStream", daemon=True)
+        self._thread.start()
+
+    def stop_acquisition(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def join(self) -> None:
+        """
+        재생이 끝날 때까지 대기
+        """
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def retrieve_buffer(self, timeout_ms:int=5000) -> ReplayBuffer:
+        """
+        다음 버퍼 (timeout_ms 안에 없으면 stApi와 같이 PyStError)
+        """
+
+        deadline = time.monotonic() + max(timeout_ms, 0) / 1000.0
+        with self._cond:
+            while not self._output:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout_error("GC_ERR_TIMEOUT: buffer retrieval timed out")
+                self._cond.wait(remaining)
+            buffer = self._output.popleft()
+            self._cond.notify_all()
+            return buffer
+
+    def _deliver_loop(self) -> None:
+        try:
+            for frame in self.source.frames():
+                pixel_format = self._bgr8 if frame.array.ndim == 3 else self._mono8
+                with self._cond:
+                    while self._running and len(self._output) >= self.max_buffers:
+                        self._cond.wait(0.05)
+                    if not self._running:
+                        break
+                    self._output.append(ReplayBuffer(frame=frame, pixel_format=pixel_format))
+                    self._cond.notify_all()
+                if self._worker is not None:
+                    self._worker.arm(frame.action)
+                if self.on_frame is not None:
+                    self.on_frame(frame)
+                self.delivered += 1
+                for callback in list(self._callbacks):
+                    callback.func(ReplayCallbackHandle(self._callback_type, self), callback.context)
+        finally:
+            self._running = False
+
+
+class ReplaySource:
+    """
+    기록된 세션을 프레임 단위(콜백 func(frame) 또는 이터레이터)로 전달하는 재생 소스
+    프레임은 메모리 맵에서 prefetch 스레드가 미리 읽어 두고, 기록된 타임스탬프 간격(실시간) 또는 최대 속도로 전달
+    stApi 데이터 스트림 형태(콜백 + retrieve_buffer)가 필요하면 ReplayDataStream으로 감싸서 사용
+    """
+
+    def __init__(self, path:str, speed:float=1.0, frame_rate:float=30.0, prefetch:int=8, loop:int=1, camera_index:int=None) -> None:
+        """
+        Args:
+            path: 이미지 디렉토리 또는 SequenceRecorder 컨테이너 디렉토리
+            speed: 재생 속도 배율 (1.0: 실시간, 0: 대기 없이 최대 속도)
+            frame_rate: 타임스탬프가 없는 이미지 디렉토리의 action 주기 (fps)
+            prefetch: 미리 읽어 둘 프레임 수
+            loop: 반복 재생 횟수
+            camera_index: 지정하면 해당 카메라 프레임만 재생
+        """
+
+        self.path = path
+        self.speed = speed
+        self.prefetch = prefetch
+        self.loop = loop
+        self._callbacks = []
+        self._thread = None
+        self._running = False
+
+        # 통계
+        self.delivered = 0
+        self.elapsed = 0.0
+
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            self._reader = SequenceReader(directory=path)
+            self._entries = self._container_entries(camera_index=camera_index)
+        else:
+            self._reader = None
+            self._entries = self._directory_entries(frame_rate=frame_rate, camera_index=camera_index)
+
+        logger.info("[Replay] %s: %d frames", path, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries) * self.loop
+
+    def __iter__(self):
+        return self.frames()
+
+    def frames(self):
+        """
+        프레임을 재생 속도에 맞춰 순서대로 반환하는 이터레이터
+        """
+
+        output = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._prefetch_loop, args=(output, stop), name="ReplayPrefetch", daemon=True)
+        producer.start()
+
+        start = time.perf_counter()
+        first_timestamp = None
+        try:
+            while True:
+                frame = output.get()
+                if frame is None:
+                    break
+                if self.speed > 0:
+                    # 첫 프레임 기준 기록된 시각까지 대기
+                    if first_timestamp is None:
+                        first_timestamp = frame.timestamp
+                    delay = (frame.timestamp - first_timestamp) / 1e9 / self.speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                self.delivered += 1
+                self.elapsed = time.perf_counter() - start
+                yield frame
+        finally:
+            stop.set()
+            # prefetch 스레드가 put()에서 막혀 있으면 풀어 줌
+            while producer.is_alive():
+                try:
+                    output.get_nowait()
+                except queue.Empty:
+                    producer.join(0.01)
+
+    def register_callback(self, func) -> None:
+        """
+        프레임 도착 시 호출할 함수 등록 func(frame), start() 이후 재생 스레드에서 호출됨
+        """
+
+        self._callbacks.append(func)
+
+    def start(self) -> None:
+        """
+        재생 스레드 시작 (등록된 콜백으로 프레임 전달)
+        """
+
+        self._running = True
+        self._thread = threading.Thread(target=self._deliver_loop, name="Replay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        재생 중지
+        """
+
+        self._running = False
+        self.join()
+
+    def join(self) -> None:
+        """
+        재생이 끝날 때까지 대기
+        """
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def is_grabbing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "elapsed": self.elapsed,
+            "fps": self.delivered / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+    def _deliver_loop(self) -> None:
+        for frame in self.frames():
+            if self._running == False:
+                break
+            for func in self._callbacks:
+                func(frame)
+
+    def _prefetch_loop(self, output:queue.Queue, stop:threading.Event) -> None:
+        """
+        메모리 맵에서 프레임을 미리 읽어(복사) 큐에 넣는 루프
+        소비자는 디스크 대기 없이 독립된 메모리의 프레임을 받음 (라이브 버퍼와 같은 조건)
+        """
+
+        # 반복 재생 시 다음 회차 시작까지의 간격 (기록 구간 + 평균 프레임 간격)
+        period = 0
+        if len(self._entries) > 1:
+            span = self._entries[-1][3] - self._entries[0][3]
+            period = span + span // (len(self._entries) - 1)
+        try:
+            for repeat in range(self.loop):
+                for entry in self._entries:
+                    if stop.is_set():
+                        return
+                    camera_index, action, frame_id, timestamp, source = entry
+                    array = self._reader.read(source) if self._reader is not None else read_image(source)
+                    if array is None:
+                        logger.warning("[Replay] Unreadable image: %s", source)
+                        continue
+                    # 반복 재생 시 타임스탬프가 계속 증가하도록 이어 붙임
+                    frame = ReplayFrame(camera_index=camera_index, action=action, frame_id=frame_id,
+                                        timestamp=timestamp + repeat * period, array=np.array(array))
+                    output.put(frame)
+        finally:
+            output.put(None)
+
+    def _container_entries(self, camera_index:int) -> list:
+        """
+        컨테이너 인덱스에서 (camera_index, action, frame_id, timestamp, 위치) 목록 생성 (타임스탬프 순)
+        """
+
+        index = self._reader.index
+        entries = [(int(record["camera_index"]), int(record["action"]), int(record["frame_id"]), int(record["timestamp"]), position)
+                    for position, record in enumerate(index)
+                    if camera_index is None or record["camera_index"] == camera_index]
+
+        return sorted(entries, key=lambda entry: entry[3])
+
+    def _directory_entries(self, frame_rate:float, camera_index:int) -> list:
+        """
+        이미지 디렉토리에서 (camera_index, action, frame_id, timestamp, 파일 경로) 목록 생성
+        파일 이름에 action 정보가 없으면 파일 순서를 action으로 사용하고 카메라 0으로 간주
+        타임스탬프는 action 순서 x frame_rate 주기로 생성
+        """
+
+        entries = []
+        for order, file_name in enumerate(sorted(os.listdir(self.path))):
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            match = FILE_NAME_PATTERN.match(file_name)
+            if match is not None:
+                key = (int(match["camera_index"]), int(match["action"]), int(match["frame_id"]))
+            else:
+                key = (0, order, order)
+            if camera_index is None or key[0] == camera_index:
+                entries.append((*key, os.path.join(self.path, file_name)))
+
+        actions = sorted({action for _, action, _, _ in entries})
+        rank = {action: position for position, action in enumerate(actions)}
+        period_ns = int(1e9 / frame_rate)
+        entries = [(camera, action, frame_id, rank[action] * period_ns, file_path) for camera, action, frame_id, file_path in entries]
+
+        return sorted(entries, key=lambda entry: (entry[3], entry[0]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded session and report delivery throughput")
+    parser.add_argument("path", help="image directory or recording container directory")
+    parser.add_argument("--speed", type=float, default=0.0, help="1.0 = real time, 0 = as fast as possible")
+    parser.add_argument("--frame-rate", type=float, default=30.0)
+    parser.add_argument("--prefetch", type=int, default=8)
+    parser.add_argument("--loop", type=int, default=1)
+    parser.add_argument("--camera", type=int, default=None)
+    args = parser.parse_args()
+
+    source = ReplaySource(path=args.path, speed=args.speed, frame_rate=args.frame_rate, prefetch=args.prefetch,
+                            loop=args.loop, camera_index=args.camera)
+    num_bytes = 0
+    for frame in source:
+        num_bytes += frame.array.nbytes
+    stats = source.stats
+    print(f"[Replay] {stats['delivered']} frames in {stats['elapsed']:.3f} s "
+            f"({stats['fps']:.1f} frames/s, {num_bytes / max(stats['elapsed'], 1e-9) / 1e6:.1f} MB/s)")
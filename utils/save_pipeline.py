@@ -0,0 +1,195 @@
+import queue
+import threading
+import cv2
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger("save_pipeline")
+
+# 큐가 가득 찼을 때의 처리 정책 (back-pressure)
+POLICY_BLOCK = "block"              # 큐에 자리가 날 때까지 콜백 스레드 대기
+POLICY_DROP_OLDEST = "drop_oldest"  # 가장 오래된 프레임을 버리고 새 프레임 삽입
+POLICY_DROP_NEWEST = "drop_newest"  # 새 프레임을 버림
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST)
+
+
+class SavePipeline:
+    """
+    비동기 이미지 저장 파이프라인
+    콜백 스레드는 numpy 프레임을 큐에 넣기만 하고, 디스크 쓰기는 writer 스레드 풀이 담당
+    트리거 주기가 디스크 속도가 아닌 센서 속도에 의해 결정되도록 함
+    """
+
+    def __init__(self, num_workers:int=2, max_queue_size:int=16, policy:str=POLICY_BLOCK) -> None:
+        """
+        Args:
+            num_workers: 저장을 담당할 writer 스레드 개수
+            max_queue_size: 저장 대기 큐의 최대 크기
+            policy: 큐가 가득 찼을 때의 처리 정책 (block / drop_oldest / drop_newest)
+        """
+
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid policy '{policy}'. Choose one of {POLICIES}")
+
+        self.num_workers = num_workers
+        self.policy = policy
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._workers = []
+        self._lock = threading.Lock()
+
+        # 카운터
+        self._submitted = 0
+        self._saved = 0
+        self._dropped = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+
+    def start(self) -> None:
+        """
+        writer 스레드 실행
+        """
+
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"SaveWorker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self) -> None:
+        """
+        큐에 남은 프레임을 모두 저장한 후 writer 스레드 종료
+        """
+
+        # writer 스레드마다 종료 신호(None) 전달, 남은 프레임을 처리한 뒤 종료됨
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+        logger.info("[SavePipeline] Stopped. %s", self.stats)
+
+    def submit(self, file_name:str, img_array:np.ndarray, on_done=None, writer=None) -> bool:
+        """
+        저장할 프레임을 큐에 넣는 메소드 (콜백 스레드에서 호출)
+
+        Args:
+            file_name: 저장할 파일 경로
+            img_array: 이미지 배열 (GenTL 버퍼와 독립적인 메모리여야 함)
+            on_done: 저장되거나 실패하거나 버려진 뒤 호출할 함수 on_done(saved) (예: 프레임 풀 슬롯 반환), 저장했을 때만 saved가 True
+            writer: 저장 포맷 (ImageWriter), None이면 cv2.imwrite로 확장자에 맞게 저장
+
+        Return:
+            큐에 들어갔으면 True, 버려졌으면 False
+        """
+
+        item = (file_name, img_array, on_done, writer)
+
+        if self.policy == POLICY_BLOCK:
+            self._queue.put(item)
+        elif self.policy == POLICY_DROP_NEWEST:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self._drop(item)
+                return False
+        else:
+            # 자리가 날 때까지 가장 오래된 프레임을 버림
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        dropped = self._queue.get_nowait()
+                        self._queue.task_done()
+                        self._drop(dropped)
+                    except queue.Empty:
+                        pass
+
+        with self._lock:
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+        return True
+
+    def join(self) -> None:
+        """
+        큐에 들어간 모든 프레임이 저장될 때까지 대기
+        """
+
+        self._queue.join()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        현재 저장 대기 중인 프레임 수
+        """
+
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> dict:
+        """
+        파이프라인 카운터 스냅샷
+        """
+
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "saved": self._saved,
+                "dropped": self._dropped,
+                "errors": self._errors,
+            }
+
+    def _drop(self, item) -> None:
+        """
+        버려진 프레임 처리
+        """
+
+        with self._lock:
+            self._dropped += 1
+
+        on_done = item[2]
+        if on_done is not None:
+            on_done(False)
+
+    def _worker_loop(self) -> None:
+        """
+        큐에서 프레임을 꺼내 디스크에 저장하는 writer 스레드 루프
+        """
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            file_name, img_array, on_done, writer = item
+            saved = False
+            try:
+                if writer is not None:
+                    saved = writer.write(file_name=file_name, img_array=img_array)
+                else:
+                    saved = cv2.imwrite(filename=file_name, img=img_array)
+                if saved:
+                    with self._lock:
+                        self._saved += 1
+                    logger.debug("Image saved: %s", file_name)
+                else:
+                    with self._lock:
+                        self._errors += 1
+                    logger.error("Failed to save image: %s", file_name)
+            except Exception as exception:
+                # 한 프레임의 예외로 writer 스레드가 종료되면 남은 프레임이 저장되지 않고 join()이 멈춤
+                with self._lock:
+                    self._errors += 1
+                logger.error("Failed to save image: %s (%s: %s)", file_name, type(exception).__name__, exception)
+            finally:
+                try:
+                    if on_done is not None:
+                        on_done(bool(saved))
+                except Exception as exception:
+                    logger.error("Save callback failed: %s (%s)", file_name, exception)
+                self._queue.task_done()
@@ -0,0 +1,214 @@
+import time
+import threading
+from utils.logger import get_logger
+
+logger = get_logger("scheduler")
+
+
+class ActionState:
+    """
+    진행 중인 action의 카메라별 완료 상태
+    """
+
+    def __init__(self, action, camera_indexes:list) -> None:
+        self.action = action
+        self.camera_indexes = list(camera_indexes)
+        self.done = {}              # camera_index -> 성공 여부
+        self.started = time.monotonic()
+        self.finished = None
+
+    @property
+    def missing(self) -> list:
+        return [index for index in self.camera_indexes if index not in self.done]
+
+    @property
+    def failed(self) -> list:
+        return [index for index, ok in self.done.items() if ok == False]
+
+
+class ActionScheduler:
+    """
+    최대 K개의 action을 동시에 진행시키는 트리거 스케줄러
+    threading.Barrier 대신 action ID별로 카메라 완료를 추적하므로,
+    모든 카메라가 action N 저장을 마치기 전에도 action N+1을 트리거할 수 있고
+    프레임이 누락되어도 타임아웃 후 해당 action만 실패 처리하고 계속 진행함
+    """
+
+    def __init__(self, max_in_flight:int=2, timeout:float=2.0, on_complete=None, on_expire=None) -> None:
+        """
+        Args:
+            max_in_flight: 동시에 진행할 최대 action 수 (K)
+            timeout: action 시작 후 모든 카메라 완료를 기다리는 최대 시간(초)
+            on_complete: action 완료 시 호출할 함수 on_complete(state)
+            on_expire: action 타임아웃 시 호출할 함수 on_expire(state)
+        """
+
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.on_complete = on_complete
+        self.on_expire = on_expire
+        self._in_flight = {}        # action -> ActionState
+        self._listeners = []        # action이 끝나거나(완료 / 타임아웃) 호출할 함수 listener(state)
+        self._cond = threading.Condition()
+
+        # 통계
+        self.completed = 0
+        self.expired = 0
+        self.durations = []         # action 시작부터 완료까지 걸린 시간(초)
+
+    def begin(self, action, camera_indexes:list) -> None:
+        """
+        action 시작 등록 (트리거 직전에 호출)
+        진행 중인 action이 K개이면 하나가 끝나거나 타임아웃될 때까지 대기
+
+        Args:
+            action: action 번호
+            camera_indexes: 트리거할 카메라 번호 리스트
+        """
+
+        with self._cond:
+            while len(self._in_flight) >= self.max_in_flight:
+                self._wait_locked()
+            if len(camera_indexes) == 0:
+                return
+            self._in_flight[action] = ActionState(action=action, camera_indexes=camera_indexes)
+
+    def complete(self, action, camera_index:int, ok:bool=True) -> None:
+        """
+        카메라가 action 프레임 처리를 끝냈음을 알림 (카메라 콜백에서 호출)
+
+        Args:
+            action: action 번호
+            camera_index: 카메라 번호
+            ok: 프레임을 정상적으로 받았는지 여부
+        """
+
+        with self._cond:
+            state = self._in_flight.get(action)
+            if state is None or camera_index not in state.camera_indexes:
+                return
+            state.done[camera_index] = ok
+            if len(state.missing) > 0:
+                return
+            del self._in_flight[action]
+            state.finished = time.monotonic()
+            self.completed += 1
+            self.durations.append(state.finished - state.started)
+            self._cond.notify_all()
+
+        if self.on_complete is not None:
+            self.on_complete(state)
+        self._notify(state)
+
+    def add_listener(self, listener) -> None:
+        """
+        action이 끝날 때마다(완료 또는 타임아웃) 호출할 함수 등록, 카메라 콜백 스레드 또는 타임아웃을 처리한 스레드에서 호출됨
+
+        Args:
+            listener: listener(state), 타임아웃이면 state.missing이 비어 있지 않음
+        """
+
+        with self._cond:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def expire_overdue(self) -> int:
+        """
+        기다리지 않고 타임아웃이 지난 action만 실패 처리 (begin() / wait() / drain()을 호출하지 않는 쪽에서 주기적으로 호출)
+
+        Return:
+            실패 처리한 action 수
+        """
+
+        with self._cond:
+            return self._expire_locked()
+
+    def wait(self, action, timeout:float=None) -> bool:
+        """
+        특정 action이 끝날 때까지 대기
+
+        Return:
+            완료되었으면 True, timeout 초 안에 끝나지 않았으면 False
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while action in self._in_flight:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                self._wait_locked()
+
+        return True
+
+    def drain(self) -> None:
+        """
+        진행 중인 모든 action이 끝나거나 타임아웃될 때까지 대기
+        """
+
+        with self._cond:
+            while len(self._in_flight) > 0:
+                self._wait_locked()
+
+    @property
+    def in_flight(self) -> list:
+        with self._cond:
+            return list(self._in_flight)
+
+    def _wait_locked(self) -> None:
+        """
+        가장 오래된 action의 타임아웃 시점까지 대기하고, 지난 action은 실패 처리 (락을 잡은 상태에서 호출)
+        """
+
+        if self._expire_locked() == 0:
+            oldest = min(state.started for state in self._in_flight.values())
+            self._cond.wait(max(0.0, oldest + self.timeout - time.monotonic()))
+
+    def _expire_locked(self) -> int:
+        """
+        타임아웃이 지난 action을 실패 처리 (락을 잡은 상태에서 호출)
+
+        Return:
+            실패 처리한 action 수
+        """
+
+        now = time.monotonic()
+        # 콜백을 호출하는 동안 다른 스레드가 같은 action을 처리하지 않도록 먼저 모두 꺼냄
+        expired = [self._in_flight.pop(action) for action, state in list(self._in_flight.items())
+                    if now - state.started >= self.timeout]
+        if len(expired) == 0:
+            return 0
+
+        for state in expired:
+            state.finished = now
+            self.expired += 1
+            logger.warning("[Scheduler] Action %s timed out, missing cameras %s", state.action, state.missing)
+        self._cond.notify_all()
+
+        # 콜백 안에서 스케줄러를 다시 호출해도 되도록 락을 잠시 해제
+        self._cond.release()
+        try:
+            for state in expired:
+                if self.on_expire is not None:
+                    self.on_expire(state)
+                self._notify(state)
+        finally:
+            self._cond.acquire()
+
+        return len(expired)
+
+    def _notify(self, state:ActionState) -> None:
+        """
+        등록된 listener 호출 (락을 잡지 않은 상태에서 호출)
+        """
+
+        with self._cond:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(state)
+            except Exception as exception:
+                logger.error("[Scheduler] Listener failed on action %s: %s", state.action, exception)
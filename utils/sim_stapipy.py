@@ -0,0 +1,1021 @@
+"""
+하드웨어 없이 동작하는 stapipy 시뮬레이션 백엔드
+
+프로젝트에서 사용하는 stapipy API 일부만 구현
+(create_system, create_first_device, 노드맵, TriggerSoftware, 데이터 스트림 콜백, retrieve_buffer, 컨버터 등)
+해상도, 픽셀 포맷, 프레임 레이트, 지터, 프레임 드롭을 configure()로 설정하여
+카메라 없이 전체 파이프라인의 처리량과 지연 시간을 측정하는 데 사용
+
+사용법: 환경 변수 OMRON_BACKEND=sim 설정 후 실행 (utils/backend.py 참고)
+"""
+
+import os
+import time
+import heapq
+import random
+import threading
+from collections import deque
+import numpy as np
+import cv2
+
+
+class PyStError(Exception):
+    """
+    stapipy 예외
+    """
+
+
+# ---------------------------------------------------------------------------
+# 시뮬레이션 설정
+# ---------------------------------------------------------------------------
+
+class SimConfig:
+    """
+    시뮬레이션 카메라 설정
+    """
+
+    def __init__(self) -> None:
+        self.num_devices = int(os.environ.get("OMRON_SIM_CAMERAS", 4))
+        self.width = int(os.environ.get("OMRON_SIM_WIDTH", 1920))
+        self.height = int(os.environ.get("OMRON_SIM_HEIGHT", 1080))
+        self.pixel_format = os.environ.get("OMRON_SIM_PIXEL_FORMAT", "BayerRG8")
+        self.frame_rate = float(os.environ.get("OMRON_SIM_FRAME_RATE", 30.0))    # 최대 프레임 레이트 (센서 판독 속도)
+        self.latency = float(os.environ.get("OMRON_SIM_LATENCY", 0.002))         # 트리거 -> 버퍼 도착 지연 (초)
+        self.jitter = float(os.environ.get("OMRON_SIM_JITTER", 0.0005))          # 지연 시간 지터 표준편차 (초)
+        self.drop_rate = float(os.environ.get("OMRON_SIM_DROP_RATE", 0.0))       # 프레임이 전송되지 않을 확률
+        self.incomplete_rate = float(os.environ.get("OMRON_SIM_INCOMPLETE_RATE", 0.0))  # 불완전 버퍼 확률
+        self.node_latency = float(os.environ.get("OMRON_SIM_NODE_LATENCY", 0.0))    # 노드 읽기 / 쓰기 1회 왕복 시간 (초, GenCP / GVCP)
+        self.seed = None
+
+
+config = SimConfig()
+
+
+def configure(**kwargs) -> SimConfig:
+    """
+    시뮬레이션 설정 변경 (create_system() 전에 호출)
+
+    Args:
+        num_devices, width, height, pixel_format, frame_rate, latency, jitter, drop_rate, incomplete_rate, node_latency, seed
+    """
+
+    for key, value in kwargs.items():
+        if not hasattr(config, key):
+            raise AttributeError(f"Unknown simulation option '{key}'")
+        setattr(config, key, value)
+
+    return config
+
+
+# ---------------------------------------------------------------------------
+# 열거형
+# ---------------------------------------------------------------------------
+
+class EStCallbackType:
+    GenTLDataStreamNewBuffer = 0
+    GenTLDataStreamError = 1
+
+
+class EStConverterType:
+    PixelFormat = 0
+
+
+class EStPixelFormatNamingConvention:
+    Mono8 = 0x01080001
+    Mono10 = 0x01100003
+    Mono12 = 0x01100005
+    BayerGR8 = 0x01080008
+    BayerRG8 = 0x01080009
+    BayerGB8 = 0x0108000A
+    BayerBG8 = 0x0108000B
+    BayerGR12 = 0x01100010
+    BayerRG12 = 0x01100011
+    BayerGB12 = 0x01100012
+    BayerBG12 = 0x01100013
+    RGB8 = 0x02180014
+    BGR8 = 0x02180015
+
+
+class EStPixelColorFilter:
+    NONE = 0
+    BayerRG = 1
+    BayerGB = 2
+    BayerGR = 3
+    BayerBG = 4
+
+
+class EGCInterfaceType:
+    intfIValue = 0
+    intfIBase = 1
+    intfIInteger = 2
+    intfIBoolean = 3
+    intfICommand = 4
+    intfIFloat = 5
+    intfIString = 6
+    intfIRegister = 7
+    intfICategory = 8
+    intfIEnumeration = 9
+    intfIEnumEntry = 10
+    intfIPort = 11
+
+
+class EStBufferHandlingMode:
+    OldestFirst = "OldestFirst"
+    OldestFirstOverwrite = "OldestFirstOverwrite"
+    NewestOnly = "NewestOnly"
+
+
+PIXEL_FORMAT_NAMES = {name: value for name, value in vars(EStPixelFormatNamingConvention).items() if not name.startswith("_")}
+
+
+class PyStPixelFormatInfo:
+    """
+    픽셀 포맷 정보
+    """
+
+    def __init__(self, pixel_format:int) -> None:
+        name = {value: key for key, value in PIXEL_FORMAT_NAMES.items()}[pixel_format]
+        self.name = name
+        self.is_mono = name.startswith("Mono")
+        self.is_bayer = name.startswith("Bayer")
+        self.is_color = not self.is_mono
+        bits = int("".join(ch for ch in name if ch.isdigit()))
+        self.each_component_valid_bit_count = bits
+        self.each_component_total_bit_count = 8 if bits == 8 else 16
+        self.each_pixel_total_bit_count = self.each_component_total_bit_count * (3 if name in ("RGB8", "BGR8") else 1)
+        self._filter = EStPixelColorFilter.NONE
+        if self.is_bayer:
+            self._filter = getattr(EStPixelColorFilter, name[:7])
+
+    def get_pixel_color_filter(self) -> int:
+        return self._filter
+
+
+def get_pixel_format_info(pixel_format:int) -> PyStPixelFormatInfo:
+    return PyStPixelFormatInfo(pixel_format)
+
+
+# ---------------------------------------------------------------------------
+# 노드맵
+# ---------------------------------------------------------------------------
+
+def _round_trip(node=None) -> None:
+    """
+    장치 레지스터 접근 1회의 통신 지연 (노드 API 호출마다, 호스트 쪽 GenTL 노드(데이터 스트림)는 제외)
+    """
+
+    if config.node_latency > 0 and not getattr(node, "local", False):
+        time.sleep(config.node_latency)
+
+
+class _Node:
+    """
+    GenICam 노드 (값과 범위를 가진 단순 노드)
+    """
+
+    def __init__(self, name:str, value=None, min=None, max=None, inc=1, entries=None, on_change=None, on_changed=None,
+                    on_execute=None) -> None:
+        self.name = name
+        self.display_name = name
+        self.is_available = True
+        self._value = value
+        self.min = min
+        self.max = max
+        self.inc = inc
+        self.entries = entries      # 열거형 엔트리 이름 리스트
+        self.on_change = on_change      # 값 변경 전 호출 (예외를 내면 변경 거부)
+        self.on_changed = on_changed    # 값 변경 후 호출 (연관 노드 범위 갱신)
+        self.on_execute = on_execute
+        self.local = False          # 호스트 쪽 GenTL 노드 여부 (통신 지연 없음)
+
+    @property
+    def principal_interface_type(self) -> int:
+        if self.entries is not None:
+            return EGCInterfaceType.intfIEnumeration
+        if self.on_execute is not None:
+            return EGCInterfaceType.intfICommand
+        value = self.get_value()
+        if isinstance(value, bool):
+            return EGCInterfaceType.intfIBoolean
+        if isinstance(value, int):
+            return EGCInterfaceType.intfIInteger
+        if isinstance(value, float):
+            return EGCInterfaceType.intfIFloat
+        return EGCInterfaceType.intfIString
+
+    def get_value(self):
+        return self._value() if callable(self._value) else self._value
+
+    def set_value(self, value) -> None:
+        if self.entries is not None and value not in self.entries:
+            raise PyStError(f"{self.name}: invalid entry '{value}'")
+        if self.min is not None and not (self.min <= value <= self.max):
+            raise PyStError(f"{self.name}: value {value} out of range [{self.min}, {self.max}]")
+        if self.on_change is not None:
+            self.on_change(self.name, value)
+        self._value = value
+        if self.on_changed is not None:
+            self.on_changed(self.name, value)
+
+
+class PyStNodeMap:
+    """
+    노드맵
+    """
+
+    def __init__(self, local:bool=False) -> None:
+        self._nodes = {}
+        self.local = local
+
+    def add(self, node:_Node) -> _Node:
+        node.local = self.local
+        self._nodes[node.name] = node
+        return node
+
+    def get_node(self, name:str) -> _Node:
+        if name not in self._nodes:
+            raise PyStError(f"Node '{name}' does not exist")
+        return self._nodes[name]
+
+    def has_node(self, name:str) -> bool:
+        return name in self._nodes
+
+    def get_node_names(self) -> list:
+        return list(self._nodes)
+
+
+class PyIEnumEntry:
+    def __init__(self, node) -> None:
+        self._node = node
+        self.symbolic_value = node.symbolic_value
+
+    @property
+    def value(self):
+        return self.symbolic_value
+
+
+class _EnumEntryNode:
+    def __init__(self, enum_node:_Node, symbolic_value:str) -> None:
+        self.enum_node = enum_node
+        self.symbolic_value = symbolic_value
+
+
+class PyIEnumeration:
+    def __init__(self, node:_Node) -> None:
+        if node.entries is None:
+            raise PyStError(f"{node.name} is not an enumeration")
+        self._node = node
+
+    def __getitem__(self, entry_name:str) -> _EnumEntryNode:
+        if entry_name not in self._node.entries:
+            raise PyStError(f"{self._node.name}: entry '{entry_name}' does not exist")
+        return _EnumEntryNode(self._node, entry_name)
+
+    def set_entry_value(self, entry:PyIEnumEntry) -> None:
+        _round_trip(self._node)
+        self._node.set_value(entry.symbolic_value)
+
+    def get_symbolics(self) -> list:
+        return list(self._node.entries)
+
+    @property
+    def current_entry(self) -> PyIEnumEntry:
+        _round_trip(self._node)
+        return PyIEnumEntry(_EnumEntryNode(self._node, self._node.get_value()))
+
+    @property
+    def symbolic_value(self) -> str:
+        return self._node.get_value()
+
+    @property
+    def value(self) -> str:
+        return self._node.get_value()
+
+    @value.setter
+    def value(self, entry_name:str) -> None:
+        self._node.set_value(entry_name)
+
+
+class _ValueNode:
+    """
+    PyIInteger / PyIFloat / PyIBoolean / PyIString 공통 래퍼
+    """
+
+    def __init__(self, node:_Node) -> None:
+        self._node = node
+
+    @property
+    def value(self):
+        _round_trip(self._node)
+        return self._node.get_value()
+
+    @value.setter
+    def value(self, value) -> None:
+        _round_trip(self._node)
+        self._node.set_value(value)
+
+    @property
+    def min(self):
+        return self._node.min
+
+    @property
+    def max(self):
+        return self._node.max
+
+    @property
+    def inc(self):
+        return self._node.inc
+
+
+class PyIInteger(_ValueNode):
+    pass
+
+
+class PyIFloat(_ValueNode):
+    pass
+
+
+class PyIBoolean(_ValueNode):
+    pass
+
+
+class PyIString(_ValueNode):
+    pass
+
+
+class PyICommand:
+    def __init__(self, node:_Node) -> None:
+        if node.on_execute is None:
+            raise PyStError(f"{node.name} is not a command")
+        self._node = node
+
+    def execute(self) -> None:
+        _round_trip(self._node)
+        self._node.on_execute()
+
+
+class PyIValue(_ValueNode):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# 이미지 / 버퍼
+# ---------------------------------------------------------------------------
+
+class PyStImage:
+    """
+    이미지 객체 (메모리를 복사하지 않고 참조)
+    """
+
+    def __init__(self, width:int, height:int, pixel_format:int, data) -> None:
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self._data = data
+
+    def get_image_data(self) -> memoryview:
+        return self._data
+
+
+class PyStStreamBufferInfo:
+    def __init__(self, frame_id:int, timestamp:int, is_image_present:bool, is_incomplete:bool) -> None:
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.is_image_present = is_image_present
+        self.is_incomplete = is_incomplete
+
+
+class PyStStreamBuffer:
+    """
+    데이터 스트림 버퍼 (with 구문이 끝나면 버퍼 큐로 반환)
+    """
+
+    def __init__(self, stream, slot:int, info:PyStStreamBufferInfo, image:PyStImage) -> None:
+        self._stream = stream
+        self._slot = slot
+        self.info = info
+        self._image = image
+
+    def get_image(self) -> PyStImage:
+        return self._image
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._stream._queue_buffer(self._slot)
+
+
+class _CallbackHandle:
+    def __init__(self, callback_type:int, module) -> None:
+        self.callback_type = callback_type
+        self.module = module
+
+
+class PyStCallback:
+    """
+    register_callback()이 반환하는 콜백 등록 객체
+    """
+
+    def __init__(self, stream, func, context) -> None:
+        self.stream = stream
+        self.func = func
+        self.context = context
+
+    def deregister(self) -> None:
+        if self in self.stream._callbacks:
+            self.stream._callbacks.remove(self)
+
+
+# ---------------------------------------------------------------------------
+# 데이터 스트림
+# ---------------------------------------------------------------------------
+
+class PyStDataStream:
+    """
+    데이터 스트림
+    트리거(또는 프리런 주기)마다 지연 + 지터 후 버퍼를 출력 큐에 넣고 콜백 실행
+    """
+
+    def __init__(self, device) -> None:
+        self._device = device
+        self._lock = threading.Condition()
+        self._callbacks = []
+        self._pending = []          # (due_time, trigger_time) 힙
+        self._output = deque()      # 전달 대기 버퍼 슬롯
+        self._free_slots = deque()
+        self._buffers = []
+        self._thread = None
+        self._dispatcher = None
+        self._events = 0            # 콜백을 아직 호출하지 않은 새 버퍼 이벤트 수
+        self._running = False
+        self._frame_id = 0
+        self._next_ready = 0.0
+        self._random = random.Random(config.seed)
+        self.is_grabbing = False
+
+        # 데이터 스트림 통계 / 버퍼 설정 (호스트 쪽 GenTL 노드)
+        self.nodemap = PyStNodeMap(local=True)
+        self._stats = {"StreamDeliveredFrameCount": 0, "StreamLostFrameCount": 0, "StreamIncompleteFrameCount": 0,
+                        "StreamUnderrunCount": 0}
+        for name in self._stats:
+            self.nodemap.add(_Node(name, value=lambda name=name: self._stats[name]))
+        self.nodemap.add(_Node("StreamBufferCountAnnounced", value=lambda: len(self._buffers)))
+        self.nodemap.add(_Node("StreamInputBufferCount", value=lambda: len(self._free_slots)))
+        self.nodemap.add(_Node("StreamOutputBufferCount", value=lambda: len(self._output)))
+        # 획득을 시작할 때 할당할 버퍼 수 (Auto면 기본값 16)
+        self.nodemap.add(_Node("StreamBufferCountMode", value="Auto", entries=["Auto", "Manual"]))
+        self.nodemap.add(_Node("StreamBufferCountManual", value=16, min=1, max=1024, inc=1))
+        self.nodemap.add(_Node("StreamBufferHandlingMode", value=EStBufferHandlingMode.OldestFirst,
+                                entries=[EStBufferHandlingMode.OldestFirst, EStBufferHandlingMode.OldestFirstOverwrite,
+                                            EStBufferHandlingMode.NewestOnly]))
+
+    @property
+    def buffer_count(self) -> int:
+        if self.nodemap.get_node("StreamBufferCountMode").get_value() == "Manual":
+            return self.nodemap.get_node("StreamBufferCountManual").get_value()
+        return 16
+
+    def register_callback(self, func, context=None) -> PyStCallback:
+        callback = PyStCallback(self, func, context)
+        self._callbacks.append(callback)
+        return callback
+
+    def start_acquisition(self, num_images:int=None) -> None:
+        device = self._device
+        size = device.width * device.height * device.bytes_per_pixel
+        pattern = device.pattern()
+        self._buffers = [bytearray(pattern) for _ in range(self.buffer_count)]
+        self._free_slots = deque(range(self.buffer_count))
+        self._output.clear()
+        self._events = 0
+        self._size = size
+        self._running = True
+        self.is_grabbing = True
+        # 수신 스레드는 콜백과 무관하게 버퍼를 채우고, 콜백은 별도 스레드에서 순서대로 호출 (GenTL 이벤트 스레드)
+        self._thread = threading.Thread(target=self._deliver_loop, name=f"SimStream-{device.info.serial_number}", daemon=True)
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name=f"SimCallback-{device.info.serial_number}", daemon=True)
+        self._thread.start()
+        self._dispatcher.start()
+
+    def stop_acquisition(self) -> None:
+        with self._lock:
+            self._running = False
+            self.is_grabbing = False
+            self._lock.notify_all()
+        for thread in (self._thread, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
+        self._thread = None
+        self._dispatcher = None
+
+    def retrieve_buffer(self, timeout_ms:int=5000) -> PyStStreamBuffer:
+        deadline = time.monotonic() + max(timeout_ms, 0) / 1000.0
+        with self._lock:
+            while not self._output:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    raise PyStError("GC_ERR_TIMEOUT: buffer retrieval timed out")
+                self._lock.wait(remaining)
+            return self._output.popleft()
+
+    def _queue_buffer(self, slot:int) -> None:
+        with self._lock:
+            self._free_slots.append(slot)
+
+    def _schedule(self, trigger_time:float) -> None:
+        """
+        트리거 발생 -> 센서 판독 가능 시점 이후 지연 + 지터 만큼 뒤에 버퍼 도착 예약
+        """
+
+        with self._lock:
+            if not self._running:
+                return
+            period = self._device.frame_period
+            ready = max(trigger_time, self._next_ready)
+            self._next_ready = ready + period
+            due = ready + config.latency + abs(self._random.gauss(0.0, config.jitter))
+            heapq.heappush(self._pending, (due, ready))
+            self._lock.notify_all()
+
+    def _deliver_loop(self) -> None:
+        device = self._device
+        while True:
+            with self._lock:
+                while self._running:
+                    # 프리런(트리거 모드 OFF)이면 프레임 레이트 주기로 직접 예약
+                    if device.is_free_running and not self._pending:
+                        now = time.monotonic()
+                        ready = max(now, self._next_ready)
+                        self._next_ready = ready + device.frame_period
+                        heapq.heappush(self._pending, (ready + config.latency, ready))
+                    if self._pending:
+                        wait = self._pending[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._lock.wait(wait)
+                    else:
+                        self._lock.wait(0.05)
+                if not self._running:
+                    return
+                due, exposure_time = heapq.heappop(self._pending)
+                self._frame_id += 1
+                frame_id = self._frame_id
+
+                # 드롭 주입: 프레임 ID만 증가하고 버퍼는 전달되지 않음
+                if self._random.random() < config.drop_rate:
+                    self._stats["StreamLostFrameCount"] += 1
+                    continue
+                if not self._free_slots:
+                    if self.nodemap.get_node("StreamBufferHandlingMode").get_value() == EStBufferHandlingMode.OldestFirst:
+                        self._stats["StreamLostFrameCount"] += 1
+                        self._stats["StreamUnderrunCount"] += 1
+                        continue
+                    # 덮어쓰기 모드: 가장 오래된 미전달 버퍼를 재사용
+                    if not self._output:
+                        self._stats["StreamUnderrunCount"] += 1
+                        continue
+                    self._free_slots.append(self._output.popleft()._slot)
+                    self._stats["StreamLostFrameCount"] += 1
+                slot = self._free_slots.popleft()
+
+                incomplete = self._random.random() < config.incomplete_rate
+                data = self._buffers[slot]
+                data[0:8] = frame_id.to_bytes(8, "little")   # 프레임 번호를 이미지 앞부분에 기록
+                image = PyStImage(device.width, device.height, device.pixel_format, memoryview(data))
+                info = PyStStreamBufferInfo(frame_id=frame_id, timestamp=int(exposure_time * 1e9),
+                                            is_image_present=not incomplete, is_incomplete=incomplete)
+                self._output.append(PyStStreamBuffer(self, slot, info, image))
+                self._stats["StreamDeliveredFrameCount"] += 1
+                if incomplete:
+                    self._stats["StreamIncompleteFrameCount"] += 1
+                if self.nodemap.get_node("StreamBufferHandlingMode").get_value() == EStBufferHandlingMode.NewestOnly:
+                    while len(self._output) > 1:
+                        self._free_slots.append(self._output.popleft()._slot)
+                self._events += 1
+                self._lock.notify_all()
+
+    def _dispatch_loop(self) -> None:
+        """
+        새 버퍼마다 콜백 호출 (콜백이 느리면 버퍼가 출력 큐에 쌓임, NewestOnly로 버려진 버퍼의 이벤트는 생략)
+        """
+
+        while True:
+            with self._lock:
+                while self._running and (self._events == 0 or not self._output):
+                    if not self._output:
+                        self._events = 0
+                    self._lock.wait(0.05)
+                if not self._running:
+                    return
+                self._events -= 1
+                callbacks = list(self._callbacks)
+
+            # GenTL 콜백 스레드처럼 락 밖에서 콜백 실행
+            for callback in callbacks:
+                callback.func(_CallbackHandle(EStCallbackType.GenTLDataStreamNewBuffer, self), callback.context)
+
+
+# ---------------------------------------------------------------------------
+# 장치 / 인터페이스 / 시스템
+# ---------------------------------------------------------------------------
+
+class PyStDeviceInfo:
+    def __init__(self, index:int) -> None:
+        self.serial_number = f"SIM{index:05d}"
+        self.model = "SIM-CAM"
+        self.display_name = f"SIM-CAM({self.serial_number})"
+        self.device_id = f"SIM-{self.serial_number}"
+        self.user_defined_name = f"cam{index}"
+        self.vendor = "Simulated"
+        self.tl_type = "Custom"
+        self.access_status = 1
+
+
+class _Port:
+    def __init__(self, nodemap:PyStNodeMap) -> None:
+        self.nodemap = nodemap
+
+
+class PyStDevice:
+    """
+    시뮬레이션 카메라 장치
+    """
+
+    def __init__(self, system, interface, index:int) -> None:
+        self._system = system
+        self._interface = interface
+        self.info = PyStDeviceInfo(index)
+        self.is_device_lost = False
+        self._streams = []
+        self._acquiring = False
+        self._pattern = None
+
+        nodemap = PyStNodeMap()
+        self.remote_port = _Port(nodemap)
+        self.port = self.remote_port
+        w, h = config.width, config.height
+        formats = [name for name in PIXEL_FORMAT_NAMES if name not in ("RGB8", "BGR8")]
+        on_change = self._on_node_change
+        on_changed = self._on_geometry_change
+        nodemap.add(_Node("DeviceSerialNumber", value=self.info.serial_number))
+        nodemap.add(_Node("DeviceModelName", value=self.info.model))
+        nodemap.add(_Node("DeviceUserID", value=self.info.user_defined_name))
+        nodemap.add(_Node("WidthMax", value=w))
+        nodemap.add(_Node("HeightMax", value=h))
+        nodemap.add(_Node("SensorWidth", value=w))
+        nodemap.add(_Node("SensorHeight", value=h))
+        # Width / Height / Offset은 비닝, 디시메이션 후 픽셀 단위 (실제 카메라처럼 범위가 서로 연동됨)
+        # 피처 백이 의존 순서대로 저장하도록 비닝, 디시메이션 -> 픽셀 포맷 -> 크기 -> 오프셋 순서로 등록
+        for name in ("BinningHorizontal", "BinningVertical", "DecimationHorizontal", "DecimationVertical"):
+            nodemap.add(_Node(name, value=1, min=1, max=4, inc=1, on_change=on_change, on_changed=on_changed))
+        nodemap.add(_Node("PixelFormat", value=config.pixel_format, entries=formats, on_change=on_change))
+        nodemap.add(_Node("Width", value=w, min=8, max=w, inc=8, on_change=on_change, on_changed=on_changed))
+        nodemap.add(_Node("Height", value=h, min=8, max=h, inc=2, on_change=on_change, on_changed=on_changed))
+        nodemap.add(_Node("OffsetX", value=0, min=0, max=0, inc=8, on_change=on_change, on_changed=on_changed))
+        nodemap.add(_Node("OffsetY", value=0, min=0, max=0, inc=2, on_change=on_change, on_changed=on_changed))
+        # 상한값이면 센서 판독 속도(판독하는 행 수에 비례)로 동작
+        nodemap.add(_Node("AcquisitionFrameRate", value=1000.0, min=1.0, max=1000.0))
+        nodemap.add(_Node("ResultingFrameRate", value=lambda: 1.0 / self.frame_period))
+        nodemap.add(_Node("ExposureTime", value=10000.0, min=10.0, max=1e7))
+        nodemap.add(_Node("Gain", value=0.0, min=0.0, max=48.0))
+        # 링크 속도와 전송 제한은 SFNC처럼 byte/s, 패킷 간 지연은 타임스탬프 틱 단위
+        nodemap.add(_Node("DeviceLinkSpeed", value=125_000_000))
+        nodemap.add(_Node("DeviceLinkThroughputLimitMode", value="Off", entries=["Off", "On"]))
+        nodemap.add(_Node("DeviceLinkThroughputLimit", value=125_000_000, min=1_000_000, max=125_000_000, inc=1))
+        nodemap.add(_Node("GevSCPSPacketSize", value=1500, min=576, max=9000, inc=4))
+        nodemap.add(_Node("GevSCPD", value=0, min=0, max=100000, inc=1))
+        nodemap.add(_Node("GevTimestampTickFrequency", value=1_000_000_000))
+        nodemap.add(_Node("TriggerSelector", value="FrameStart", entries=["FrameStart", "ExposureStart"]))
+        nodemap.add(_Node("TriggerMode", value="Off", entries=["Off", "On"]))
+        nodemap.add(_Node("TriggerSource", value="Software", entries=["Software", "Line0", "Action0"]))
+        nodemap.add(_Node("TriggerActivation", value="RisingEdge", entries=["RisingEdge", "FallingEdge"]))
+        nodemap.add(_Node("TriggerSoftware", on_execute=self._on_software_trigger))
+        nodemap.add(_Node("AcquisitionStart", on_execute=self.acquisition_start))
+        nodemap.add(_Node("AcquisitionStop", on_execute=self.acquisition_stop))
+        nodemap.add(_Node("ActionSelector", value=0, min=0, max=0))
+        nodemap.add(_Node("ActionDeviceKey", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("ActionGroupKey", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("ActionGroupMask", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("LineSelector", value="Line0", entries=["Line0", "Line1", "Line2"]))
+        nodemap.add(_Node("LineMode", value="Input", entries=["Input", "Output"]))
+        nodemap.add(_Node("LineSource", value="Off", entries=["Off", "UserOutput0", "ExposureActive"]))
+        nodemap.add(_Node("UserOutputSelector", value="UserOutput0", entries=["UserOutput0"]))
+        nodemap.add(_Node("UserOutputValue", value=False, on_change=self._on_user_output))
+
+    # 노드 값 헬퍼
+    def _get(self, name:str):
+        return self.remote_port.nodemap.get_node(name).get_value()
+
+    @property
+    def width(self) -> int:
+        return self._get("Width")
+
+    @property
+    def height(self) -> int:
+        return self._get("Height")
+
+    @property
+    def frame_period(self) -> float:
+        """
+        프레임 간 최소 간격(초): AcquisitionFrameRate 제한과 센서 판독 시간 중 긴 쪽
+        판독 시간은 출력 행 수에 비례 (ROI, 디시메이션, 비닝으로 행이 줄면 프레임 레이트 증가)
+        """
+
+        readout = self._get("Height") / config.height / config.frame_rate
+        return max(1.0 / self._get("AcquisitionFrameRate"), readout)
+
+    @property
+    def pixel_format(self) -> int:
+        return PIXEL_FORMAT_NAMES[self._get("PixelFormat")]
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return get_pixel_format_info(self.pixel_format).each_pixel_total_bit_count // 8
+
+    @property
+    def is_free_running(self) -> bool:
+        return self._acquiring and self._get("TriggerMode") == "Off"
+
+    def pattern(self) -> bytes:
+        """
+        합성 이미지 (대각선 그라디언트), 크기 또는 포맷이 바뀌면 다시 생성
+        """
+
+        key = (self.width, self.height, self._get("OffsetX"), self._get("OffsetY"), self.pixel_format)
+        if self._pattern is None or self._pattern[0] != key:
+            info = get_pixel_format_info(self.pixel_format)
+            ys, xs = np.indices((self.height, self.width))
+            ys += self._get("OffsetY")
+            xs += self._get("OffsetX")
+            max_value = (1 << info.each_component_valid_bit_count) - 1
+            image = ((xs + ys) % (max_value + 1)).astype(np.uint16 if info.each_component_total_bit_count > 8 else np.uint8)
+            self._pattern = (key, image.tobytes())
+        return self._pattern[1]
+
+    def _on_node_change(self, name:str, value) -> None:
+        if self._acquiring and name in ("Width", "Height", "PixelFormat", "DecimationHorizontal", "DecimationVertical",
+                                        "BinningHorizontal", "BinningVertical"):
+            raise PyStError(f"{name} is not writable during acquisition")
+
+    def _on_geometry_change(self, name:str, value) -> None:
+        """
+        비닝, 디시메이션, ROI 변경 후 연관 노드 범위 갱신
+        비닝, 디시메이션이 바뀌면 WidthMax / HeightMax가 줄어들고 Width / Height / Offset은 새 범위 안으로 조정됨
+        """
+
+        nodes = self.remote_port.nodemap.get_node
+        for axis, size, offset, factors, sensor in (("Width", "Width", "OffsetX", ("DecimationHorizontal", "BinningHorizontal"), config.width),
+                                                    ("Height", "Height", "OffsetY", ("DecimationVertical", "BinningVertical"), config.height)):
+            size_node, offset_node = nodes(size), nodes(offset)
+            factor = self._get(factors[0]) * self._get(factors[1])
+            size_max = sensor // factor // size_node.inc * size_node.inc
+            old_max = self._get(f"{axis}Max")
+            nodes(f"{axis}Max")._value = size_max
+            if size_max != old_max:
+                # 비닝, 디시메이션 변경: 같은 센서 영역을 유지하도록 크기와 오프셋을 비율대로 조정
+                scale = lambda v, inc: v * size_max // old_max // inc * inc
+                size_node._value = min(size_max, max(size_node.min, scale(size_node._value, size_node.inc)))
+                offset_node._value = min(size_max - size_node._value, scale(offset_node._value, offset_node.inc))
+            size_node.max = size_max - offset_node._value
+            offset_node.max = size_max - size_node._value
+
+    def _fire(self) -> None:
+        if not self._acquiring or self._get("TriggerMode") != "On":
+            return
+        now = time.monotonic()
+        for stream in self._streams:
+            stream._schedule(now)
+
+    def _on_software_trigger(self) -> None:
+        if self._get("TriggerSource") == "Software":
+            self._fire()
+
+    def _on_action(self, device_key:int, group_key:int, group_mask:int) -> None:
+        if (self._get("TriggerSource") == "Action0" and self._get("ActionDeviceKey") == device_key
+                and self._get("ActionGroupKey") == group_key and self._get("ActionGroupMask") & group_mask):
+            self._fire()
+
+    def _on_line(self) -> None:
+        if self._get("TriggerSource") == "Line0":
+            self._fire()
+
+    def _on_user_output(self, name:str, value:bool) -> None:
+        # Line1 = UserOutput0 출력이면 공유 트리거 라인의 모든 카메라에 상승 에지 전달
+        if value and self._get("LineSource") == "UserOutput0" and self._get("LineMode") == "Output":
+            for device in self._system._opened:
+                device._on_line()
+
+    def create_datastream(self, index:int=0) -> PyStDataStream:
+        stream = PyStDataStream(self)
+        self._streams.append(stream)
+        return stream
+
+    def acquisition_start(self) -> None:
+        self._acquiring = True
+        for stream in self._streams:
+            with stream._lock:
+                stream._lock.notify_all()
+
+    def acquisition_stop(self) -> None:
+        self._acquiring = False
+
+
+class PyStInterface:
+    """
+    시뮬레이션 인터페이스 (GigE NIC 하나에 모든 카메라가 연결된 구성)
+    """
+
+    def __init__(self, system, num_devices:int) -> None:
+        self._system = system
+        self._infos = [PyStDeviceInfo(i) for i in range(num_devices)]
+        self._devices = [None] * num_devices
+        self.device_count = num_devices
+        self.info = type("PyStInterfaceInfo", (), {"display_name": "SimInterface", "tl_type": "GEV"})()
+
+        nodemap = PyStNodeMap()
+        self.port = _Port(nodemap)
+        nodemap.add(_Node("ActionDeviceKey", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("ActionGroupKey", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("ActionGroupMask", value=0, min=0, max=0xFFFFFFFF))
+        nodemap.add(_Node("ActionCommand", on_execute=self._on_action_command))
+        nodemap.add(_Node("GevInterfaceLinkSpeed", value=1000))    # Mbps
+
+    def update_device_list(self) -> None:
+        pass
+
+    def get_device_info(self, index:int) -> PyStDeviceInfo:
+        return self._infos[index]
+
+    def create_device_by_index(self, index:int, access=None) -> PyStDevice:
+        with self._system._lock:
+            if self._devices[index] is not None:
+                raise PyStError(f"Device {self._infos[index].display_name} is already opened")
+            device = PyStDevice(self._system, self, index)
+            self._devices[index] = device
+            self._system._opened.append(device)
+        return device
+
+    def _on_action_command(self) -> None:
+        node = self.port.nodemap.get_node
+        keys = (node("ActionDeviceKey").get_value(), node("ActionGroupKey").get_value(), node("ActionGroupMask").get_value())
+        for device in self._devices:
+            if device is not None:
+                device._on_action(*keys)
+
+
+class PyStSystem:
+    """
+    시뮬레이션 시스템
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._opened = []
+        self._interfaces = [PyStInterface(self, config.num_devices)]
+        self.interface_count = len(self._interfaces)
+
+    def update_interface_list(self) -> None:
+        pass
+
+    def get_interface(self, index:int) -> PyStInterface:
+        return self._interfaces[index]
+
+    def create_first_device(self, access=None) -> PyStDevice:
+        for interface in self._interfaces:
+            for index in range(interface.device_count):
+                if interface._devices[index] is None:
+                    return interface.create_device_by_index(index)
+        raise PyStError("GC_ERR_NOT_AVAILABLE: no more devices")
+
+
+# ---------------------------------------------------------------------------
+# 컨버터
+# ---------------------------------------------------------------------------
+
+BAYER_TO_BGR = {
+    EStPixelColorFilter.BayerRG: cv2.COLOR_BAYER_RG2BGR,
+    EStPixelColorFilter.BayerGR: cv2.COLOR_BAYER_GR2BGR,
+    EStPixelColorFilter.BayerGB: cv2.COLOR_BAYER_GB2BGR,
+    EStPixelColorFilter.BayerBG: cv2.COLOR_BAYER_BG2BGR,
+}
+
+BAYER_TO_GRAY = {
+    EStPixelColorFilter.BayerRG: cv2.COLOR_BAYER_RG2GRAY,
+    EStPixelColorFilter.BayerGR: cv2.COLOR_BAYER_GR2GRAY,
+    EStPixelColorFilter.BayerGB: cv2.COLOR_BAYER_GB2GRAY,
+    EStPixelColorFilter.BayerBG: cv2.COLOR_BAYER_BG2GRAY,
+}
+
+
+class PyStConverter:
+    """
+    픽셀 포맷 컨버터 (BGR8 / Mono8 출력)
+    """
+
+    def __init__(self) -> None:
+        self.destination_pixel_format = EStPixelFormatNamingConvention.BGR8
+
+    def convert(self, image:PyStImage) -> PyStImage:
+        info = get_pixel_format_info(image.pixel_format)
+        if info.each_component_total_bit_count > 8:
+            array = np.frombuffer(image.get_image_data(), dtype=np.uint16).reshape(image.height, image.width)
+            array = (array >> (info.each_component_valid_bit_count - 8)).astype(np.uint8)
+        else:
+            channels = 3 if info.name in ("RGB8", "BGR8") else 1
+            array = np.frombuffer(image.get_image_data(), dtype=np.uint8).reshape(image.height, image.width, channels)
+
+        if self.destination_pixel_format == EStPixelFormatNamingConvention.BGR8:
+            if info.is_bayer:
+                array = cv2.cvtColor(array, BAYER_TO_BGR[info.get_pixel_color_filter()])
+            elif info.is_mono:
+                array = cv2.cvtColor(array, cv2.COLOR_GRAY2BGR)
+        elif info.is_bayer:
+            array = cv2.cvtColor(array, BAYER_TO_GRAY[info.get_pixel_color_filter()])
+        elif info.is_color:
+            array = cv2.cvtColor(array, cv2.COLOR_BGR2GRAY)
+
+        array = np.ascontiguousarray(array)
+        return PyStImage(image.width, image.height, self.destination_pixel_format, memoryview(array.reshape(-1)))
+
+
+def create_converter(converter_type:int=EStConverterType.PixelFormat) -> PyStConverter:
+    return PyStConverter()
+
+
+# ---------------------------------------------------------------------------
+# 피처 백 (GenApi persistence 형식: 줄마다 "노드 이름<TAB>값")
+# ---------------------------------------------------------------------------
+
+FEATURE_BAG_HEADER = "# {05D8C294-F295-4dfb-9D01-096BD04049F4}\n# GenApi persistence file (version 3.1.0)"
+
+
+class PyStFeatureBag:
+    """
+    노드 맵 설정 저장 / 불러오기
+    쓰기 가능한 값 노드(범위 또는 엔트리가 있는 노드)만 노드 맵 순서대로 저장
+    """
+
+    def __init__(self) -> None:
+        self._features = []     # (노드 이름, 값 문자열)
+
+    def store_nodemap_to_bag(self, nodemap:PyStNodeMap, max_depth:int=-1) -> None:
+        self._features = []
+        for node in nodemap._nodes.values():
+            if node.entries is None and node.min is None:
+                continue
+            _round_trip(node)
+            value = node.get_value()
+            self._features.append((node.name, repr(value) if isinstance(value, float) else str(value)))
+
+    def store_file_to_bag(self, file_name:str) -> None:
+        with open(file_name, 'r', encoding='utf-8') as file:
+            self._features = [tuple(line.rstrip("\n").split("\t", 1)) for line in file
+                                if line.strip() and not line.startswith("#")]
+
+    def save_to_string(self) -> str:
+        return FEATURE_BAG_HEADER + "\n" + "".join(f"{name}\t{value}\n" for name, value in self._features)
+
+    def save_to_file(self, file_name:str) -> None:
+        with open(file_name, 'w', encoding='utf-8') as file:
+            file.write(self.save_to_string())
+
+    def clear(self) -> None:
+        self._features = []
+
+    def load(self, nodemap:PyStNodeMap, verify:bool=True) -> None:
+        for name, text in self._features:
+            node = nodemap.get_node(name)
+            current = node.get_value()
+            if node.entries is not None or isinstance(current, str):
+                value = text
+            elif isinstance(current, float):
+                value = float(text)
+            else:
+                value = int(text)
+            _round_trip(node)
+            node.set_value(value)
+            if verify:
+                _round_trip(node)
+                if node.get_value() != value:
+                    raise PyStError(f"GC_ERR_INVALID_PARAMETER: {name} verify failed ({node.get_value()} != {value})")
+
+
+def create_featurebag() -> PyStFeatureBag:
+    return PyStFeatureBag()
+
+
+# ---------------------------------------------------------------------------
+# 모듈 함수
+# ---------------------------------------------------------------------------
+
+def initialize() -> None:
+    pass
+
+
+def terminate() -> None:
+    pass
+
+
+def create_system() -> PyStSystem:
+    return PyStSystem()
@@ -0,0 +1,186 @@
+from utils.backend import st
+import math
+import time
+import threading
+from collections import deque
+from nodemaps.node_values import *
+from nodemaps.configuration import NodeHandles
+from utils.tracing import percentile
+from utils.logger import get_logger
+
+logger = get_logger("stream_buffers")
+
+# 데이터 스트림 버퍼 처리 방식 (StreamBufferHandlingMode)
+BUFFER_HANDLING_MODES = (
+    BUFFER_HANDLING_OLDEST_FIRST,           # 버퍼가 모두 차면 새 프레임을 버림 (모든 프레임을 순서대로 처리)
+    BUFFER_HANDLING_OLDEST_FIRST_OVERWRITE, # 버퍼가 모두 차면 가장 오래된 미처리 프레임을 덮어씀
+    BUFFER_HANDLING_NEWEST_ONLY,            # 가장 최근 프레임 하나만 전달 (미리보기 / 최신 프레임만 필요할 때)
+)
+
+
+def configure_stream(datastream, buffer_count:int=None, handling_mode:str=None) -> list:
+    """
+    데이터 스트림 버퍼 수와 버퍼 처리 방식 설정 (버퍼는 획득을 시작할 때 할당되므로 start_acquisition() 전에 호출)
+
+    Args:
+        datastream: stApi 데이터 스트림 객체
+        buffer_count: 할당할 버퍼 수, None이면 GenTL 기본값
+        handling_mode: BUFFER_HANDLING_MODES 중 하나, None이면 현재 값 유지
+
+    Return:
+        실제로 쓴 노드 이름 리스트
+    """
+
+    settings = {}
+    if buffer_count is not None:
+        if buffer_count < 1:
+            raise ValueError(f"buffer_count must be positive, got {buffer_count}")
+        settings[STREAM_BUFFER_COUNT_MODE] = STREAM_BUFFER_COUNT_MODE_MANUAL
+        settings[STREAM_BUFFER_COUNT_MANUAL] = buffer_count
+    if handling_mode is not None:
+        if handling_mode not in BUFFER_HANDLING_MODES:
+            raise ValueError(f"Invalid buffer handling mode '{handling_mode}'. Choose one of {list(BUFFER_HANDLING_MODES)}")
+        settings[STREAM_BUFFER_HANDLING_MODE] = handling_mode
+
+    return NodeHandles(datastream.nodemap).apply(settings)
+
+
+class BufferMonitor:
+    """
+    데이터 스트림 버퍼 사용량과 콜백 처리 시간 측정
+    버퍼를 처리하기 시작할 때 대기 중인 버퍼 수(StreamOutputBufferCount)와 카메라가 쓸 수 있는 빈 버퍼 수(StreamInputBufferCount)를 읽어
+    처리가 밀린 횟수(overrun)와 동시에 사용된 최대 버퍼 수(버스트 크기)를 기록하고, 이를 바탕으로 버퍼 수를 권장
+    """
+
+    def __init__(self, datastream, max_samples:int=10000) -> None:
+        """
+        Args:
+            datastream: stApi 데이터 스트림 객체
+            max_samples: 보관할 최근 콜백 처리 시간 개수
+        """
+
+        self.nodes = NodeHandles(datastream.nodemap)
+        self._durations = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.reset()
+
+        # 버퍼 수 노드를 지원하지 않는 GenTL이면 처리 시간만 측정
+        try:
+            self.nodes.get(STREAM_INPUT_BUFFER_COUNT)
+            self.nodes.get(STREAM_OUTPUT_BUFFER_COUNT)
+            self.supported = True
+        except st.PyStError:
+            self.supported = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.buffers = 0            # 처리한 버퍼 수
+            self.overruns = 0           # 이전 버퍼를 처리하는 동안 다음 버퍼가 도착해 대기한 횟수
+            self.max_waiting = 0        # 처리 시작 시 대기 중이던 최대 버퍼 수
+            self.peak_in_use = 0        # 카메라가 쓸 수 없던(처리 중 + 대기 중) 최대 버퍼 수
+            self._durations.clear()
+
+    def begin(self) -> float:
+        """
+        버퍼 처리 시작 (retrieve_buffer() 직후 호출)
+
+        Return:
+            시작 시각 (end()에 전달)
+        """
+
+        if self.supported:
+            waiting = self.nodes.get(STREAM_OUTPUT_BUFFER_COUNT)
+            in_use = self.nodes.get(STREAM_BUFFER_COUNT_ANNOUNCED) - self.nodes.get(STREAM_INPUT_BUFFER_COUNT)
+            with self._lock:
+                if waiting > 0:
+                    self.overruns += 1
+                self.max_waiting = max(self.max_waiting, waiting)
+                self.peak_in_use = max(self.peak_in_use, in_use)
+
+        return time.perf_counter()
+
+    def end(self, start:float) -> None:
+        """
+        버퍼 처리 완료 (버퍼를 반환하기 직전에 호출)
+        """
+
+        with self._lock:
+            self.buffers += 1
+            self._durations.append(time.perf_counter() - start)
+
+    def suggest_buffer_count(self, margin:float=1.5, minimum:int=4) -> int:
+        """
+        관측된 최대 버스트 크기에 여유분을 더한 버퍼 수
+        버퍼가 모자라 프레임을 버린 적이 있으면(StreamUnderrunCount) 현재 버퍼 수의 두 배 이상
+
+        Args:
+            margin: 최대 동시 사용 버퍼 수에 곱할 여유 비율
+            minimum: 최소 버퍼 수
+        """
+
+        with self._lock:
+            peak = self.peak_in_use
+        suggestion = max(minimum, math.ceil(peak * margin) + 1)
+
+        try:
+            if self.nodes.get(STREAM_UNDERRUN_COUNT) > 0:
+                suggestion = max(suggestion, 2 * self.nodes.get(STREAM_BUFFER_COUNT_ANNOUNCED))
+        except st.PyStError:
+            pass
+
+        return suggestion
+
+    @property
+    def stats(self) -> dict:
+        """
+        버퍼 사용량 / 콜백 처리 시간 스냅샷
+        """
+
+        with self._lock:
+            durations = [duration * 1e3 for duration in self._durations]
+            stats = {
+                "buffers": self.buffers,
+                "overruns": self.overruns,
+                "max_waiting": self.max_waiting,
+                "peak_in_use": self.peak_in_use,
+                "p50_ms": percentile(durations, 50),
+                "p99_ms": percentile(durations, 99),
+                "max_ms": max(durations, default=0.0),
+            }
+        try:
+            stats["announced"] = self.nodes.get(STREAM_BUFFER_COUNT_ANNOUNCED)
+        except st.PyStError:
+            pass
+        stats["suggested_buffer_count"] = self.suggest_buffer_count()
+
+        return stats
+
+
+def retrieve_loop(datastream, handle_buffer, running, timeout_ms:int=200, monitor:BufferMonitor=None) -> None:
+    """
+    폴링 대신 GenTL 이벤트를 기다리는 버퍼 수신 루프 (버퍼가 없으면 timeout_ms 동안 스레드가 잠듦)
+    타임아웃마다 running()을 확인하므로 중지 요청 후 최대 timeout_ms 안에 반환
+
+    Args:
+        datastream: stApi 데이터 스트림 객체
+        handle_buffer: 버퍼 처리 함수 handle_buffer(buffer), 반환하면 버퍼는 GenTL 큐로 돌아감
+        running: 계속 수신할지 확인하는 함수
+        timeout_ms: 한 번에 기다리는 최대 시간 (ms)
+        monitor: 버퍼 사용량 측정기, None이면 측정하지 않음
+    """
+
+    while running():
+        try:
+            with datastream.retrieve_buffer(timeout_ms) as buffer:
+                start = monitor.begin() if monitor is not None else None
+                try:
+                    handle_buffer(buffer)
+                finally:
+                    if monitor is not None:
+                        monitor.end(start)
+        except st.PyStError as exception:
+            if not running() or not datastream.is_grabbing:
+                break
+            if "TIMEOUT" in str(exception).upper():
+                continue
+            logger.error("Buffer retrieval failed: %s", exception)
@@ -0,0 +1,159 @@
+import csv
+import time
+import threading
+from collections import OrderedDict
+
+# 프레임 처리 단계 (순서대로)
+STAGE_TRIGGER = "trigger"       # 트리거 실행 (CameraWorker.trigger)
+STAGE_BUFFER = "buffer"         # 버퍼 도착 (datastream_callback 진입)
+STAGE_CONVERTED = "converted"   # 픽셀 포맷 변환 완료
+STAGE_NUMPY = "numpy"           # numpy 배열 준비 완료
+STAGE_SAVED = "saved"           # 디스크 저장 완료
+STAGES = (STAGE_TRIGGER, STAGE_BUFFER, STAGE_CONVERTED, STAGE_NUMPY, STAGE_SAVED)
+
+
+def percentile(values:list, q:float) -> float:
+    """
+    q 분위수 계산 (최근접 순위 방식)
+
+    Args:
+        values: 값 리스트
+        q: 분위수 (0 ~ 100)
+    """
+
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+
+    return ordered[index]
+
+
+class FrameTracer:
+    """
+    프레임별 단계 타임스탬프 기록기
+    (camera_index, action)별로 각 단계의 monotonic 시간을 기록하고 단계별/카메라별 지연 분위수를 계산
+    비활성화 상태에서는 mark()가 즉시 반환하므로 hot path 비용이 거의 없음
+    """
+
+    def __init__(self, enabled:bool=True, max_records:int=100000) -> None:
+        """
+        Args:
+            enabled: 기록 여부
+            max_records: 보관할 최대 프레임 수 (초과 시 오래된 기록부터 삭제)
+        """
+
+        self.enabled = enabled
+        self.max_records = max_records
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, stage:str, camera_index:int, action, frame_id:int=None) -> None:
+        """
+        단계 통과 시각 기록
+
+        Args:
+            stage: 단계 이름 (STAGES 중 하나)
+            camera_index: 카메라 번호
+            action: action 번호
+            frame_id: 프레임 ID (알고 있는 경우)
+        """
+
+        if self.enabled == False:
+            return
+
+        now = time.monotonic_ns()
+        key = (camera_index, action)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = {}
+                self._records[key] = record
+                if len(self._records) > self.max_records:
+                    self._records.popitem(last=False)
+            record[stage] = now
+            if frame_id is not None:
+                record["frame_id"] = frame_id
+
+    def latencies(self) -> dict:
+        """
+        단계별 지연 시간(ms) 수집
+        각 단계의 지연은 직전 단계로부터의 시간, "total"은 트리거부터 저장 완료까지의 시간
+
+        Return:
+            {camera_index: {stage: [ms, ...]}}
+        """
+
+        with self._lock:
+            records = list(self._records.items())
+
+        result = {}
+        for (camera_index, action), record in records:
+            per_camera = result.setdefault(camera_index, {})
+            previous = None
+            for stage in STAGES:
+                if stage not in record:
+                    continue
+                if previous is not None:
+                    per_camera.setdefault(stage, []).append((record[stage] - record[previous]) / 1e6)
+                previous = stage
+            if STAGE_TRIGGER in record and STAGE_SAVED in record:
+                per_camera.setdefault("total", []).append((record[STAGE_SAVED] - record[STAGE_TRIGGER]) / 1e6)
+
+        return result
+
+    def summary(self) -> dict:
+        """
+        단계별/카메라별 p50, p95, p99 지연 시간(ms)
+
+        Return:
+            {camera_index 또는 "all": {stage: {"count", "p50", "p95", "p99"}}}
+        """
+
+        latencies = self.latencies()
+
+        # 전체 카메라 합산
+        combined = {}
+        for per_camera in latencies.values():
+            for stage, values in per_camera.items():
+                combined.setdefault(stage, []).extend(values)
+        latencies["all"] = combined
+
+        return {
+            camera_index: {
+                stage: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95), "p99": percentile(values, 99)}
+                for stage, values in per_camera.items()
+            }
+            for camera_index, per_camera in latencies.items()
+        }
+
+    def print_summary(self) -> None:
+        """
+        지연 시간 요약 출력
+        """
+
+        for camera_index, stages in self.summary().items():
+            for stage, stat in stages.items():
+                print(f"[Trace] camera={camera_index} stage={stage} n={stat['count']} "
+                        f"p50={stat['p50']:.2f} ms p95={stat['p95']:.2f} ms p99={stat['p99']:.2f} ms")
+
+    def export_csv(self, file_path:str) -> None:
+        """
+        프레임별 원본 타임스탬프(ns)를 CSV로 저장
+
+        Args:
+            file_path: 저장할 CSV 파일 경로
+        """
+
+        with self._lock:
+            records = list(self._records.items())
+
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["camera_index", "action", "frame_id", *STAGES])
+            for (camera_index, action), record in records:
+                writer.writerow([camera_index, action, record.get("frame_id"), *[record.get(stage) for stage in STAGES]])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
@@ -0,0 +1,297 @@
+import time
+import threading
+import cv2
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger("writers")
+
+# 저장 포맷
+FORMAT_BMP = "bmp"      # 무압축 (기존 방식)
+FORMAT_RAW = "raw"      # 디베이어 전 Bayer 원본 덤프 (컨버터 생략)
+FORMAT_PNG = "png"      # 무손실, 압축 레벨 0 ~ 9
+FORMAT_WEBP = "webp"    # 무손실 WebP
+FORMAT_TIFF = "tiff"    # 무손실 TIFF (LZW 압축)
+FORMAT_JPEG = "jpeg"    # 손실, 품질 프리셋 또는 0 ~ 100
+
+# JPEG 품질 프리셋
+JPEG_PRESETS = {
+    "low": 70,
+    "medium": 85,
+    "high": 95,
+    "max": 100,
+}
+
+# OpenCV TIFF 압축 코드 (libtiff COMPRESSION_LZW)
+TIFF_COMPRESSION_LZW = 5
+
+
+class ImageWriter:
+    """
+    이미지 저장 기본 클래스
+    인코딩과 파일 쓰기를 분리하여 포맷별 인코딩 크기와 인코딩 시간을 기록
+    """
+
+    format = FORMAT_BMP
+    extension = ".bmp"
+    raw = False     # True이면 컨버터를 거치지 않은 원본 버퍼를 받음
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        # 통계
+        self._written = 0
+        self._errors = 0
+        self._input_bytes = 0
+        self._encoded_bytes = 0
+        self._encode_time = 0.0
+        self._write_time = 0.0
+
+    @property
+    def spec(self) -> str:
+        """
+        create_writer()로 같은 writer를 다시 만들 수 있는 포맷 문자열 (다른 프로세스에 전달할 때 사용)
+        """
+
+        return self.format
+
+    def file_name(self, base_name:str) -> str:
+        """
+        확장자를 붙인 저장 파일 경로
+        """
+
+        return base_name + self.extension
+
+    def encode(self, img_array:np.ndarray) -> bytes:
+        """
+        이미지 배열을 저장할 바이트로 인코딩 (하위 클래스에서 포맷별로 구현)
+        """
+
+        ok, encoded = cv2.imencode(self.extension, img_array, self.params())
+        if ok == False:
+            raise ValueError(f"{self.format} encoding failed")
+
+        return encoded
+
+    def params(self) -> list:
+        """
+        cv2.imencode 파라미터
+        """
+
+        return []
+
+    def write(self, file_name:str, img_array:np.ndarray) -> bool:
+        """
+        이미지를 인코딩하여 파일로 저장
+
+        Args:
+            file_name: 저장할 파일 경로 (확장자 포함)
+            img_array: 이미지 배열
+
+        Return:
+            저장에 성공하면 True
+        """
+
+        try:
+            start = time.perf_counter()
+            encoded = self.encode(img_array)
+            encoded_time = time.perf_counter()
+            with open(file_name, 'wb') as file:
+                file.write(encoded)
+            end = time.perf_counter()
+        except (OSError, ValueError, cv2.error) as exception:
+            self.record_error()
+            logger.error("Failed to save image: %s (%s)", file_name, exception)
+            return False
+
+        self.record(input_bytes=img_array.nbytes, encoded_bytes=len(encoded), encode_time=encoded_time - start, write_time=end - encoded_time)
+
+        return True
+
+    def record(self, input_bytes:int, encoded_bytes:int, encode_time:float, write_time:float) -> None:
+        """
+        저장 결과를 통계에 반영 (다른 프로세스에서 저장한 결과도 이 메소드로 반영)
+
+        Args:
+            input_bytes: 인코딩 전 크기 (byte)
+            encoded_bytes: 인코딩 후 크기 (byte)
+            encode_time: 인코딩 시간(초)
+            write_time: 파일 쓰기 시간(초)
+        """
+
+        with self._lock:
+            self._written += 1
+            self._input_bytes += input_bytes
+            self._encoded_bytes += encoded_bytes
+            self._encode_time += encode_time
+            self._write_time += write_time
+
+    def record_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    @property
+    def stats(self) -> dict:
+        """
+        저장 통계 스냅샷 (크기는 byte, 시간은 프레임당 평균 ms)
+        """
+
+        with self._lock:
+            written = max(self._written, 1)
+            return {
+                "format": self.format,
+                "written": self._written,
+                "errors": self._errors,
+                "encoded_bytes": self._encoded_bytes,
+                "mean_encoded_bytes": self._encoded_bytes / written,
+                "compression_ratio": self._input_bytes / self._encoded_bytes if self._encoded_bytes else 0.0,
+                "mean_encode_ms": self._encode_time / written * 1e3,
+                "mean_write_ms": self._write_time / written * 1e3,
+            }
+
+
+class BmpWriter(ImageWriter):
+    """
+    무압축 BMP 저장
+    """
+
+    format = FORMAT_BMP
+    extension = ".bmp"
+
+
+class RawWriter(ImageWriter):
+    """
+    디베이어 전 Bayer 버퍼를 그대로 저장 (헤더 없음)
+    BGR8 대비 1/3 크기이고 컨버터를 거치지 않음, 크기와 픽셀 포맷은 파일 이름에 기록
+    """
+
+    format = FORMAT_RAW
+    extension = ".raw"
+    raw = True
+
+    def encode(self, img_array:np.ndarray) -> bytes:
+        return memoryview(np.ascontiguousarray(img_array)).cast('B')
+
+
+class PngWriter(ImageWriter):
+    """
+    무손실 PNG 저장
+    """
+
+    format = FORMAT_PNG
+    extension = ".png"
+
+    def __init__(self, level:int=1) -> None:
+        """
+        Args:
+            level: 압축 레벨 (0: 무압축 ~ 9: 최대 압축, 높을수록 느림)
+        """
+
+        super().__init__()
+        if not 0 <= level <= 9:
+            raise ValueError(f"Invalid PNG compression level {level}. Choose 0 ~ 9")
+        self.level = level
+
+    @property
+    def spec(self) -> str:
+        return f"{self.format}:{self.level}"
+
+    def params(self) -> list:
+        return [cv2.IMWRITE_PNG_COMPRESSION, self.level]
+
+
+class WebpWriter(ImageWriter):
+    """
+    무손실 WebP 저장 (품질 100 초과이면 무손실 모드)
+    """
+
+    format = FORMAT_WEBP
+    extension = ".webp"
+
+    def params(self) -> list:
+        return [cv2.IMWRITE_WEBP_QUALITY, 101]
+
+
+class TiffWriter(ImageWriter):
+    """
+    LZW 압축 TIFF 저장
+    """
+
+    format = FORMAT_TIFF
+    extension = ".tiff"
+
+    def params(self) -> list:
+        return [cv2.IMWRITE_TIFF_COMPRESSION, TIFF_COMPRESSION_LZW]
+
+
+class JpegWriter(ImageWriter):
+    """
+    JPEG 저장 (손실 압축)
+    """
+
+    format = FORMAT_JPEG
+    extension = ".jpg"
+
+    def __init__(self, quality="high") -> None:
+        """
+        Args:
+            quality: 품질 프리셋 이름 (low / medium / high / max) 또는 0 ~ 100
+        """
+
+        super().__init__()
+        if isinstance(quality, str) and not quality.isdigit():
+            if quality not in JPEG_PRESETS:
+                raise ValueError(f"Invalid JPEG preset '{quality}'. Choose one of {list(JPEG_PRESETS)}")
+            quality = JPEG_PRESETS[quality]
+        quality = int(quality)
+        if not 0 <= quality <= 100:
+            raise ValueError(f"Invalid JPEG quality {quality}. Choose 0 ~ 100")
+        self.quality = quality
+
+    @property
+    def spec(self) -> str:
+        return f"{self.format}:{self.quality}"
+
+    def params(self) -> list:
+        return [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+
+
+WRITERS = {
+    FORMAT_BMP: BmpWriter,
+    FORMAT_RAW: RawWriter,
+    FORMAT_PNG: PngWriter,
+    FORMAT_WEBP: WebpWriter,
+    FORMAT_TIFF: TiffWriter,
+    FORMAT_JPEG: JpegWriter,
+}
+
+
+def create_writer(spec="bmp") -> ImageWriter:
+    """
+    "포맷[:옵션]" 문자열로 writer 생성
+
+    예) "bmp", "raw", "png:3", "webp", "tiff", "jpeg:high", "jpeg:90"
+
+    Args:
+        spec: 포맷 문자열 또는 ImageWriter 객체 (그대로 반환)
+    """
+
+    if isinstance(spec, ImageWriter):
+        return spec
+
+    name, _, option = str(spec).lower().partition(":")
+    if name == "jpg":
+        name = FORMAT_JPEG
+    elif name == "tif":
+        name = FORMAT_TIFF
+    if name not in WRITERS:
+        raise ValueError(f"Invalid image format '{spec}'. Choose one of {list(WRITERS)}")
+
+    if option == "":
+        return WRITERS[name]()
+    if name == FORMAT_PNG:
+        return PngWriter(level=int(option))
+    if name == FORMAT_JPEG:
+        return JpegWriter(quality=option)
+
+    raise ValueError(f"Image format '{name}' has no options: '{spec}'")